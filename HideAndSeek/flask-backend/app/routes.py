@@ -23,6 +23,8 @@ def generate_game():
         }), 400
     
     n, m, proximity = data["n"], data["m"], data["proximity"]
+    implicit_matrix = data.get("implicitMatrix", False)
+    approximate = data.get("solver", "exact") == "approximate"
     
     if Test.test_mode:
         try:
@@ -33,20 +35,30 @@ def generate_game():
     else:
         game_board = GameBoard.generate(n, m)
     
-    game_matrix = GameMatrix.generate(game_board)
+    game_matrix = GameMatrix.generate_implicit(game_board)
     
     if proximity:
-        game_matrix = ProximityPenalty.apply(game_matrix, n, m)
+        game_matrix = ProximityPenalty.apply_implicit(game_matrix, n, m,
+                                                      tuple(data.get("proximityFactors", ProximityPenalty.FACTORS)))
 
-    hider_probabilities = GameSolver.solve_hider_strategy(game_matrix)
-    seeker_probabilities = GameSolver.solve_seeker_strategy(game_matrix)
+    if approximate:
+        hider_probabilities, seeker_probabilities, game_value, exploitability = GameSolver.solve_approximate(
+            game_matrix, data.get("epsilon", 1e-3))
+    else:
+        hider_probabilities, seeker_probabilities, game_value = GameSolver.solve_equilibrium(game_matrix)
     
     response = {
-        'gameMatrix': game_matrix.tolist(),
         'gameBoard': [[cell.label for cell in row] for row in game_board],
         'seekerProbabilities': seeker_probabilities.tolist(),
-        'hiderProbabilities': hider_probabilities.tolist()
+        'hiderProbabilities': hider_probabilities.tolist(),
+        'gameValue': game_value
     }
+    if approximate:
+        response['exploitability'] = exploitability
+    if implicit_matrix:
+        response['implicitGameMatrix'] = game_matrix.to_dict()
+    else:
+        response['gameMatrix'] = game_matrix.toarray().tolist()
     try:
         validate(instance=response, schema=generate_game_response_schema)
     except ValidationError as e:
@@ -1,7 +1,115 @@
 import numpy as np
+from scipy import sparse
 from difficulty import Difficulty
 
+class ImplicitGameMatrix:
+    """
+    A game matrix stored as its row constants and its diagonal, without the (n*m) x (n*m) entries.
+
+    Row i of the matrix is rewards[i] everywhere except for penalties[i] on the diagonal,
+    so the matrix is the row constants plus a diagonal correction, plus an optional sparse correction
+    of off-diagonal entries. Products with vectors take O(n*m) plus the nonzeros of the correction,
+    the dense matrix is only built by toarray.
+
+    Attributes:
+        rewards (np.array): 1D array of the off-diagonal value of each row.
+        penalties (np.array): 1D array of the diagonal value of each row.
+        correction (sparse.csr_matrix | None): Sparse matrix added to the off-diagonal entries.
+    """
+    # Lets numpy arrays defer y @ matrix to __rmatmul__ instead of converting the matrix with __array__
+    __array_ufunc__ = None
+
+    def __init__(self, rewards: np.array, penalties: np.array, correction: sparse.csr_matrix | None = None):
+        self.rewards = rewards
+        self.penalties = penalties
+        self.correction = correction
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return len(self.rewards), len(self.rewards)
+
+    @property
+    def diagonal(self) -> np.array:
+        """
+        The diagonal correction added to the row constants.
+        """
+        return self.penalties - self.rewards
+
+    def __matmul__(self, x: np.array) -> np.array:
+        product = self.rewards * np.sum(x) + self.diagonal * x
+        return product if self.correction is None else product + self.correction @ x
+
+    def __rmatmul__(self, y: np.array) -> np.array:
+        product = np.dot(y, self.rewards) + self.diagonal * y
+        return product if self.correction is None else product + self.correction.T @ y
+
+    def toarray(self) -> np.array:
+        """
+        Returns:
+            np.array: The dense 2D game matrix.
+        """
+        size = len(self.rewards)
+        game_matrix = np.repeat(self.rewards[:, np.newaxis], size, axis=1)
+        np.fill_diagonal(game_matrix, self.penalties)
+        if self.correction is not None:
+            correction = self.correction.tocoo()
+            game_matrix = game_matrix.astype(float)
+            game_matrix[correction.row, correction.col] += correction.data
+        return game_matrix
+
+    def __array__(self, dtype=None, copy=None) -> np.array:
+        game_matrix = self.toarray()
+        return game_matrix if dtype is None else game_matrix.astype(dtype)
+
+    def to_dict(self) -> dict:
+        r = {'rewards': self.rewards.tolist(), 'penalties': self.penalties.tolist()}
+        if self.correction is not None:
+            correction = self.correction.tocoo()
+            r['corrections'] = [[int(i), int(j), float(value)] for i, j, value in zip(correction.row, correction.col, correction.data)]
+        return r
+
 class GameMatrix:
+    @staticmethod
+    def to_implicit(game_matrix: np.array, max_density: float = 0.1) -> ImplicitGameMatrix | None:
+        """
+        Finds the implicit form of a dense game matrix, taking the median off-diagonal entry of each row as its reward
+        and the entries differing from it as the sparse correction.
+
+        Args:
+            game_matrix (np.array): 2D numpy array of a square game matrix.
+            max_density (float): Largest share of corrected entries for which the implicit form is returned.
+
+        Returns:
+            ImplicitGameMatrix | None: The implicit form, None if the correction is denser than max_density.
+        """
+        size = game_matrix.shape[0]
+        penalties = np.diagonal(game_matrix).copy()
+        if size == 1:
+            return ImplicitGameMatrix(np.zeros(1, dtype=game_matrix.dtype), penalties)
+        off_diagonal = ~np.eye(size, dtype=bool)
+        rewards = np.median(game_matrix[off_diagonal].reshape(size, size - 1), axis=1).astype(game_matrix.dtype)
+        differences = (game_matrix - rewards[:, np.newaxis]) * off_diagonal
+        if np.count_nonzero(differences) > max_density * size * size:
+            return None
+        correction = sparse.csr_matrix(differences) if differences.any() else None
+        return ImplicitGameMatrix(rewards, penalties, correction)
+
+    @staticmethod
+    def generate_implicit(game_board: np.array) -> ImplicitGameMatrix:
+        """
+        Generates the game matrix of generate in its implicit form, reading each cell of the game board once.
+
+        Args:
+            game_board (np.array): 2D numpy array of enums of difficulties.
+
+        Returns:
+            ImplicitGameMatrix: The reward and penalty of every cell of the flattened game_board.
+        """
+        cells = game_board.ravel()
+        rewards = np.fromiter((difficulty.reward for difficulty in cells), dtype=int, count=cells.size)
+        penalties = np.fromiter((difficulty.penalty for difficulty in cells), dtype=int, count=cells.size)
+        return ImplicitGameMatrix(rewards, penalties)
+
     @staticmethod
     def generate(game_board: np.array) -> np.array:
         """
@@ -20,15 +128,4 @@ class GameMatrix:
         Returns:
             np.array: 2D numpy integer array representing the game matrix.
         """
-        n, m = game_board.shape
-        game_matrix = np.zeros((n * m, n * m), dtype=int)
-        
-        for i in range(n * m):
-            difficulty = game_board[i // m, i % m]
-            for j in range(n * m):
-                if i == j:
-                    game_matrix[i, j] = difficulty.penalty
-                else:
-                    game_matrix[i, j] = difficulty.reward
-                    
-        return game_matrix
\ No newline at end of file
+        return GameMatrix.generate_implicit(game_board).toarray()
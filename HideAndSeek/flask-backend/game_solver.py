@@ -1,11 +1,17 @@
 import numpy as np
-from scipy.optimize import linprog
+from scipy import sparse
+from scipy.optimize import OptimizeResult, linprog
+from game_matrix import GameMatrix, ImplicitGameMatrix
 
 class GameSolver:
   @staticmethod
   def solve(constraints: np.array, primal=True) -> np.array:
+    return GameSolver._solve_lp(constraints, primal).x[:-1]
+
+  @staticmethod
+  def _solve_lp(constraints: np.array, primal=True) -> OptimizeResult:
     num_strategies = constraints.shape[0]
-    
+
     c = [0] * num_strategies + [-1 if primal else 1]
 
     A_ub = np.hstack((constraints, (1 if primal else -1) * np.ones((num_strategies, 1))))
@@ -16,20 +22,186 @@ class GameSolver:
 
     bounds = [(0, 1)] * num_strategies + [(None, None)]
 
+    return GameSolver._linprog(c, A_ub, b_ub, A_eq, probs_sum, bounds)
+
+  @staticmethod
+  def solve_implicit(game_matrix: ImplicitGameMatrix, primal=True) -> np.array:
+    """
+    Solves the LP of solve for a game matrix in its implicit form, with O(n*m) nonzeros instead of (n*m)^2.
+    The probabilities p sum to 1, so (A p)_i = rewards_i + diagonal_i * p_i, and (A^T p)_j = t + diagonal_j * p_j
+    with one more variable t = rewards . p, the sparse correction adds its own nonzeros to both.
+    """
+    return GameSolver._solve_implicit_lp(game_matrix, primal).x[:game_matrix.shape[0]]
+
+  @staticmethod
+  def _solve_implicit_lp(game_matrix: ImplicitGameMatrix, primal=True) -> OptimizeResult:
+    num_strategies = game_matrix.shape[0]
+    diagonal = sparse.diags(game_matrix.diagonal.astype(float), format='csr')
+    if game_matrix.correction is not None:
+      diagonal = diagonal + game_matrix.correction
+    ones = sparse.csr_matrix(np.ones((num_strategies, 1)))
+
+    if primal:
+      # Variables p, v, t: -t - diagonal_j * p_j + v <= 0, the correction enters transposed
+      c = [0] * num_strategies + [-1, 0]
+      A_ub = sparse.hstack((-diagonal.T, ones, -ones), format='csr')
+      b_ub = [0] * num_strategies
+      A_eq = [[1] * num_strategies + [0, 0], game_matrix.rewards.tolist() + [0, -1]]
+      b_eq = [1, 0]
+      bounds = [(0, 1)] * num_strategies + [(None, None)] * 2
+    else:
+      # Variables p, v: rewards_i + diagonal_i * p_i - v <= 0
+      c = [0] * num_strategies + [1]
+      A_ub = sparse.hstack((diagonal, -ones), format='csr')
+      b_ub = -game_matrix.rewards
+      A_eq = [[1] * num_strategies + [0]]
+      b_eq = [1]
+      bounds = [(0, 1)] * num_strategies + [(None, None)]
+
+    return GameSolver._linprog(c, A_ub, b_ub, A_eq, b_eq, bounds)
+
+  @staticmethod
+  def _linprog(c, A_ub, b_ub, A_eq, b_eq, bounds) -> OptimizeResult:
     result = linprog(c, A_ub=A_ub, b_ub=b_ub,
-                        A_eq=A_eq, b_eq=probs_sum,
+                        A_eq=A_eq, b_eq=b_eq,
                         method='highs', bounds=bounds)
     if result.success:
-        return result.x[:-1]
+        return result
     else:
         print("Optimization failed:", result.message)
         print("Status code:", result.status)
         raise ValueError("Linear program failed to solve.")
 
   @staticmethod
-  def solve_hider_strategy(game_matrix: np.array) -> np.array:
+  def solve_closed_form(game_matrix: ImplicitGameMatrix) -> tuple[np.array, np.array, float]:
+    """
+    Equilibrium of a game matrix with constant rows off a negative diagonal in O(n*m log n*m), returns the hider
+    and seeker strategies and the value v.
+    Against the seeker probabilities x row i pays rewards_i - |diagonal_i| * x_i, the seeker levels the rows with
+    rewards_i > v down to v with x_i = (rewards_i - v) / |diagonal_i|, v making them sum to 1.
+    The hider plays the same rows with probabilities proportional to 1 / |diagonal_i|, every seeker choice among them
+    then pays v and any other pays more.
+    """
+    num_strategies = game_matrix.shape[0]
+    rewards = game_matrix.rewards.astype(float)
+    costs = -game_matrix.diagonal.astype(float)
+    order = np.argsort(-rewards, kind='stable')
+    weights = 1 / costs[order]
+
+    # values[k] levels the k + 1 best rows, the first one not above the next row is v
+    values = (np.cumsum(rewards[order] * weights) - 1) / np.cumsum(weights)
+    next_rewards = np.append(rewards[order][1:], -np.inf)
+    k = int(np.argmax(values >= next_rewards))
+    value, support = values[k], order[:k + 1]
+
+    hider = np.zeros(num_strategies)
+    hider[support] = weights[:k + 1] / weights[:k + 1].sum()
+    seeker = np.zeros(num_strategies)
+    seeker[support] = np.maximum((rewards[support] - value) / costs[support], 0)
+    return hider, seeker, float(value)
+
+  @staticmethod
+  def solve_equilibrium(game_matrix: np.ndarray | ImplicitGameMatrix) -> tuple[np.array, np.array, float]:
+    """
+    Solves the hider and seeker strategies and the value using the structure of the game matrix: the closed form
+    for constant rows off a negative diagonal, the sparse LPs of solve_implicit for a sparse correction of them
+    like the proximity penalty, the dense LPs otherwise.
+    """
+    if not isinstance(game_matrix, ImplicitGameMatrix):
+      implicit = GameMatrix.to_implicit(game_matrix)
+      if implicit is None:
+        return GameSolver.solve_both(game_matrix)
+      game_matrix = implicit
+
+    if game_matrix.correction is None and np.all(game_matrix.diagonal < 0):
+      return GameSolver.solve_closed_form(game_matrix)
+    return GameSolver.solve_both(game_matrix)
+
+  @staticmethod
+  def solve_both(game_matrix: np.ndarray | ImplicitGameMatrix, tol=1e-7) -> tuple[np.array, np.array, float]:
+    """
+    Solves the seeker's LP once and reads the hider strategy off its dual, the HiGHS marginals of the rows
+    (A x)_i <= v, returns both strategies and the value v.
+    The hider strategy must sum to 1 and hold every seeker choice to at least v, otherwise the hider's LP is solved.
+    """
+    num_strategies = game_matrix.shape[0]
+    if isinstance(game_matrix, ImplicitGameMatrix):
+      result = GameSolver._solve_implicit_lp(game_matrix, primal=False)
+    else:
+      result = GameSolver._solve_lp(game_matrix, primal=False)
+    seeker, value = result.x[:num_strategies], result.x[num_strategies]
+
+    hider = np.maximum(-result.ineqlin.marginals, 0)
+    scale = tol * max(1.0, abs(value))
+    # ImplicitGameMatrix.__rmatmul__ keeps the implicit form, numpy defers to it through __array_ufunc__ = None
+    if abs(np.sum(hider) - 1) > tol or np.min(hider @ game_matrix) < value - scale:
+      hider = GameSolver.solve_hider_strategy(game_matrix)
+    return hider / np.sum(hider), seeker, float(value)
+
+  @staticmethod
+  def solve_approximate(game_matrix: np.ndarray | ImplicitGameMatrix, epsilon=1e-3,
+                        max_iterations=100000) -> tuple[np.array, np.array, float, float]:
+    """
+    Approximates the equilibrium by regret matching+ with alternating updates, returns the hider and seeker
+    strategies, the value and their exploitability.
+    Each iteration takes two products with the game matrix, O(n*m) plus the sparse correction in the implicit form.
+    The averages of the iterates, weighted by iteration, are returned once their exploitability
+    max(A x) - min(y A) is at most epsilon, or after max_iterations.
+    """
+    num_strategies = game_matrix.shape[0]
+    hider_regrets, seeker_regrets = np.zeros(num_strategies), np.zeros(num_strategies)
+    seeker = np.full(num_strategies, 1 / num_strategies)
+    hider_average, seeker_average = np.zeros(num_strategies), np.zeros(num_strategies)
+    upper, lower = np.inf, -np.inf
+
+    for iteration in range(1, max_iterations + 1):
+      # Hider maximizes A x, the seeker then minimizes y A against the updated hider
+      payoffs = game_matrix @ seeker
+      hider = GameSolver._regret_matching(hider_regrets, payoffs)
+      payoffs = -(hider @ game_matrix)
+      hider_average += iteration * hider
+      seeker_average += iteration * seeker
+      seeker = GameSolver._regret_matching(seeker_regrets, payoffs)
+
+      if iteration % 10 == 0 or iteration == max_iterations:
+        hider_mean, seeker_mean = hider_average / hider_average.sum(), seeker_average / seeker_average.sum()
+        upper, lower = np.max(game_matrix @ seeker_mean), np.min(hider_mean @ game_matrix)
+        if upper - lower <= epsilon:
+          break
+
+    hider_mean, seeker_mean = hider_average / hider_average.sum(), seeker_average / seeker_average.sum()
+    return hider_mean, seeker_mean, float((upper + lower) / 2), float(upper - lower)
+
+  @staticmethod
+  def _regret_matching(regrets: np.array, payoffs: np.array) -> np.array:
+    """
+    Adds the regrets of the payoffs against the current strategy, clipped at 0, returns the next strategy.
+    """
+    positive = regrets.sum()
+    strategy = regrets / positive if positive > 0 else np.full(len(regrets), 1 / len(regrets))
+    np.maximum(regrets + payoffs - strategy @ payoffs, 0, out=regrets)
+    positive = regrets.sum()
+    return regrets / positive if positive > 0 else np.full(len(regrets), 1 / len(regrets))
+
+  @staticmethod
+  def verify(game_matrix: np.ndarray | ImplicitGameMatrix, hider: np.array, seeker: np.array, tol=1e-6) -> bool:
+    """
+    Checks strategies against the value of the game found by linprog on the dense matrix, meant for tests.
+    Neither player may gain more than tol by deviating from them.
+    """
+    dense = np.asarray(game_matrix, dtype=float)
+    value = GameSolver._solve_lp(dense, primal=False).x[-1]
+    return bool(np.max(dense @ seeker) <= value + tol and np.min(hider @ dense) >= value - tol
+                and abs(np.sum(hider) - 1) <= tol and abs(np.sum(seeker) - 1) <= tol)
+
+  @staticmethod
+  def solve_hider_strategy(game_matrix: np.ndarray | ImplicitGameMatrix) -> np.array:
+    if isinstance(game_matrix, ImplicitGameMatrix):
+      return GameSolver.solve_implicit(game_matrix, primal=True)
     return GameSolver.solve(-game_matrix.T, primal=True)
 
   @staticmethod
-  def solve_seeker_strategy(game_matrix: np.array) -> np.array:
-    return GameSolver.solve(game_matrix, primal=False)
\ No newline at end of file
+  def solve_seeker_strategy(game_matrix: np.ndarray | ImplicitGameMatrix) -> np.array:
+    if isinstance(game_matrix, ImplicitGameMatrix):
+      return GameSolver.solve_implicit(game_matrix, primal=False)
+    return GameSolver.solve(game_matrix, primal=False)
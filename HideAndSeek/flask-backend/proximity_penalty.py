@@ -1,28 +1,54 @@
 import numpy as np
+from scipy import sparse
+from game_matrix import ImplicitGameMatrix
 
 class ProximityPenalty:
+    # Payoff factor for a seeker at Manhattan distance 1, 2, ... from the hider
+    FACTORS = (0.5, 0.75)
+
     @staticmethod
-    def apply(game_matrix: np.array, n: int, m: int) -> np.array:
+    def apply(game_matrix: np.array, n: int, m: int, factors: tuple[float, ...] = FACTORS) -> np.array:
         """
         Adjusts the payoffs in the game matrix based on the Manhattan distance between hider and seeker.
         """
         adjusted = game_matrix.astype(float)
-
-        size = n * m
-        for hider in range(size):
-            for seeker in range(size):
-                if hider == seeker:
-                    continue
-                dist = ProximityPenalty._manhatten_dist(seeker, hider, n, m)
-                if dist == 1:
-                    adjusted[hider, seeker] *= 0.5
-                elif dist == 2:
-                    adjusted[hider, seeker] *= 0.75
-
+        stencil = ProximityPenalty.stencil(n, m, factors)
+        adjusted[stencil.row, stencil.col] *= stencil.data
         return adjusted
 
     @staticmethod
-    def _manhatten_dist(seeker: int, hider: int, n: int, m: int) -> int:
-        seeker_row, seeker_col = divmod(seeker, m)
-        hider_row, hider_col = divmod(hider, m)
-        return abs(seeker_row - hider_row) + abs(seeker_col - hider_col)
+    def apply_implicit(game_matrix: ImplicitGameMatrix, n: int, m: int,
+                       factors: tuple[float, ...] = FACTORS) -> ImplicitGameMatrix:
+        """
+        Adjusts the payoffs of a game matrix in its implicit form, the adjusted entries go into its sparse correction.
+        """
+        stencil = ProximityPenalty.stencil(n, m, factors)
+        entries = game_matrix.rewards[stencil.row].astype(float)
+        if game_matrix.correction is not None:
+            entries += np.asarray(game_matrix.correction.tocsr()[stencil.row, stencil.col]).ravel()
+        adjustment = sparse.coo_matrix((entries * (stencil.data - 1), (stencil.row, stencil.col)), shape=stencil.shape)
+        correction = adjustment if game_matrix.correction is None else game_matrix.correction + adjustment
+        return ImplicitGameMatrix(game_matrix.rewards, game_matrix.penalties, correction.tocsr())
+
+    @staticmethod
+    def stencil(n: int, m: int, factors: tuple[float, ...] = FACTORS) -> sparse.coo_matrix:
+        """
+        Returns the factors of the hider, seeker pairs within len(factors) of each other, pairs at distance d get
+        factors[d - 1]. Only the O(n*m) pairs within the radius are stored.
+        """
+        hiders = np.arange(n * m)
+        hider_row, hider_col = np.divmod(hiders, m)
+        rows, cols, values = [], [], []
+        for dist, factor in enumerate(factors, start=1):
+            for row_offset in range(-dist, dist + 1):
+                col_offset = dist - abs(row_offset)
+                for offset in {col_offset, -col_offset}:
+                    seeker_row, seeker_col = hider_row + row_offset, hider_col + offset
+                    inside = (seeker_row >= 0) & (seeker_row < n) & (seeker_col >= 0) & (seeker_col < m)
+                    rows.append(hiders[inside])
+                    cols.append(seeker_row[inside] * m + seeker_col[inside])
+                    values.append(np.full(np.count_nonzero(inside), factor, dtype=float))
+        if not rows:
+            return sparse.coo_matrix((n * m, n * m))
+        return sparse.coo_matrix((np.concatenate(values), (np.concatenate(rows), np.concatenate(cols))),
+                                 shape=(n * m, n * m))
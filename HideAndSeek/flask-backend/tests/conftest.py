@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The backend modules are imported by name, as run.py does from the backend directory
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+from difficulty import Difficulty
+from game_board import GameBoard
+from game_matrix import GameMatrix, ImplicitGameMatrix
+from game_solver import GameSolver
+from proximity_penalty import ProximityPenalty
+
+SHAPES = [(1, 1), (1, 4), (2, 2), (3, 3), (4, 2), (5, 5), (6, 3)]
+
+
+def game_matrices(n: int, m: int, seed: int, proximity: bool) -> tuple[np.array, ImplicitGameMatrix]:
+    np.random.seed(seed)
+    game_board = GameBoard.generate(n, m)
+    implicit = GameMatrix.generate_implicit(game_board)
+    if proximity:
+        return ProximityPenalty.apply(GameMatrix.generate(game_board), n, m), ProximityPenalty.apply_implicit(implicit, n, m)
+    return GameMatrix.generate(game_board), implicit
+
+
+@pytest.mark.parametrize("n, m", SHAPES)
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("proximity", [False, True])
+def test_solve_equilibrium_matches_linprog(n, m, seed, proximity):
+    dense, implicit = game_matrices(n, m, seed, proximity)
+    _, _, lp_value = GameSolver.solve_both(dense)
+    for game_matrix in (dense, implicit):
+        hider, seeker, value = GameSolver.solve_equilibrium(game_matrix)
+        assert GameSolver.verify(game_matrix, hider, seeker)
+        assert value == pytest.approx(lp_value, abs=1e-7)
+
+
+@pytest.mark.parametrize("n, m", SHAPES)
+@pytest.mark.parametrize("seed", range(3))
+def test_closed_form_matches_solve_both(n, m, seed):
+    dense, implicit = game_matrices(n, m, seed, proximity=False)
+    hider, seeker, value = GameSolver.solve_closed_form(implicit)
+    assert GameSolver.verify(dense, hider, seeker)
+    assert value == pytest.approx(GameSolver.solve_both(implicit)[2], abs=1e-7)
+    assert value == pytest.approx(GameSolver.solve_both(dense)[2], abs=1e-7)
+
+
+@pytest.mark.parametrize("difficulty", list(Difficulty))
+def test_closed_form_with_equal_rewards(difficulty):
+    # Every row ties at the same reward, the support logic has to take all of them
+    game_board = np.full((3, 4), difficulty)
+    implicit = GameMatrix.generate_implicit(game_board)
+    hider, seeker, value = GameSolver.solve_closed_form(implicit)
+    assert GameSolver.verify(implicit, hider, seeker)
+    assert np.allclose(hider, 1 / 12) and np.allclose(seeker, 1 / 12)
+
+
+def test_closed_form_with_non_integer_payoffs():
+    np.random.seed(0)
+    rewards = np.random.rand(15) * 3
+    implicit = ImplicitGameMatrix(rewards, rewards - np.random.rand(15) * 4 - 0.1)
+    hider, seeker, value = GameSolver.solve_closed_form(implicit)
+    assert GameSolver.verify(implicit, hider, seeker)
+    assert value == pytest.approx(GameSolver.solve_both(implicit.toarray())[2], abs=1e-7)
+
+
+def test_dense_matrix_without_structure_falls_back_to_linprog():
+    np.random.seed(0)
+    game_matrix = np.random.rand(8, 8)
+    assert GameMatrix.to_implicit(game_matrix) is None
+    hider, seeker, _ = GameSolver.solve_equilibrium(game_matrix)
+    assert GameSolver.verify(game_matrix, hider, seeker)
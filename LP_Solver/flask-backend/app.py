@@ -1,11 +1,18 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from marshmallow import ValidationError
 from flask_cors import CORS
 from data_mapper import Marshaller
 from simplex.solver import SimplexSolver
+from streaming import stream_solve
+from batch import solve_batch
+from jobs import JobStore
+from result_cache import ResultCache, payload_key
+from simplex.util import latex_cache_info
 
 app = Flask(__name__)
 CORS(app)
+job_store = JobStore()
+result_cache = ResultCache()
 
 
 @app.route('/solve', methods=['POST'])
@@ -16,20 +23,104 @@ def solve():
 
         data = request.get_json()
 
-        simplex_input = Marshaller.convert_input_data(data)
+        validated_data = Marshaller.validate_input_data(data)
+        key = payload_key(validated_data)
+        body = result_cache.get(key)
+        if body is not None:
+            return Response(body, status=200, mimetype='application/json')
+
+        simplex_input = Marshaller.convert_validated_data(validated_data)
         print("Parsed input")
         simplex_solver = SimplexSolver(**simplex_input)
         simplex_solver.solve()
         print("Solved")
         output = Marshaller.convert_output_data(simplex_solver.result)
         print("Result Sent")
-        return jsonify(output), 200
+        response = jsonify(output)
+        # A search stopped at its node or time limit depends on the speed and load of the machine
+        if not simplex_solver.result.get("branchAndBound", {}).get("limitReached"):
+            result_cache.put(key, response.get_data())
+        return response, 200
+
+    except ValidationError as err:
+        return jsonify({"error": "Invalid input", "details": err.messages}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route('/solve/stream', methods=['POST'])
+def solve_stream():
+    try:
+        if not request.is_json:
+            return jsonify({"error": "Request must be JSON"}), 400
+
+        simplex_input = Marshaller.convert_input_data(request.get_json())
+        return Response(stream_solve(simplex_input), mimetype='application/x-ndjson')
 
     except ValidationError as err:
         return jsonify({"error": "Invalid input", "details": err.messages}), 400
+    except ValueError as err:
+        # Raised by Marshaller for input the schema rejects, before the stream starts
+        return jsonify({"error": "Invalid input", "details": str(err)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+@app.route('/solve/batch', methods=['POST'])
+def solve_many():
+    try:
+        if not request.is_json:
+            return jsonify({"error": "Request must be JSON"}), 400
+
+        instances = request.get_json()
+        if not isinstance(instances, list) or not all(isinstance(data, dict) for data in instances):
+            return jsonify({"error": "Request must be a list of LP instances"}), 400
+
+        return jsonify(solve_batch(instances)), 200
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    try:
+        if not request.is_json:
+            return jsonify({"error": "Request must be JSON"}), 400
+
+        simplex_input = Marshaller.convert_input_data(request.get_json())
+        job = job_store.submit(simplex_input)
+        return jsonify({"jobId": job.id, "status": job.status.value}), 202
+
+    except ValidationError as err:
+        return jsonify({"error": "Invalid input", "details": err.messages}), 400
+    except ValueError as err:
+        # Raised by Marshaller or the solver for input the schema rejects, before the job is queued
+        return jsonify({"error": "Invalid input", "details": str(err)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    job = job_store.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown or expired job"}), 404
+    return jsonify(job.to_dict()), 200
+
+
+@app.route('/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    job = job_store.cancel(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown or expired job"}), 404
+    return jsonify(job.to_dict()), 200
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    return jsonify({"latexCache": latex_cache_info(), "resultCache": result_cache.info()}), 200
+
+
 if __name__ == '__main__':
     app.run(debug=True, port=8080)
@@ -0,0 +1,44 @@
+import os
+from data_mapper import Marshaller
+from simplex.solver import SimplexSolver
+from simplex.util import ProcessPool
+
+# Worker processes of the batch pool, defaults to one per core
+BATCH_WORKERS = int(os.environ.get("SOLVE_BATCH_WORKERS", 0)) or os.cpu_count() or 1
+
+
+def _warm_worker() -> None:
+    # Pay the SymPy / SciPy import cost once per worker instead of on the first instance it solves
+    import simplex.core
+    import simplex.solver
+    import data_mapper
+
+
+def solve_instance(data: dict) -> dict:
+    """
+    Solves one LP instance the way /solve does, failures are returned as {"error": ...} instead of raised.
+    """
+    try:
+        simplex_solver = SimplexSolver(**Marshaller.convert_input_data(data))
+        simplex_solver.solve()
+        return Marshaller.convert_output_data(simplex_solver.result)
+    except Exception as e:
+        return {"error": str(e)}
+
+
+_pool = ProcessPool(BATCH_WORKERS, initializer=_warm_worker)
+
+
+def solve_batch(instances: list[dict]) -> list[dict]:
+    """
+    Solves the instances in parallel on the worker pool and returns their outputs in order.
+    """
+    futures = [_pool.submit(solve_instance, data) for data in instances]
+    results = []
+    for future in futures:
+        try:
+            results.append(future.result())
+        except Exception as e:
+            # A worker died, e.g. out of memory, the instances left on its pool fail, the next batch gets a new pool
+            results.append({"error": str(e)})
+    return results
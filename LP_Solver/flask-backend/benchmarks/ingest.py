@@ -0,0 +1,57 @@
+"""
+Micro-benchmark of the input conversion of /solve.
+Times to_exact on every coefficient of a random model against nsimplify, which is timed on a sample only
+and extrapolated, converting a full 200x300 model with it takes minutes.
+
+Run from LP_Solver/flask-backend:  python -m benchmarks.ingest [--rows 200] [--cols 300] [--decimals 0.5]
+"""
+import argparse
+import random
+import time
+from sympy import nsimplify
+from simplex.util import to_exact, exact_matrix
+
+
+def make_model(rows: int, cols: int, decimals: float, seed: int) -> list[list[float]]:
+    """
+    Random augmented constraint matrix as the JSON parser hands it over, integers and short decimal literals.
+    """
+    rnd = random.Random(seed)
+    return [[round(rnd.uniform(-100, 100), rnd.randint(1, 4)) if rnd.random() < decimals else float(rnd.randint(-50, 50))
+             for _ in range(cols + 1)] for _ in range(rows)]
+
+
+def timed(fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--cols", type=int, default=300)
+    parser.add_argument("--decimals", type=float, default=0.5, help="share of non-integer coefficients")
+    parser.add_argument("--sample", type=int, default=500, help="coefficients converted with nsimplify")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    model = make_model(args.rows, args.cols, args.decimals, args.seed)
+    values = [val for row in model for val in row]
+    sample = random.Random(args.seed).sample(values, min(args.sample, len(values)))
+
+    fast = timed(lambda: [to_exact(val) for val in values])
+    fast_matrix = timed(exact_matrix, model)
+    legacy = timed(lambda: [nsimplify(val) for val in sample]) / len(sample) * len(values)
+    differing = sum(to_exact(val) != nsimplify(val) for val in sample)
+
+    print(f"{args.rows}x{args.cols + 1} coefficients, {args.decimals:.0%} decimals")
+    print(f"  to_exact          {fast:10.3f} s  {fast / len(values) * 1e6:10.1f} us/value")
+    print(f"  exact_matrix      {fast_matrix:10.3f} s")
+    print(f"  nsimplify (est.)  {legacy:10.3f} s  {legacy / len(values) * 1e6:10.1f} us/value")
+    print(f"  speedup           {legacy / fast:10.0f} x")
+    print(f"  sample values where nsimplify gave a different number: {differing}/{len(sample)}")
+
+
+if __name__ == "__main__":
+    main()
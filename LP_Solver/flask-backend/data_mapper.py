@@ -1,17 +1,122 @@
-from marshmallow import Schema, fields, validate, ValidationError
-from sympy import Matrix, latex, nsimplify
-from simplex.classes import RelationOperator, ArtificialSolutionMethod
+from marshmallow import Schema, fields, validate, validates, validates_schema, ValidationError
+from scipy import sparse
+from sympy import Matrix, SparseMatrix
+from simplex.util import cached_latex, decode_basis_token, to_exact, exact_matrix
+from simplex.classes import RelationOperator, ArtificialSolutionMethod, SolveMode, TraceLevel, PricingRule, ScalingMethod, \
+    GoalProgrammingMethod
+
+
+class SparseMatrixSchema(Schema):
+    """
+    Sparse augmented matrix given either in CSR form (indptr, indices, data)
+    or in coordinate form (rows, indices, data), indices are the column indices.
+    """
+    shape = fields.List(fields.Integer(validate=validate.Range(min=1)), required=True, validate=validate.Length(equal=2))
+    indptr = fields.List(fields.Integer(validate=validate.Range(min=0)), required=False, missing=None)
+    rows = fields.List(fields.Integer(validate=validate.Range(min=0)), required=False, missing=None)
+    indices = fields.List(fields.Integer(validate=validate.Range(min=0)), required=True)
+    data = fields.List(fields.Number(), required=True)
+
+    @validates_schema
+    def validate_format(self, data, **kwargs):
+        if (data["indptr"] is None) == (data["rows"] is None):
+            raise ValidationError("Exactly one of indptr (CSR) or rows (coordinate) must be given.")
+        if len(data["indices"]) != len(data["data"]) or (data["rows"] is not None and len(data["rows"]) != len(data["data"])):
+            raise ValidationError("indices, rows and data must have the same length.")
 
 
 class SimplexSchema(Schema):
     objectiveFunctionCoefficientsVector = fields.List(fields.List(fields.Number()), required=False, missing=None)
-    constraintsCoefficientsMatrix = fields.List(fields.List(fields.Number()), required=True)
+    constraintsCoefficientsMatrix = fields.List(fields.List(fields.Number()), required=False, missing=None)
+    constraintsCoefficientsSparse = fields.Nested(SparseMatrixSchema, required=False, missing=None)
     constraintsRelations = fields.List(fields.Str(validate=validate.OneOf([">=", "=", "<="])), required=True)
     goalsCoefficientsMatrix = fields.List(fields.List(fields.Number()), required=False, missing=None)
     goalsRelations = fields.List(fields.Str(validate=validate.OneOf([">=", "=", "<="])), required=False, missing=None)
     restricted = fields.List(fields.Boolean(), required=True)
     isMaximization = fields.Boolean(required=False, missing=None)
     method = fields.Str(required=False, validate=validate.OneOf(["M", "TP"]), missing=None)
+    mode = fields.Str(required=False, validate=validate.OneOf(["exact", "numeric", "revised"]), missing="exact")
+    trace = fields.Str(required=False, validate=validate.OneOf(["none", "pivot", "row"]), missing="row")
+    pricing = fields.Str(required=False, validate=validate.OneOf([rule.value for rule in PricingRule]),
+                         missing=PricingRule.STEEPEST_EDGE.value)
+    scaling = fields.Str(required=False, validate=validate.OneOf([method.value for method in ScalingMethod]),
+                         missing=ScalingMethod.GEOMETRIC.value)
+    goalMethod = fields.Str(required=False, validate=validate.OneOf([method.value for method in GoalProgrammingMethod]),
+                            missing=GoalProgrammingMethod.PRIORITY.value)
+    warmStart = fields.Str(required=False, missing=None)
+    presolve = fields.Boolean(required=False, missing=False)
+    lowerBounds = fields.List(fields.Number(allow_none=True), required=False, missing=None)
+    upperBounds = fields.List(fields.Number(allow_none=True), required=False, missing=None)
+    integer = fields.List(fields.Boolean(), required=False, missing=None)
+    nodeLimit = fields.Int(required=False, validate=validate.Range(min=1), missing=None)
+    timeLimit = fields.Number(required=False, validate=validate.Range(min=0, min_inclusive=False), missing=None)
+
+    @validates_schema
+    def validate_constraints(self, data, **kwargs):
+        if (data["constraintsCoefficientsMatrix"] is None) == (data["constraintsCoefficientsSparse"] is None):
+            raise ValidationError("Exactly one of constraintsCoefficientsMatrix or constraintsCoefficientsSparse must be given.")
+        self.__validate_shapes(data)
+        if data["warmStart"] is not None and data["mode"] == SolveMode.EXACT.value:
+            raise ValidationError("warmStart is only supported in numeric and revised modes.")
+        if data["goalMethod"] == GoalProgrammingMethod.SEQUENTIAL.value and data["mode"] == SolveMode.EXACT.value:
+            raise ValidationError("goalMethod sequential is only supported in numeric and revised modes.")
+        for bounds in ("lowerBounds", "upperBounds"):
+            if data[bounds] is not None and len(data[bounds]) != len(data["restricted"]):
+                raise ValidationError(f"{bounds} must have one entry per variable.")
+        if data["integer"] is not None:
+            if len(data["integer"]) != len(data["restricted"]):
+                raise ValidationError("integer must have one entry per variable.")
+            if any(data["integer"]) and data["goalsCoefficientsMatrix"] is not None:
+                raise ValidationError("integer is only supported with an objective function.")
+        if data["upperBounds"] is not None:
+            lower_bounds = data["lowerBounds"] or [None] * len(data["restricted"])
+            for j, (restricted, lower, upper) in enumerate(zip(data["restricted"], lower_bounds, data["upperBounds"])):
+                lower = max(lower if lower is not None else 0, 0) if restricted else lower
+                if upper is not None and lower is not None and upper < lower:
+                    raise ValidationError(f"Upper bound of x_{j + 1} is below its lower bound.")
+
+    def __validate_shapes(self, data):
+        """
+        Every row has a coefficient per variable, augmented matrices one more for the right-hand side,
+        and every constraint and goal row has a relation.
+        """
+        variables = len(data["restricted"])
+        rows = len(data["constraintsRelations"])
+        if data["objectiveFunctionCoefficientsVector"] is not None:
+            if any(len(row) != variables for row in data["objectiveFunctionCoefficientsVector"]):
+                raise ValidationError("objectiveFunctionCoefficientsVector must have one entry per variable.")
+        if data["constraintsCoefficientsMatrix"] is not None:
+            if len(data["constraintsCoefficientsMatrix"]) != rows:
+                raise ValidationError("constraintsRelations must have one entry per constraint.")
+            if any(len(row) != variables + 1 for row in data["constraintsCoefficientsMatrix"]):
+                raise ValidationError("Every constraint must have one entry per variable and a right-hand side.")
+        if data["constraintsCoefficientsSparse"] is not None:
+            sparse_matrix = data["constraintsCoefficientsSparse"]
+            if sparse_matrix["shape"] != [rows, variables + 1]:
+                raise ValidationError("constraintsCoefficientsSparse must have a row per constraint relation "
+                                      "and a column per variable and the right-hand side.")
+            if any(j > variables for j in sparse_matrix["indices"]):
+                raise ValidationError("constraintsCoefficientsSparse has a column index out of range.")
+            if sparse_matrix["rows"] is not None and any(i >= rows for i in sparse_matrix["rows"]):
+                raise ValidationError("constraintsCoefficientsSparse has a row index out of range.")
+            indptr = sparse_matrix["indptr"]
+            if indptr is not None and (len(indptr) != rows + 1 or indptr[-1] != len(sparse_matrix["data"])
+                                       or any(a > b for a, b in zip(indptr, indptr[1:]))):
+                raise ValidationError("constraintsCoefficientsSparse indptr must have rows + 1 nondecreasing "
+                                      "entries ending at the number of entries.")
+        if data["goalsCoefficientsMatrix"] is not None:
+            if data["goalsRelations"] is None or len(data["goalsRelations"]) != len(data["goalsCoefficientsMatrix"]):
+                raise ValidationError("goalsRelations must have one entry per goal.")
+            if any(len(row) != variables + 1 for row in data["goalsCoefficientsMatrix"]):
+                raise ValidationError("Every goal must have one entry per variable and a right-hand side.")
+
+    @validates("warmStart")
+    def validate_warm_start(self, value, **kwargs):
+        if value is not None:
+            try:
+                decode_basis_token(value)
+            except ValueError as e:
+                raise ValidationError(str(e))
 
 
 class Marshaller:
@@ -19,25 +124,49 @@ class Marshaller:
 
     @staticmethod
     def convert_input_data(data):
+        return Marshaller.convert_validated_data(Marshaller.validate_input_data(data))
+
+
+    @staticmethod
+    def validate_input_data(data):
         try:
-            validated_data = Marshaller.schema.load(data)
+            return Marshaller.schema.load(data)
         except ValidationError as err:
             raise ValueError(f"Invalid input data: {err.messages}")
 
+
+    @staticmethod
+    def convert_validated_data(validated_data):
         print("Validated input data")
         print(validated_data)
         simplex_input: dict = {}
+        simplex_input["solve_mode"] = SolveMode(validated_data["mode"])
+        simplex_input["trace_level"] = TraceLevel(validated_data["trace"])
+        simplex_input["pricing_rule"] = PricingRule(validated_data["pricing"])
+        simplex_input["scaling_method"] = ScalingMethod(validated_data["scaling"])
+        simplex_input["goal_method"] = GoalProgrammingMethod(validated_data["goalMethod"])
+        simplex_input["warm_start"] = validated_data["warmStart"]
+        simplex_input["presolve"] = validated_data["presolve"]
+        simplex_input["lower_bounds"] = Marshaller.convert_bounds(validated_data["lowerBounds"])
+        simplex_input["upper_bounds"] = Marshaller.convert_bounds(validated_data["upperBounds"])
+        simplex_input["integer"] = validated_data["integer"]
+        simplex_input["node_limit"] = validated_data["nodeLimit"]
+        simplex_input["time_limit"] = validated_data["timeLimit"]
 
         if validated_data["objectiveFunctionCoefficientsVector"]:
-            simplex_input["objective_function_coefficients_vector"] = Matrix(
-                [[nsimplify(val) for val in row] for row in validated_data["objectiveFunctionCoefficientsVector"]])
+            simplex_input["objective_function_coefficients_vector"] = exact_matrix(
+                validated_data["objectiveFunctionCoefficientsVector"])
         else:
             simplex_input["objective_function_coefficients_vector"] = None
-        simplex_input["aug_constraints_coefficients_matrix"] = Matrix([[nsimplify(val) for val in row] for row in validated_data["constraintsCoefficientsMatrix"]])
+        if validated_data["constraintsCoefficientsSparse"]:
+            simplex_input["aug_constraints_coefficients_matrix"] = Marshaller.convert_sparse_matrix(
+                validated_data["constraintsCoefficientsSparse"], simplex_input["solve_mode"])
+        else:
+            simplex_input["aug_constraints_coefficients_matrix"] = exact_matrix(validated_data["constraintsCoefficientsMatrix"])
         simplex_input["constraints_relations"] = [RelationOperator(op) for op in validated_data["constraintsRelations"]]
         if validated_data["goalsCoefficientsMatrix"]:
-            simplex_input["aug_goals_coefficients_matrix"] = Matrix(
-                [[nsimplify(val) for val in row] for row in validated_data["goalsCoefficientsMatrix"]])
+            simplex_input["aug_goals_coefficients_matrix"] = exact_matrix(
+                validated_data["goalsCoefficientsMatrix"])
         else:
             simplex_input["aug_goals_coefficients_matrix"] = None
         if validated_data["goalsRelations"]:
@@ -57,31 +186,91 @@ class Marshaller:
         return simplex_input
 
 
+    @staticmethod
+    def convert_bounds(bounds):
+        """
+        Missing bounds stay None, an infinite one is the same as none.
+        """
+        if bounds is None:
+            return None
+        return [to_exact(b) if b is not None and abs(b) != float('inf') else None for b in bounds]
+
+
+    @staticmethod
+    def convert_sparse_matrix(data, solve_mode: SolveMode) -> Matrix | sparse.csr_matrix:
+        """
+        Numeric modes keep the matrix sparse, the exact mode needs a dense SymPy matrix of exact values.
+        """
+        rows, cols = data["shape"]
+        if data["indptr"] is not None:
+            matrix = sparse.csr_matrix((data["data"], data["indices"], data["indptr"]), shape=(rows, cols))
+        else:
+            matrix = sparse.csr_matrix((data["data"], (data["rows"], data["indices"])), shape=(rows, cols))
+
+        if solve_mode != SolveMode.EXACT:
+            return matrix
+        coo = matrix.tocoo()
+        return Matrix(SparseMatrix(rows, cols, {(int(i), int(j)): to_exact(val) for i, j, val in zip(coo.row, coo.col, coo.data)}))
+
+
     @staticmethod
     def convert_output_data(result):
         print("Simplex result:")
         r: dict = {
-            "steps": [
-                {
-                    "variables": [latex(var) for var in step["variables"]],
-                    "zRowsSymbols": [latex(z) for z in step["zRowsSymbols"]],
-                    "basicVariables": [latex(var) for var in step["basicVariables"]],
-                    "simplexMatrix": [[latex(cell) for cell in row] for row in step["simplexMatrix"]],
-                    "enteringVariableIndex": step.get("enteringVariableIndex"),
-                    "leavingVariableIndex": step.get("leavingVariableIndex"),
-                    "comment": step["comment"]
-                }
-                for step in result["steps"]
-            ],
+            "steps": [Marshaller.convert_step(step) for step in result["steps"]],
+        }
+        r.update(Marshaller.convert_summary(result))
+        return r
+
+
+    @staticmethod
+    def convert_step(step):
+        return {
+            "variables": [cached_latex(var) for var in step["variables"]],
+            "zRowsSymbols": [cached_latex(z) for z in step["zRowsSymbols"]],
+            "basicVariables": [cached_latex(var) for var in step["basicVariables"]],
+            "simplexMatrix": [[cached_latex(cell) for cell in row] for row in step["simplexMatrix"]],
+            "enteringVariableIndex": step.get("enteringVariableIndex"),
+            "leavingVariableIndex": step.get("leavingVariableIndex"),
+            "comment": step["comment"]
+        }
+
+
+    @staticmethod
+    def convert_summary(result):
+        """
+        Everything of the result except its steps.
+        """
+        r: dict = {
             "status": result["status"].value,
         }
         if result.get("finalDecisionVariablesValues"):
-            r["finalDecisionVariablesValues"] = [latex(val) for val in result["finalDecisionVariablesValues"]]
+            r["finalDecisionVariablesValues"] = [Marshaller.render_value(val) for val in result["finalDecisionVariablesValues"]]
 
         if result.get("goalsSatisfied"):
-            r["goalsSatisfied"] = [latex(goal) for goal in result.get("goalsSatisfied", [])]
+            r["goalsSatisfied"] = [cached_latex(goal) for goal in result.get("goalsSatisfied", [])]
         elif result.get("finalObjectiveFunctionValue"):
-            r["finalObjectiveFunctionValue"] =  latex(result["finalObjectiveFunctionValue"])
+            r["finalObjectiveFunctionValue"] =  Marshaller.render_value(result["finalObjectiveFunctionValue"])
+
+        if result.get("method"):
+            r["method"] = result["method"]
+        if result.get("basisToken"):
+            r["basisToken"] = result["basisToken"]
+        if "warmStarted" in result:
+            r["warmStarted"] = result["warmStarted"]
+        if result.get("scaling"):
+            r["scaling"] = result["scaling"]
+        if result.get("presolve"):
+            r["presolve"] = result["presolve"]
+        if result.get("branchAndBound"):
+            r["branchAndBound"] = result["branchAndBound"]
 
         return r
 
+
+    @staticmethod
+    def render_value(value):
+        """
+        Numeric mode values are plain floats and are sent as JSON numbers, exact values are rendered as LaTeX.
+        """
+        return value if isinstance(value, float) else cached_latex(value)
@@ -0,0 +1,117 @@
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, Future
+from enum import Enum
+from data_mapper import Marshaller
+from simplex.classes import SolveCancelled
+from simplex.solver import SimplexSolver
+
+# Solves running at the same time, further jobs wait in the queue
+JOB_WORKERS = int(os.environ.get("SOLVE_JOB_WORKERS", 2))
+# Seconds a finished job and its result are kept
+JOB_TTL = float(os.environ.get("SOLVE_JOB_TTL", 3600))
+
+
+class JobStatus(Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class Job:
+    def __init__(self, simplex_input: dict) -> None:
+        self.id = uuid.uuid4().hex
+        self.status = JobStatus.QUEUED
+        self.cancelled = threading.Event()
+        self.solver = SimplexSolver(**simplex_input, cancelled=self.cancelled)
+        self.output: dict | None = None
+        self.error: str | None = None
+        self.finished_at: float | None = None
+        self.future: Future | None = None
+
+
+    def run(self) -> None:
+        if self.cancelled.is_set():
+            # Cancelled after a worker picked the job up, or before its future was assigned
+            self.status = JobStatus.CANCELLED
+            self.finished_at = time.monotonic()
+            return
+        self.status = JobStatus.RUNNING
+        try:
+            self.solver.solve()
+            self.output = Marshaller.convert_output_data(self.solver.result)
+            self.status = JobStatus.SUCCEEDED
+        except SolveCancelled:
+            self.status = JobStatus.CANCELLED
+        except Exception as e:
+            self.error = str(e)
+            self.status = JobStatus.FAILED
+        finally:
+            self.finished_at = time.monotonic()
+
+
+    def cancel(self) -> None:
+        self.cancelled.set()
+        if self.future is not None and self.future.cancel():
+            # Never started, run() will not be called
+            self.status = JobStatus.CANCELLED
+            self.finished_at = time.monotonic()
+
+
+    def to_dict(self) -> dict:
+        r: dict = {
+            "jobId": self.id,
+            "status": self.status.value,
+            "progress": {"steps": self.solver.step_cnt},
+        }
+        if self.output is not None:
+            r["result"] = self.output
+        if self.error is not None:
+            r["error"] = self.error
+        return r
+
+
+class JobStore:
+    """
+    Runs solves on a bounded thread pool and keeps their jobs until TTL seconds after they finish.
+    Expired jobs are evicted whenever the store is accessed.
+    """
+    def __init__(self, workers: int = JOB_WORKERS, ttl: float = JOB_TTL) -> None:
+        self.ttl = ttl
+        self.__pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="solve-job")
+        self.__jobs: dict[str, Job] = {}
+        self.__lock = threading.Lock()
+
+
+    def submit(self, simplex_input: dict) -> Job:
+        job = Job(simplex_input)
+        with self.__lock:
+            self.__evict()
+            self.__jobs[job.id] = job
+        job.future = self.__pool.submit(job.run)
+        return job
+
+
+    def get(self, job_id: str) -> Job | None:
+        with self.__lock:
+            self.__evict()
+            return self.__jobs.get(job_id)
+
+
+    def cancel(self, job_id: str) -> Job | None:
+        job = self.get(job_id)
+        if job is not None:
+            job.cancel()
+        return job
+
+
+    def __evict(self) -> None:
+        now = time.monotonic()
+        expired = [job_id for job_id, job in self.__jobs.items()
+                   if job.finished_at is not None and now - job.finished_at > self.ttl]
+        for job_id in expired:
+            del self.__jobs[job_id]
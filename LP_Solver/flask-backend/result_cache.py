@@ -0,0 +1,109 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+# Bytes of rendered results kept in memory
+RESULT_CACHE_BYTES = int(os.environ.get("SOLVE_CACHE_BYTES", 64 << 20))
+# Directory results are also written to so they survive restarts, disabled when unset
+RESULT_CACHE_DIR = os.environ.get("SOLVE_CACHE_DIR") or None
+
+
+def payload_key(validated_data: dict) -> str:
+    """
+    Returns the content address of a validated /solve payload, equal payloads hash alike whatever their key order.
+    """
+    canonical = json.dumps(validated_data, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    LRU cache of rendered /solve responses keyed by payload_key, bounded by the total size of the responses.
+    With a directory every response is also stored as a file and memory misses fall back to it.
+    """
+    def __init__(self, max_bytes: int = RESULT_CACHE_BYTES, directory: str | None = RESULT_CACHE_DIR) -> None:
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.__entries: OrderedDict[str, bytes] = OrderedDict()
+        self.__size = 0
+        self.__lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+
+    def get(self, key: str) -> bytes | None:
+        with self.__lock:
+            body = self.__entries.get(key)
+            if body is not None:
+                self.__entries.move_to_end(key)
+                self.hits += 1
+                return body
+
+        body = self.__read(key)
+        with self.__lock:
+            if body is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self.__insert(key, body)
+        return body
+
+
+    def put(self, key: str, body: bytes) -> None:
+        with self.__lock:
+            self.__insert(key, body)
+        self.__write(key, body)
+
+
+    def info(self) -> dict:
+        with self.__lock:
+            return {"hits": self.hits, "diskHits": self.disk_hits, "misses": self.misses,
+                    "evictions": self.evictions, "entries": len(self.__entries),
+                    "bytes": self.__size, "maxBytes": self.max_bytes}
+
+
+    def __insert(self, key: str, body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        if key in self.__entries:
+            self.__size -= len(self.__entries.pop(key))
+        self.__entries[key] = body
+        self.__size += len(body)
+        while self.__size > self.max_bytes:
+            _, evicted = self.__entries.popitem(last=False)
+            self.__size -= len(evicted)
+            self.evictions += 1
+
+
+    def __path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+
+    def __read(self, key: str) -> bytes | None:
+        if self.directory is None:
+            return None
+        try:
+            with open(self.__path(key), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+
+    def __write(self, key: str, body: bytes) -> None:
+        if self.directory is None:
+            return
+        # Written aside and renamed so a crash never leaves a truncated result behind
+        tmp = f"{self.__path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, 'wb') as f:
+                f.write(body)
+            os.replace(tmp, self.__path(key))
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
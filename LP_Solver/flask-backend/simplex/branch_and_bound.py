@@ -0,0 +1,210 @@
+import copy
+import heapq
+import itertools
+import math
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, FIRST_COMPLETED, wait
+from sympy import Integer
+from simplex.classes import SimplexTerminationStatus, SolveMode, TraceLevel, SolveCancelled
+from simplex.util import ProcessPool
+
+# Worker processes solving nodes, defaults to one per core, with a single worker nodes are solved in process
+BRANCH_AND_BOUND_WORKERS = int(os.environ.get("SOLVE_BNB_WORKERS", 0)) or os.cpu_count() or 1
+NODE_LIMIT = 10000
+# Seconds
+TIME_LIMIT = 60.0
+# A value this close to an integer counts as integral
+INTEGER_TOL = 1e-6
+
+_pool = ProcessPool(BRANCH_AND_BOUND_WORKERS)
+
+
+def solve_node(relaxation_input: dict, lower_bounds: list, upper_bounds: list, warm_start: str | None) -> dict:
+    """
+    Solves the LP relaxation of a node, the relaxation with the bounds of the node, without recording steps.
+    """
+    # simplex.solver imports this module
+    from simplex.solver import SimplexSolver
+    simplex_solver = SimplexSolver(**dict(relaxation_input, trace_level=TraceLevel.NONE, lower_bounds=lower_bounds,
+                                          upper_bounds=upper_bounds, warm_start=warm_start))
+    simplex_solver.solve()
+    result = simplex_solver.result
+    return {
+        "status": result["status"],
+        "finalDecisionVariablesValues": result.get("finalDecisionVariablesValues"),
+        "finalObjectiveFunctionValue": result.get("finalObjectiveFunctionValue"),
+        "basisToken": result.get("basisToken"),
+        "steps": simplex_solver.step_cnt,
+    }
+
+
+class _Node:
+    def __init__(self, bound, lower_bounds: list, upper_bounds: list, warm_start: str | None, depth: int) -> None:
+        self.bound = bound
+        self.lower_bounds = lower_bounds
+        self.upper_bounds = upper_bounds
+        self.warm_start = warm_start
+        self.depth = depth
+
+
+class BranchAndBound:
+    """
+    Branch-and-bound over the LP relaxation solved by SimplexSolver for LPs with integer decision variables.
+    A node is the relaxation with tightened variable bounds, a fractional integer variable x = v branches it into
+    x <= floor(v) and x >= ceil(v). Children start from the final basis of their parent, the parent basis stays
+    optimal with only the bounds changed and the dual simplex restores feasibility, in the exact mode they are
+    solved from scratch.
+    Nodes are explored best bound first, up to one per worker process at a time. The incumbent is kept here,
+    every node result is checked against it and nodes whose bound cannot beat it are pruned.
+    The search stops at the node or time limit, the incumbent is then reported without a proof of optimality.
+    """
+    def __init__(self, relaxation_input: dict, integer: list[bool],
+                 node_limit: int | None = None, time_limit: float | None = None,
+                 cancelled: threading.Event | None = None) -> None:
+        self.relaxation_input = relaxation_input
+        self.integer = integer
+        self.is_max = bool(relaxation_input["is_maximization"])
+        self.node_limit = node_limit if node_limit is not None else NODE_LIMIT
+        self.time_limit = time_limit if time_limit is not None else TIME_LIMIT
+        self.warm_starts = relaxation_input.get("solve_mode", SolveMode.EXACT) != SolveMode.EXACT
+        # Worker processes of another pool, e.g. of /solve/batch, already take a core each and solve nodes in process
+        self.workers = BRANCH_AND_BOUND_WORKERS if multiprocessing.parent_process() is None else 1
+        self.cancelled = cancelled
+        self.incumbent: dict | None = None
+        self.node_cnt = 0
+        self.step_cnt = 0
+        self.limit_reached = False
+        self.best_bound = None
+        self.__heap: list = []
+        self.__counter = itertools.count()
+
+
+    def run(self, root: dict) -> dict | None:
+        """
+        Searches the tree below the solved root relaxation, given in the form solve_node returns,
+        returns the best integer solution found or None.
+        """
+        self.node_cnt = 1
+        self.best_bound = root["finalObjectiveFunctionValue"]
+        lower_bounds = list(self.relaxation_input.get("lower_bounds") or [None] * len(self.integer))
+        upper_bounds = list(self.relaxation_input.get("upper_bounds") or [None] * len(self.integer))
+        self.__process(_Node(root["finalObjectiveFunctionValue"], lower_bounds, upper_bounds, None, 0), root)
+
+        started = time.monotonic()
+        pool = _pool if self.workers > 1 else None
+        running: dict[Future, _Node] = {}
+        try:
+            while self.__heap or running:
+                self.__check_cancelled()
+                if self.node_cnt >= self.node_limit or time.monotonic() - started >= self.time_limit:
+                    self.limit_reached = bool(self.__heap or running)
+                    break
+                while self.__heap and len(running) < self.workers and self.node_cnt + len(running) < self.node_limit:
+                    node = heapq.heappop(self.__heap)[-1]
+                    if self.__prunable(node.bound):
+                        continue
+                    running[self.__submit(pool, node)] = node
+                if not running:
+                    continue
+
+                done, _ = wait(running, timeout=max(self.time_limit - (time.monotonic() - started), 0),
+                               return_when=FIRST_COMPLETED)
+                for future in done:
+                    node = running.pop(future)
+                    self.node_cnt += 1
+                    self.__process(node, future.result())
+
+            if self.limit_reached:
+                bounds = [node.bound for node in running.values()] + [entry[-1].bound for entry in self.__heap]
+                if self.incumbent is not None:
+                    bounds.append(self.incumbent["finalObjectiveFunctionValue"])
+                self.best_bound = max(bounds) if self.is_max else min(bounds)
+            elif self.incumbent is not None:
+                self.best_bound = self.incumbent["finalObjectiveFunctionValue"]
+        finally:
+            for future in running:
+                future.cancel()
+        return self.incumbent
+
+
+    def summary(self) -> dict:
+        r: dict = {
+            "nodes": self.node_cnt,
+            "limitReached": self.limit_reached,
+            "bestBound": float(self.best_bound) if self.best_bound is not None else None,
+        }
+        if self.incumbent is not None:
+            objective = float(self.incumbent["finalObjectiveFunctionValue"])
+            r["gap"] = abs(float(self.best_bound) - objective) / max(1.0, abs(objective))
+        return r
+
+
+    def __submit(self, pool: ProcessPool | None, node: _Node) -> Future:
+        args = (node.lower_bounds, node.upper_bounds, node.warm_start if self.warm_starts else None)
+        if pool is not None:
+            return pool.submit(solve_node, self.relaxation_input, *args)
+        # Solved right away, the solver rewrites the matrices it is given
+        future: Future = Future()
+        future.set_result(solve_node(copy.deepcopy(self.relaxation_input), *args))
+        return future
+
+
+    def __process(self, node: _Node, result: dict) -> None:
+        """
+        Updates the incumbent with the solved relaxation of a node or branches it.
+        """
+        self.step_cnt += result.get("steps", 0)
+        if result["status"] in (SimplexTerminationStatus.INFEASIBLE, SimplexTerminationStatus.UNBOUNDED):
+            return
+        objective = result["finalObjectiveFunctionValue"]
+        if self.__prunable(objective):
+            return
+
+        branching = self.__branching_variable(result["finalDecisionVariablesValues"])
+        if branching == -1:
+            self.incumbent = result
+            # Nodes waiting in the heap are pruned when they are popped
+            return
+
+        value = result["finalDecisionVariablesValues"][branching]
+        down_upper = list(node.upper_bounds)
+        down_upper[branching] = Integer(math.floor(value))
+        up_lower = list(node.lower_bounds)
+        up_lower[branching] = Integer(math.ceil(value))
+        for lower_bounds, upper_bounds in ((node.lower_bounds, down_upper), (up_lower, node.upper_bounds)):
+            if self.__consistent(branching, lower_bounds[branching], upper_bounds[branching]):
+                child = _Node(objective, lower_bounds, upper_bounds, result.get("basisToken"), node.depth + 1)
+                # Best bound first, deeper nodes first among equal bounds
+                key = -float(objective) if self.is_max else float(objective)
+                heapq.heappush(self.__heap, (key, -child.depth, next(self.__counter), child))
+
+
+    def __branching_variable(self, values: list) -> int:
+        """
+        Returns the most fractional integer variable, -1 if every integer variable is integral.
+        """
+        fractions = [(abs(float(value) - math.floor(float(value)) - 0.5), j) for j, value in enumerate(values)
+                     if self.integer[j] and abs(float(value) - round(float(value))) > INTEGER_TOL]
+        return min(fractions)[1] if fractions else -1
+
+
+    def __consistent(self, j: int, lower, upper) -> bool:
+        if self.relaxation_input["restricted"][j]:
+            lower = max(lower if lower is not None else 0, 0)
+        return lower is None or upper is None or lower <= upper
+
+
+    def __prunable(self, bound) -> bool:
+        if self.incumbent is None:
+            return False
+        best = float(self.incumbent["finalObjectiveFunctionValue"])
+        tol = INTEGER_TOL * max(1.0, abs(best))
+        return float(bound) <= best + tol if self.is_max else float(bound) >= best - tol
+
+
+    def __check_cancelled(self) -> None:
+        if self.cancelled is not None and self.cancelled.is_set():
+            raise SolveCancelled()
@@ -1,2 +1,4 @@
 from .comments import CommentGenerator
-from .enums import RelationOperator, ArtificialSolutionMethod, SimplexTerminationStatus
\ No newline at end of file
+from .enums import RelationOperator, ArtificialSolutionMethod, SimplexTerminationStatus, SolveMode, TraceLevel, PricingRule, \
+    ScalingMethod, GoalProgrammingMethod
+from .exceptions import SolveCancelled
\ No newline at end of file
@@ -1,37 +1,44 @@
 import sympy as sp
+from simplex.util import cached_latex
 
 
 class CommentGenerator:
     @staticmethod
     def pivot_element(entering_var_symbol: sp.Symbol,
                       leaving_var_symbol: sp.Symbol) -> str:
-        return f"Entering variable ${sp.latex(entering_var_symbol)}$ and leaving variable ${sp.latex(leaving_var_symbol)}$"
+        return f"Entering variable ${cached_latex(entering_var_symbol)}$ and leaving variable ${cached_latex(leaving_var_symbol)}$"
 
     @staticmethod
     def initial():
         return "Initial simplex tableau"
 
+    @staticmethod
+    def dual_start() -> str:
+        return "Dual simplex from the slack basis, no artificial variables needed"
+
     @staticmethod
     def inconsistent_row(row_symbol: sp.Symbol) -> str:
-        return f"Row ${sp.latex(row_symbol)}$ is inconsistent"
+        return f"Row ${cached_latex(row_symbol)}$ is inconsistent"
 
     @staticmethod
     def row_operation(target_row_symbol: sp.Symbol,
                       pivot_row_symbol: sp.Symbol,
                       factor: sp.Expr) -> str:
+        factor = sp.sympify(factor)
         multi_term = len(sp.Add.make_args(factor)) > 1
-        sgn = sp.sign(factor)
-        if not multi_term:
-            factor *= sgn
-        if factor == 1:
-            factor = ""
-        sgn = "+" if sgn < 0 else "-"
+        # A sum like M - 1 has no known sign, it is subtracted in parentheses
+        negative = not multi_term and factor.could_extract_minus_sign()
+        if negative:
+            factor = -factor
+        # A factor of 1 is left out, latex would render an empty string as \mathtt{\text{}}
+        factor = "" if factor == 1 else cached_latex(factor)
+        sgn = "+" if negative else "-"
         lp = "(" if multi_term else ""
         rp = ")" if multi_term else ""
-        comment = (f"${sp.latex(target_row_symbol)} = {sp.latex(target_row_symbol)}"
-                   f"{sgn} {lp}{sp.latex(factor)}{rp}{sp.latex(pivot_row_symbol)}$")
+        comment = (f"${cached_latex(target_row_symbol)} = {cached_latex(target_row_symbol)}"
+                   f"{sgn} {lp}{factor}{rp}{cached_latex(pivot_row_symbol)}$")
         return comment
 
     @staticmethod
     def normalize_row(row_symbol: sp.Symbol, factor: sp.Expr) -> str:
-        return f"${sp.latex(row_symbol)} = \\frac{"{"}{sp.latex(row_symbol)}{"}"}{"{"}{factor}{"}"}$"
+        return f"${cached_latex(row_symbol)} = \\frac{"{"}{cached_latex(row_symbol)}{"}"}{"{"}{factor}{"}"}$"
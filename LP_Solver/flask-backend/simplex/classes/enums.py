@@ -6,6 +6,40 @@ class ArtificialSolutionMethod(Enum):
     TWO_PHASE = 2
 
 
+class SolveMode(Enum):
+    EXACT = "exact"
+    NUMERIC = "numeric"
+    REVISED = "revised"
+
+
+class PricingRule(Enum):
+    DANTZIG = "dantzig"
+    STEEPEST_EDGE = "steepest-edge"
+    DEVEX = "devex"
+    BLAND = "bland"
+
+
+class ScalingMethod(Enum):
+    NONE = "none"
+    GEOMETRIC = "geometric"
+    EQUILIBRATE = "equilibrate"
+
+
+class GoalProgrammingMethod(Enum):
+    PRIORITY = "priority"
+    SEQUENTIAL = "sequential"
+
+
+class TraceLevel(Enum):
+    NONE = "none"
+    PIVOT = "pivot"
+    ROW_OPERATION = "row"
+
+    def includes(self, level: 'TraceLevel') -> bool:
+        levels = list(TraceLevel)
+        return levels.index(level) <= levels.index(self)
+
+
 class RelationOperator(Enum):
     EQU = "="
     LEQ = "<="
@@ -22,4 +56,5 @@ class SimplexTerminationStatus(Enum):
     INFEASIBLE = "Infeasible"
     INFINITE_SOLUTIONS = "Infinite solutions"
     UNBOUNDED = "Unbounded"
-    OPTIMAL = "Optimal"
\ No newline at end of file
+    OPTIMAL = "Optimal"
+    LIMIT_REACHED = "Limit reached"
\ No newline at end of file
@@ -0,0 +1,4 @@
+class SolveCancelled(Exception):
+    """
+    Raised inside a running solve once its cancellation event is set.
+    """
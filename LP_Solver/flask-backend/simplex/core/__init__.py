@@ -1 +1,11 @@
-from .engine import SimplexEngine
\ No newline at end of file
+from .big_m import BigMNumber
+from .tableau import Tableau, SympyTableau, RationalTableau, BigMTableau, select_tableau_type, select_tableau_types
+from .trace import StepTrace, StreamingStepTrace
+from .sparse_matrix import SparseConstraintMatrix
+from .engine import SimplexEngine
+from .dual_engine import DualSimplexEngine
+from .numeric_engine import NumericSimplexEngine
+from .revised_engine import RevisedSimplexEngine
+from .presolve import Presolve
+from .scaling import Scaling, coefficient_ratio
+from .bounds import BoundShift
@@ -0,0 +1,113 @@
+from fractions import Fraction
+from numbers import Rational
+
+
+class BigMNumber:
+    """
+    Exact value real + m * symbol where symbol stands for an arbitrarily large positive penalty (M or P_i).
+    Values compare lexicographically, by the penalty coefficient first and by the real part on ties,
+    which lets Big-M and goal programming z rows be pivoted with Fraction arithmetic instead of SymPy algebra.
+    The symbol is only carried along to render the value, values of one z row share the same symbol.
+    """
+    __slots__ = ('real', 'm', 'symbol')
+
+    def __init__(self, real: Rational = 0, m: Rational = 0, symbol=None) -> None:
+        self.real = real
+        self.m = m
+        self.symbol = symbol
+
+
+    @staticmethod
+    def __parts(other) -> tuple[Rational, Rational] | None:
+        if isinstance(other, BigMNumber):
+            return other.real, other.m
+        if isinstance(other, Rational):
+            return other, 0
+        return None
+
+
+    def __add__(self, other) -> 'BigMNumber':
+        parts = self.__parts(other)
+        if parts is None:
+            return NotImplemented
+        return BigMNumber(self.real + parts[0], self.m + parts[1], self.symbol)
+
+    __radd__ = __add__
+
+
+    def __sub__(self, other) -> 'BigMNumber':
+        parts = self.__parts(other)
+        if parts is None:
+            return NotImplemented
+        return BigMNumber(self.real - parts[0], self.m - parts[1], self.symbol)
+
+
+    def __rsub__(self, other) -> 'BigMNumber':
+        return -self + other
+
+
+    def __neg__(self) -> 'BigMNumber':
+        return BigMNumber(-self.real, -self.m, self.symbol)
+
+
+    def __mul__(self, other) -> 'BigMNumber':
+        # Only scaling by a rational is needed, a product of two penalties never appears in a tableau
+        if not isinstance(other, Rational):
+            return NotImplemented
+        return BigMNumber(self.real * other, self.m * other, self.symbol)
+
+    __rmul__ = __mul__
+
+
+    def __truediv__(self, other) -> 'BigMNumber':
+        if not isinstance(other, Rational):
+            return NotImplemented
+        return BigMNumber(Fraction(self.real) / other, Fraction(self.m) / other, self.symbol)
+
+
+    def __cmp(self, other) -> int:
+        parts = self.__parts(other)
+        if parts is None:
+            return NotImplemented
+        real, m = parts
+        if self.m != m:
+            return -1 if self.m < m else 1
+        return (self.real > real) - (self.real < real)
+
+
+    def __eq__(self, other) -> bool:
+        cmp = self.__cmp(other)
+        return cmp if cmp is NotImplemented else cmp == 0
+
+
+    def __lt__(self, other) -> bool:
+        cmp = self.__cmp(other)
+        return cmp if cmp is NotImplemented else cmp < 0
+
+
+    def __le__(self, other) -> bool:
+        cmp = self.__cmp(other)
+        return cmp if cmp is NotImplemented else cmp <= 0
+
+
+    def __gt__(self, other) -> bool:
+        cmp = self.__cmp(other)
+        return cmp if cmp is NotImplemented else cmp > 0
+
+
+    def __ge__(self, other) -> bool:
+        cmp = self.__cmp(other)
+        return cmp if cmp is NotImplemented else cmp >= 0
+
+
+    def __bool__(self) -> bool:
+        return self.real != 0 or self.m != 0
+
+
+    def __hash__(self) -> int:
+        # Equal to a plain rational when there is no penalty part, so both must hash alike
+        return hash(self.real) if self.m == 0 else hash((self.real, self.m))
+
+
+    def __repr__(self) -> str:
+        return f"BigMNumber({self.real}, {self.m}, {self.symbol})"
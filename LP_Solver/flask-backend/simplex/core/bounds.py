@@ -0,0 +1,82 @@
+from sympy import Matrix
+from scipy import sparse
+import numpy as np
+
+
+class BoundShift:
+    """
+    Rewrites every decision variable with bounds l <= x <= u into a non-negative one before standardization.
+    A finite lower bound is shifted away, x = l + x' with 0 <= x' <= u - l, a variable with only an upper bound
+    is reflected, x = u - x' with x' >= 0, variables with neither stay free. restricted variables have l >= 0.
+    The shifted values are substituted into the right hand sides and into the objective as a constant offset,
+    the remaining upper bounds are left to the engine.
+    """
+    def __init__(self, lower_bounds: list | None, upper_bounds: list | None, restricted: list[bool]) -> None:
+        n = len(restricted)
+        lower_bounds = lower_bounds if lower_bounds is not None else [None] * n
+        upper_bounds = upper_bounds if upper_bounds is not None else [None] * n
+        self.restricted = restricted
+        self.offsets: list = [0] * n
+        self.signs: list[int] = [1] * n
+        self.upper_bounds: list = [None] * n
+        self.shifted_restricted: list[bool] = list(restricted)
+        self.offset = 0
+
+        for j, (lower, upper) in enumerate(zip(lower_bounds, upper_bounds)):
+            if restricted[j]:
+                lower = 0 if lower is None or lower < 0 else lower
+            if lower is not None:
+                self.offsets[j] = lower
+                self.upper_bounds[j] = upper - lower if upper is not None else None
+                self.shifted_restricted[j] = True
+            elif upper is not None:
+                self.offsets[j] = upper
+                self.signs[j] = -1
+                self.shifted_restricted[j] = True
+
+
+    def apply(self, objective_function_coefficients_vector: Matrix | None,
+              aug_constraints_coefficients_matrix: Matrix | sparse.spmatrix,
+              aug_goals_coefficients_matrix: Matrix | None) -> tuple[Matrix | None, Matrix | sparse.spmatrix, Matrix | None]:
+        """
+        Returns the objective, constraints and goals in the shifted variables.
+        """
+        n = len(self.restricted)
+        if objective_function_coefficients_vector is not None:
+            costs = list(objective_function_coefficients_vector)
+            self.offset = sum(c * v for c, v in zip(costs, self.offsets) if v != 0)
+            objective_function_coefficients_vector = Matrix([[c * sign for c, sign in zip(costs, self.signs)]])
+
+        if sparse.issparse(aug_constraints_coefficients_matrix):
+            a = sparse.csr_matrix(aug_constraints_coefficients_matrix, dtype=np.float64)
+            offsets = np.array([float(v) for v in self.offsets])
+            rhs = a[:, [-1]].toarray().ravel() - a[:, :n] @ offsets
+            aug_constraints_coefficients_matrix = sparse.hstack(
+                [a[:, :n] @ sparse.diags(np.array(self.signs, dtype=np.float64)), rhs[:, None]], format='csr')
+        else:
+            aug_constraints_coefficients_matrix = self.__apply_dense(aug_constraints_coefficients_matrix)
+        if aug_goals_coefficients_matrix:
+            aug_goals_coefficients_matrix = self.__apply_dense(aug_goals_coefficients_matrix)
+        return objective_function_coefficients_vector, aug_constraints_coefficients_matrix, aug_goals_coefficients_matrix
+
+
+    def postsolve(self, values: list, objective=None) -> tuple[list, object]:
+        """
+        Returns the values of the original decision variables and the original objective value
+        given those of the shifted LP.
+        """
+        numeric = any(isinstance(value, float) for value in values) or isinstance(objective, float)
+        values = [(float(v) if numeric else v) + sign * value for v, sign, value in zip(self.offsets, self.signs, values)]
+        if objective is not None:
+            objective = objective + (float(self.offset) if numeric else self.offset)
+        return values, objective
+
+
+    def __apply_dense(self, matrix: Matrix) -> Matrix:
+        n = len(self.restricted)
+        matrix = matrix.copy()
+        matrix[:, -1] = matrix[:, -1] - matrix[:, :n] * Matrix(self.offsets)
+        for j, sign in enumerate(self.signs):
+            if sign < 0:
+                matrix[:, j] = -matrix[:, j]
+        return matrix
@@ -0,0 +1,54 @@
+from simplex.core.engine import SimplexEngine
+
+
+class DualSimplexEngine(SimplexEngine):
+    """
+    Simplex engine starting from a basis whose z row is already optimal but whose right hand side has
+    negative entries, as the slack basis of an LP with >= rows written as <= rows.
+    The dual simplex pivots the most negative row out of the basis while keeping the z row optimal,
+    once the right hand side is non-negative the primal simplex finds nothing left to improve.
+    """
+    def _initial_comment(self) -> str:
+        return f"{self.cg.initial()}\n{self.cg.dual_start()}"
+
+
+    def _restore_feasibility(self) -> None:
+        leaving_var: int = self.__find_leaving_variable()
+        while leaving_var != -1:
+            self._check_cancelled()
+            entering_var: int = self.__find_entering_variable(leaving_var)
+            if entering_var == -1:
+                # A negative basic variable in a row without negative entries, no solution satisfies the row
+                self.infeasible_row = leaving_var
+                return
+            self._push_step(entering_var, leaving_var, self.cg.pivot_element(self.x[entering_var],
+                                                                             self.x_bv[leaving_var]))
+            self._pivot(leaving_var, entering_var)
+            leaving_var = self.__find_leaving_variable()
+
+
+    def __find_leaving_variable(self) -> int:
+        """
+        Returns the row with the most negative right hand side or -1 if the basis is feasible.
+        """
+        min_row: int = -1
+        for row in range(self.m.rows):
+            if self.m[row, -1] < 0 and (min_row == -1 or self.m[row, -1] < self.m[min_row, -1]):
+                min_row = row
+        return min_row
+
+
+    def __find_entering_variable(self, row: int) -> int:
+        """
+        Returns the column keeping the z row optimal when pivoting on the given row or -1 if there is none.
+        """
+        min_col: int = -1
+        min_ratio = None
+        for col in range(self.m.cols - 1):
+            if self.m[row, col] < 0:
+                ratio = self.z_rows[0, col] / self.m[row, col]
+                ratio = -ratio if self.is_max else ratio
+                if min_ratio is None or ratio < min_ratio:
+                    min_ratio = ratio
+                    min_col = col
+        return min_col
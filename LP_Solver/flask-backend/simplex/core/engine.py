@@ -1,27 +1,38 @@
+import threading
+from typing import Callable
 from sympy import Matrix, Symbol
 from simplex.util import sort_expression_arr, compare_expressions
-from simplex.classes import SimplexTerminationStatus, CommentGenerator
+from simplex.classes import SimplexTerminationStatus, CommentGenerator, TraceLevel, SolveCancelled
+from simplex.core.tableau import Tableau, select_tableau_types
+from simplex.core.trace import StepTrace
 
 
 class SimplexEngine:
     def __init__(self, z_rows: Matrix, symbols_in_z_rows: list[Symbol], m: Matrix, x: list[Symbol],
                  x_bv: list[Symbol],
-                 is_maximization: bool, steps: list[dict], z_rows_symbols: list[Symbol],
+                 is_maximization: bool, steps: StepTrace, z_rows_symbols: list[Symbol],
                  artificial_vars: list[Symbol] | None = None,
-                 comment_generator: CommentGenerator | None = None) -> None:
-        self.z_rows = z_rows
+                 comment_generator: CommentGenerator | None = None,
+                 tableau_type: type[Tableau] | None = None,
+                 cancelled: threading.Event | None = None) -> None:
+        z_rows_type, m_type = (tableau_type, tableau_type) if tableau_type is not None \
+                         else select_tableau_types(z_rows, m)
+        self.z_rows: Tableau = z_rows_type(z_rows)
         self.symbols_in_z_rows = symbols_in_z_rows if symbols_in_z_rows else [None] * z_rows.rows
         self.x_bv = x_bv
         self.x = x
-        self.m = m
+        self.m: Tableau = m_type(m)
         self.is_max = is_maximization
         self.steps = steps
         self.z_rows_symbols = z_rows_symbols
         self.artificial_vars = artificial_vars
         self.step_cnt = 0
         self.termination_status : SimplexTerminationStatus | None = None
+        self.infeasible_row: int = -1
+        self.unbounded_var: int = -1
         self.cg = comment_generator if comment_generator is not None else CommentGenerator()
         self.rows_symbols = [Symbol(f"R_{i + 1}") for i in range(m.rows)]
+        self.cancelled = cancelled
 
 
     def __make_consistent(self) -> None:
@@ -38,10 +49,14 @@ class SimplexEngine:
     def __fix_inconsistency(self, i: int, j: int) -> None:
         for k in range(self.m.rows):
             if self.m[k, j] == 1:
-                self.__push_step(comment=self.cg.inconsistent_row(self.z_rows_symbols[i]), cnt_step=False)
+                self._push_step(comment=lambda: self.cg.inconsistent_row(self.z_rows_symbols[i]), cnt_step=False,
+                                 level=TraceLevel.ROW_OPERATION)
                 factor = self.z_rows[i, j]
-                self.z_rows[i, :] -= factor * self.m[k, :]
-                self.__push_step(comment=self.cg.row_operation(self.z_rows_symbols[i], self.rows_symbols[k], factor))
+                self.z_rows.subtract_row(i, factor, self.m, k)
+                self.steps.record_row_operation(True, i, factor, k)
+                self._push_step(comment=lambda: self.cg.row_operation(self.z_rows_symbols[i], self.rows_symbols[k],
+                                                                       self.z_rows.to_sympy(factor)),
+                                 level=TraceLevel.ROW_OPERATION)
                 return
 
 
@@ -91,7 +106,7 @@ class SimplexEngine:
         return min_row
 
 
-    def __pivot(self, row: int, col: int) -> None:
+    def _pivot(self, row: int, col: int) -> None:
         """
         Perform pivoting on the tableau at (row, col).
         """
@@ -102,8 +117,11 @@ class SimplexEngine:
             raise ValueError("Error: cannot pivot on a zero element.")
 
         if pivot_element != 1:
-            self.m[row, :] = self.m[row, :] / pivot_element
-            self.__push_step(comment=self.cg.normalize_row(self.rows_symbols[row], pivot_element))
+            self.m.divide_row(row, pivot_element)
+            self.steps.record_division(row, pivot_element)
+            self._push_step(comment=lambda: self.cg.normalize_row(self.rows_symbols[row],
+                                                                   self.m.to_sympy(pivot_element)),
+                             level=TraceLevel.ROW_OPERATION)
 
         # Pivot z rows
         for target_row in range(self.z_rows.rows):
@@ -115,26 +133,35 @@ class SimplexEngine:
                 self.__row_op(self.m, target_row, row, col, self.rows_symbols[target_row])
 
 
-    def __row_op(self, matrix: Matrix, target_row: int, pivot_row: int, pivot_col: int, target_row_symbol: Symbol) -> None:
+    def __row_op(self, matrix: Tableau, target_row: int, pivot_row: int, pivot_col: int, target_row_symbol: Symbol) -> None:
         factor = matrix[target_row, pivot_col]
         if factor == 0: return
-        matrix[target_row, :] -= factor * self.m[pivot_row, :]
-        self.__push_step(comment=self.cg.row_operation(target_row_symbol, self.rows_symbols[pivot_row], factor))
+        matrix.subtract_row(target_row, factor, self.m, pivot_row)
+        self.steps.record_row_operation(matrix is self.z_rows, target_row, factor, pivot_row)
+        self._push_step(comment=lambda: self.cg.row_operation(target_row_symbol, self.rows_symbols[pivot_row],
+                                                               matrix.to_sympy(factor)),
+                         level=TraceLevel.ROW_OPERATION)
 
 
-    def __push_step(self,
+    def _push_step(self,
                     entering_var_index: int | None = None,
                     leaving_var_index: int | None = None,
-                    comment: str = "",
-                    cnt_step: bool = True) -> None:
+                    comment: str | Callable[[], str] = "",
+                    cnt_step: bool = True,
+                    level: TraceLevel = TraceLevel.PIVOT) -> None:
+        """
+        Records a step if the trace level includes it, the tableau itself is rebuilt by the trace when read.
+        Comments of row operation steps are passed as callables so they are only rendered when kept.
+        """
         if cnt_step:
             self.step_cnt += 1
+        if not self.steps.includes(level):
+            return
 
+        comment = comment() if callable(comment) else comment
         step = {
-            "variables": self.x.copy(),
             "zRowsSymbols": self.z_rows_symbols,
             "basicVariables": self.x_bv.copy(),
-            "simplexMatrix": self.z_rows.col_join(self.m).tolist().copy(),
             "comment": f"Step {self.step_cnt}:\n" + comment if cnt_step else comment
         }
         if entering_var_index is not None and leaving_var_index is not None:
@@ -159,8 +186,8 @@ class SimplexEngine:
 
 
     def __unbounded(self) -> bool:
-        return any(not self.__can_leave(self.__can_enter(i))
-                   for i in range(self.z_rows.rows) if self.__can_enter(i))
+        # The main loop only stops early when the entering column has no positive entry
+        return self.unbounded_var != -1
 
 
     def __infinite_solutions(self) -> bool:
@@ -169,46 +196,63 @@ class SimplexEngine:
 
 
     def __infeasible(self) -> bool:
-        return any(self.m[self.x_bv.index(a), -1] > 0 for a in self.artificial_vars if a in self.x_bv)
+        return self.infeasible_row != -1 or any(self.m[self.x_bv.index(a), -1] > 0 for a in self.artificial_vars if a in self.x_bv)
 
 
-    def __can_enter(self, row_index: int) -> int:
+    def __can_leave(self, col_index: int) -> bool:
         """
-        Returns the index of the column containing a non-basic variable
-        with positive coefficient in case of maximization or
-        with negative coefficient in case of minimization
-        such that in the column of the non-basic variables, all rows before row_index contain zeros or
-        -1 otherwise
+        Returns true if one basic variable can leave in the specified column.
         """
-        return next((j for j in range(self.z_rows.cols - 1)
-                     if self.x[j] not in self.x_bv
-                     and (compare_expressions(self.z_rows[row_index, j], 0, self.symbols_in_z_rows[row_index]) < 0
-                          if self.is_max
-                          else compare_expressions(self.z_rows[row_index, j], 0, self.symbols_in_z_rows[row_index]) > 0)
-                     and self.__more_prior(row_index, j)), -1)
+        return any(self.m[i, col_index] > 0 for i in range(self.m.rows))
 
 
-    def __can_leave(self, col_index: int) -> bool:
+    def _check_cancelled(self) -> None:
+        if self.cancelled is not None and self.cancelled.is_set():
+            raise SolveCancelled()
+
+
+    def _initial_comment(self) -> str:
+        return self.cg.initial()
+
+
+    def _restore_feasibility(self) -> None:
         """
-        Returns true if one basic variable can leave in the specified column.
+        Brings the starting basis to primal feasibility, the primal simplex always starts from a feasible basis.
         """
-        return any(self.m[i, col_index] > 0 for i in range(self.m.rows))
 
 
     def reduce(self) -> None:
-        self.__push_step(comment=self.cg.initial(), cnt_step=False)
+        self.steps.checkpoint(self.z_rows, self.m, self.x)
+        self._push_step(comment=self._initial_comment(), cnt_step=False)
         self.__make_consistent()
+        self._restore_feasibility()
 
-        entering_var: int = self.__find_entering_variable()
+        entering_var: int = self.__find_entering_variable() if self.infeasible_row == -1 else -1
         while entering_var != -1:
+            self._check_cancelled()
             leaving_var: int = self.__find_leaving_variable(entering_var)
             if leaving_var != -1:
-                self.__push_step(entering_var, leaving_var, self.cg.pivot_element(self.x[entering_var],
+                self._push_step(entering_var, leaving_var, self.cg.pivot_element(self.x[entering_var],
                                                                                   self.x_bv[leaving_var]))
-                self.__pivot(leaving_var, entering_var)
+                self._pivot(leaving_var, entering_var)
                 entering_var: int = self.__find_entering_variable()
             else:
+                self.unbounded_var = entering_var
                 break
 
         self.__infer_termination_status()
-        self.__push_step()
\ No newline at end of file
+        self._push_step()
+
+    def drive_out_artificial_vars(self) -> None:
+        """
+        Pivots the artificial variables left basic at 0 after phase one out of the basis on any other column
+        of their row, phase two could otherwise raise them along an entering column with a negative entry there.
+        An artificial variable whose row has no other column belongs to a redundant row and stays basic at 0.
+        """
+        for row, var in enumerate(self.x_bv):
+            if var not in self.artificial_vars:
+                continue
+            col = next((j for j, x in enumerate(self.x) if x not in self.artificial_vars and self.m[row, j] != 0), -1)
+            if col != -1:
+                self._push_step(col, row, self.cg.pivot_element(self.x[col], var))
+                self._pivot(row, col)
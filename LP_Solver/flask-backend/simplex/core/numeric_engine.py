@@ -0,0 +1,267 @@
+import threading
+import numpy as np
+from sympy import Symbol
+from simplex.classes import SimplexTerminationStatus, PricingRule, SolveCancelled
+from simplex.core.pricing import make_pricing, dual_ratio_test, BOUND_FLIP
+
+
+class NumericSimplexEngine:
+    """
+    Float64 counterpart of SimplexEngine for callers that only need the final solution.
+    The tableau is pivoted with vectorized rank-1 updates and no intermediate steps are recorded.
+    z rows are ordered by priority, a column may only improve a row if it is zero in every previous row.
+    The entering and leaving variables are chosen by the given pricing rule.
+    The starting basis may be any basis, when it is not primal feasible but optimal for its z row
+    the engine first runs the dual simplex to restore feasibility.
+    Columns may have upper bounds, a non-basic variable then sits at either bound. The tableau is pivoted as if every
+    non-basic variable were 0 and the values of the basic variables and z rows are corrected for those at their
+    upper bound, so a variable reaching its own bound only flips its state instead of pivoting.
+    Fixed columns never enter the basis, a non-basic fixed variable keeps the bound it is at.
+    """
+    def __init__(self, z_rows: np.ndarray, m: np.ndarray, x: list[Symbol], x_bv: list[Symbol],
+                 is_maximization: bool, artificial_vars: list[Symbol] | None = None,
+                 tol: float = 1e-9, pricing: PricingRule = PricingRule.DANTZIG,
+                 upper: np.ndarray | None = None, at_upper: np.ndarray | None = None,
+                 fixed: np.ndarray | None = None,
+                 cancelled: threading.Event | None = None) -> None:
+        self.z_rows = np.array(z_rows, dtype=np.float64, ndmin=2)
+        self.m = np.array(m.toarray() if hasattr(m, 'toarray') else m, dtype=np.float64, ndmin=2)
+        cols = self.m.shape[1] - 1
+        self.upper = np.full(cols, np.inf) if upper is None else np.array(upper, dtype=np.float64)
+        self.at_upper = np.zeros(cols, dtype=bool) if at_upper is None else np.array(at_upper, dtype=bool)
+        self.fixed = np.zeros(cols, dtype=bool) if fixed is None else np.array(fixed, dtype=bool)
+        self.x = x
+        self.x_bv = x_bv
+        self.is_max = is_maximization
+        self.artificial_vars = artificial_vars if artificial_vars is not None else []
+        self.tol = tol
+        self.pricing = make_pricing(pricing, tol)
+        self.cancelled = cancelled
+        self.step_cnt = 0
+        self.termination_status: SimplexTerminationStatus | None = None
+        self.unbounded_var: int = -1
+        self.infeasible_row: int = -1
+        col_of = {var: j for j, var in enumerate(x)}
+        self.basis: list[int] = [col_of[var] for var in x_bv]
+        self.__make_canonical()
+        self.__make_consistent()
+
+
+    def __make_canonical(self) -> None:
+        basic = self.m[:, self.basis]
+        if not np.allclose(basic, np.eye(len(self.basis))):
+            # Started from a basis other than the logical one, bring the tableau to canonical form for it
+            self.m = np.linalg.solve(basic, self.m)
+
+
+    def __make_consistent(self) -> None:
+        # Basic columns of m form an identity, so one product clears them from every z row
+        self.z_rows -= self.z_rows[:, self.basis] @ self.m
+
+
+    def __improving(self, row: np.ndarray) -> np.ndarray:
+        """
+        Returns how much each column improves the given z row, positive values are candidates.
+        """
+        return -row if self.is_max else row
+
+
+    def __directions(self) -> np.ndarray:
+        """
+        Returns the direction each non-basic variable can move in, down from its upper bound or up from 0.
+        """
+        return np.where(self.at_upper, -1.0, 1.0)
+
+
+    def __basic_values(self) -> np.ndarray:
+        if not self.at_upper.any():
+            return self.m[:, -1]
+        return self.m[:, -1] - self.m[:, :-1][:, self.at_upper] @ self.upper[self.at_upper]
+
+
+    def __z_values(self) -> np.ndarray:
+        if not self.at_upper.any():
+            return self.z_rows[:, -1]
+        return self.z_rows[:, -1] - self.z_rows[:, :-1][:, self.at_upper] @ self.upper[self.at_upper]
+
+
+    def __find_entering_variable(self) -> int:
+        eligible = ~self.fixed
+        directions = self.__directions()
+        for row in self.z_rows[:, :-1]:
+            col = self.pricing.select(np.where(eligible, self.__improving(row) * directions, -np.inf))
+            if col != -1:
+                return col
+            eligible &= np.abs(row) <= self.tol
+        return -1
+
+
+    def __find_leaving_variable(self, col: int) -> tuple[int, bool]:
+        """
+        Returns the row index of the leaving variable and whether it leaves at its upper bound,
+        BOUND_FLIP if the entering variable reaches its own bound first or -1 if there is no variable can leave.
+        """
+        alpha = -self.m[:, col] if self.at_upper[col] else self.m[:, col]
+        return self.pricing.bounded_leaving_row(self.__basic_values(), alpha, self.basis,
+                                                self.upper[self.basis], self.upper[col])
+
+
+    def __column_norms(self) -> np.ndarray:
+        return np.einsum('ij,ij->j', self.m[:, :-1], self.m[:, :-1])
+
+
+    def __pivot(self, row: int, col: int, to_upper: bool = False) -> None:
+        self.at_upper[col] = False
+        self.at_upper[self.basis[row]] = to_upper
+        if self.pricing.uses_pivot_row:
+            alpha = self.m[:, col]
+            products = alpha @ self.m[:, :-1] if self.pricing.uses_column_products else None
+            self.pricing.update(col, self.basis[row], self.m[row, :-1], alpha, products)
+
+        self.x_bv[row] = self.x[col]
+        self.basis[row] = col
+
+        pivot_row = self.m[row] / self.m[row, col]
+        self.m -= np.outer(self.m[:, col], pivot_row)
+        self.z_rows -= np.outer(self.z_rows[:, col], pivot_row)
+        self.m[row] = pivot_row
+
+        # Keep the entering column an exact unit vector
+        self.m[:, col] = 0
+        self.m[row, col] = 1
+        self.z_rows[:, col] = 0
+        self.step_cnt += 1
+
+
+    def __can_leave(self, col_index: int) -> bool:
+        alpha = -self.m[:, col_index] if self.at_upper[col_index] else self.m[:, col_index]
+        return bool(np.isfinite(self.upper[col_index]) or np.any(alpha > self.tol))
+
+
+    def __infer_termination_status(self) -> None:
+        self.termination_status = SimplexTerminationStatus.INFEASIBLE if self.__infeasible() \
+                             else SimplexTerminationStatus.UNBOUNDED if self.__unbounded() \
+                             else SimplexTerminationStatus.INFINITE_SOLUTIONS if self.__infinite_solutions() \
+                             else SimplexTerminationStatus.DEGENERATE if self.__degenerate() \
+                             else SimplexTerminationStatus.OPTIMAL
+
+
+    def __infeasible(self) -> bool:
+        x_b = self.__basic_values()
+        return self.infeasible_row != -1 or any(x_b[row] > self.tol for row, var in enumerate(self.x_bv) if var in self.artificial_vars)
+
+
+    def __unbounded(self) -> bool:
+        # The main loop only stops early when the entering column has no positive entry
+        return self.unbounded_var != -1
+
+
+    def __infinite_solutions(self) -> bool:
+        nonbasic = np.ones(self.z_rows.shape[1] - 1, dtype=bool)
+        nonbasic[self.basis] = False
+        zero_cost = np.all(np.abs(self.z_rows[:, :-1]) <= self.tol, axis=0)
+        return any(self.__can_leave(j) for j in np.flatnonzero(nonbasic & zero_cost))
+
+
+    def __degenerate(self) -> bool:
+        x_b = self.__basic_values()
+        at_bound = (np.abs(x_b) <= self.tol) | (np.abs(x_b - self.upper[self.basis]) <= self.tol)
+        return any(at_bound[row] for row, var in enumerate(self.x_bv) if var not in self.artificial_vars)
+
+
+    def value_of(self, var: Symbol) -> float:
+        if var in self.x_bv:
+            return float(self.__basic_values()[self.x_bv.index(var)])
+        col = self.x.index(var)
+        return float(self.upper[col]) if self.at_upper[col] else 0.0
+
+
+    def objective_value(self, row_index: int = -1) -> float:
+        return float(self.__z_values()[row_index])
+
+
+    def reduced_costs(self, row_index: int = -1) -> np.ndarray:
+        return self.z_rows[row_index, :-1].copy()
+
+
+    def is_satisfied(self, row_index: int) -> bool:
+        nonbasic = np.ones(self.z_rows.shape[1] - 1, dtype=bool)
+        nonbasic[self.basis] = False
+        return bool(np.all((self.z_rows[row_index, :-1] * self.__directions())[nonbasic] <= self.tol)
+                    and abs(self.__z_values()[row_index]) <= self.tol)
+
+
+    def __check_cancelled(self) -> None:
+        if self.cancelled is not None and self.cancelled.is_set():
+            raise SolveCancelled()
+
+
+    def primal_feasible(self) -> bool:
+        x_b = self.__basic_values()
+        return bool(np.all(x_b >= -self.tol) and np.all(x_b <= self.upper[self.basis] + self.tol))
+
+
+    def dual_feasible(self) -> bool:
+        """
+        Returns true if no column improves the objective, the dual simplex is only run on a single z row.
+        """
+        # May be called before reduce() starts the pricing, the scores are checked without it
+        scores = self.__improving(self.z_rows[0, :-1]) * self.__directions()
+        return self.z_rows.shape[0] == 1 and not np.any(scores[~self.fixed] > self.tol)
+
+
+    def place_at_dual_bounds(self) -> None:
+        """
+        Moves every non-basic column with an upper bound to the bound its reduced cost favours,
+        the states of a warm started basis are not known.
+        """
+        scores = self.__improving(self.z_rows[0, :-1])
+        bounded = np.isfinite(self.upper) & ~self.fixed
+        bounded[self.basis] = False
+        self.at_upper[bounded & (scores > self.tol)] = True
+        self.at_upper[bounded & (scores < -self.tol)] = False
+
+
+    def __dual_reduce(self) -> None:
+        while True:
+            self.__check_cancelled()
+            x_b = self.__basic_values()
+            below, above = -x_b, x_b - self.upper[self.basis]
+            leaving_var = int(np.argmax(np.maximum(below, above)))
+            if max(below[leaving_var], above[leaving_var]) <= self.tol:
+                return
+            # A basic variable above its upper bound leaves at the bound, its row is read with the opposite sign
+            to_upper = bool(above[leaving_var] > below[leaving_var])
+            directions = self.__directions()
+            pivot_row = self.m[leaving_var, :-1] * directions * (-1 if to_upper else 1)
+            pivot_row[self.basis] = 0
+            pivot_row[self.fixed] = 0
+            entering_var = dual_ratio_test(self.__improving(self.z_rows[0, :-1]) * directions, pivot_row, self.tol)
+            if entering_var == -1:
+                self.infeasible_row = leaving_var
+                return
+            self.__pivot(leaving_var, entering_var, to_upper)
+
+
+    def reduce(self) -> None:
+        self.pricing.start(self.m.shape[1] - 1, self.__column_norms)
+        if not self.primal_feasible():
+            if not self.dual_feasible():
+                raise ValueError("The starting basis is neither primal nor dual feasible.")
+            self.__dual_reduce()
+
+        entering_var: int = self.__find_entering_variable() if self.infeasible_row == -1 else -1
+        while entering_var != -1:
+            self.__check_cancelled()
+            leaving_var, to_upper = self.__find_leaving_variable(entering_var)
+            if leaving_var == -1:
+                self.unbounded_var = entering_var
+                break
+            if leaving_var == BOUND_FLIP:
+                self.at_upper[entering_var] = not self.at_upper[entering_var]
+                self.step_cnt += 1
+            else:
+                self.__pivot(leaving_var, entering_var, to_upper)
+            entering_var = self.__find_entering_variable()
+
+        self.__infer_termination_status()
@@ -0,0 +1,300 @@
+import numpy as np
+from scipy import sparse
+from sympy import Matrix
+from simplex.classes import RelationOperator
+
+
+class Presolve:
+    """
+    Reduces an LP before it is standardized, removing empty and redundant rows, merging duplicate rows into the
+    tightest one, turning singleton rows into fixed variables or bounds and dropping columns that appear in no row.
+    Fixed variables are substituted into the right hand sides and into the objective as a constant offset,
+    a lower bound is shifted away the same way, x = l + x' with x' >= 0, an upper bound is left to the engine.
+    A free variable keeps its <= singleton rows, the engines only bound non-negative variables.
+    postsolve maps a solution of the reduced LP back onto the original variables and rebuilds the slacks
+    of the rows turned into bounds.
+    Rows that prove the LP infeasible and columns that prove it unbounded are kept for the engine to report,
+    the last row and the last column are never removed.
+    """
+    def __init__(self,
+                 objective_function_coefficients_vector: Matrix | None,
+                 aug_constraints_coefficients_matrix: Matrix | sparse.spmatrix,
+                 constraints_relations: list[RelationOperator],
+                 aug_goals_coefficients_matrix: Matrix | None,
+                 restricted: list[bool],
+                 is_maximization: bool | None,
+                 upper_bounds: list | None = None) -> None:
+        self.matrix = aug_constraints_coefficients_matrix
+        self.relations = list(constraints_relations)
+        self.goals = aug_goals_coefficients_matrix
+        self.restricted = restricted
+        self.shifted_restricted: list[bool] = list(restricted)
+        self.is_maximization = is_maximization
+        self.upper_bounds = list(upper_bounds) if upper_bounds is not None else [None] * len(restricted)
+        self.costs = list(objective_function_coefficients_vector) if objective_function_coefficients_vector is not None \
+                     else [0] * len(restricted)
+
+        if sparse.issparse(self.matrix):
+            csr = sparse.csr_matrix(self.matrix)
+            self.row_coeffs: list[dict] = [{int(j): float(v) for j, v in zip(csr.indices[csr.indptr[i]:csr.indptr[i + 1]],
+                                                                             csr.data[csr.indptr[i]:csr.indptr[i + 1]])
+                                            if j < len(restricted) and v != 0} for i in range(csr.shape[0])]
+            self.rhs: list = csr[:, [-1]].toarray().ravel().tolist()
+        else:
+            self.row_coeffs = [{j: self.matrix[i, j] for j in range(len(restricted)) if self.matrix[i, j] != 0}
+                               for i in range(self.matrix.rows)]
+            self.rhs = list(self.matrix[:, -1])
+        self.goal_rhs = list(self.goals[:, -1]) if self.goals else []
+        goal_cols = {j for i in range(self.goals.rows) for j in range(len(restricted)) if self.goals[i, j] != 0} \
+                    if self.goals else set()
+
+        self.rows: list[int] = list(range(len(self.row_coeffs)))
+        self.cols: list[int] = list(range(len(restricted)))
+        self.fixed: dict[int, object] = {}
+        # Lower bounds shifted away, by variable
+        self.shifts: dict[int, object] = {}
+        # Rows turned into bounds, with their coefficients and right hand side as given, and their slacks after postsolve
+        self.bound_rows: dict[int, tuple[dict, RelationOperator, object]] = {}
+        self.slacks: dict[int, object] = {}
+        self.offset = 0
+        self.reductions: list[str] = []
+        self.__goal_cols = goal_cols
+        self.__given_coeffs = [dict(coeffs) for coeffs in self.row_coeffs]
+        self.__given_rhs = list(self.rhs)
+
+
+    def run(self) -> bool:
+        """
+        Applies reductions until none is left, returns true if the LP got smaller.
+        """
+        changed = True
+        while changed:
+            changed = self.__reduce_rows() | self.__reduce_columns() | self.__merge_duplicate_rows()
+        return bool(self.reductions)
+
+
+    def reduced_problem(self) -> dict:
+        """
+        The reduced LP as SimplexSolver arguments, the matrices keep the type they were given in.
+        """
+        cols = self.cols + [len(self.restricted)]
+        if sparse.issparse(self.matrix):
+            a = sparse.csr_matrix(self.matrix)[self.rows][:, self.cols]
+            constraints = sparse.hstack([a, sparse.csr_matrix(np.array([[self.rhs[i]] for i in self.rows]))], format='csr')
+        else:
+            constraints = self.matrix.extract(self.rows, cols)
+            for r, i in enumerate(self.rows):
+                constraints[r, -1] = self.rhs[i]
+
+        goals = None
+        if self.goals:
+            goals = self.goals.extract(list(range(self.goals.rows)), cols)
+            for i, b in enumerate(self.goal_rhs):
+                goals[i, -1] = b
+
+        return {
+            "objective_function_coefficients_vector": Matrix([[self.costs[j] for j in self.cols]]) if not self.goals else None,
+            "aug_constraints_coefficients_matrix": constraints,
+            "constraints_relations": [self.relations[i] for i in self.rows],
+            "aug_goals_coefficients_matrix": goals,
+            "restricted": [self.shifted_restricted[j] for j in self.cols],
+            "upper_bounds": [self.upper_bounds[j] for j in self.cols],
+        }
+
+
+    def postsolve(self, values: list, objective=None) -> tuple[list, object]:
+        """
+        Returns the values of the original decision variables and the original objective value
+        given those of the reduced LP.
+        """
+        full = [0] * len(self.restricted)
+        for j, value in zip(self.cols, values):
+            full[j] = value
+        numeric = any(isinstance(value, float) for value in values) or isinstance(objective, float)
+        for j, value in self.fixed.items():
+            full[j] = float(value) if numeric else value
+        for j, value in self.shifts.items():
+            full[j] += float(value) if numeric else value
+        for i, (coeffs, relation, b) in self.bound_rows.items():
+            slack = b - sum(a * full[j] for j, a in coeffs.items())
+            slack = -slack if relation == RelationOperator.GEQ else slack
+            self.slacks[i] = float(slack) if numeric else slack
+        if objective is not None:
+            objective = objective + (float(self.offset) if numeric else self.offset)
+        return full, objective
+
+
+    def summary(self) -> dict:
+        r: dict = {
+            "rowsRemoved": len(self.row_coeffs) - len(self.rows),
+            "columnsRemoved": len(self.restricted) - len(self.cols),
+            "reductions": self.reductions,
+        }
+        if self.slacks:
+            r["boundRowSlacks"] = [{"row": i + 1, "slack": float(slack)} for i, slack in sorted(self.slacks.items())]
+        return r
+
+
+    def __reduce_rows(self) -> bool:
+        changed = False
+        for i in list(self.rows):
+            coeffs = self.row_coeffs[i]
+            relation, b = self.relations[i], self.rhs[i]
+            if not coeffs:
+                if self.__satisfied(0, relation, b) and len(self.rows) > 1:
+                    self.rows.remove(i)
+                    self.reductions.append(f"Row {i + 1} is empty and satisfied, removed")
+                    changed = True
+                continue
+            if len(coeffs) != 1:
+                continue
+
+            (j, a), = coeffs.items()
+            bound = b / a
+            relation = relation if a > 0 else relation.negate()
+            restricted, upper = self.shifted_restricted[j], self.upper_bounds[j]
+            out_of_bounds = restricted and bound < 0 or upper is not None and bound > upper
+            if relation == RelationOperator.EQU and not out_of_bounds \
+                    or relation == RelationOperator.LEQ and restricted and bound == 0:
+                if len(self.rows) > 1 and len(self.cols) > 1:
+                    self.rows.remove(i)
+                    self.__fix(j, bound)
+                    self.reductions.append(f"Row {i + 1} fixes x_{j + 1} = {self.shifts.get(j, 0) + bound}, removed")
+                    changed = True
+            elif relation == RelationOperator.EQU or len(self.rows) == 1:
+                continue
+            elif relation == RelationOperator.GEQ and restricted and bound <= 0:
+                self.__remove_bound_row(i)
+                self.reductions.append(f"Row {i + 1} only bounds x_{j + 1} >= {self.shifts.get(j, 0) + bound}, "
+                                       f"redundant with its lower bound, removed")
+                changed = True
+            elif relation == RelationOperator.GEQ and (upper is None or bound <= upper):
+                self.__remove_bound_row(i)
+                self.__shift(j, bound)
+                self.reductions.append(f"Row {i + 1} became the lower bound x_{j + 1} >= {self.shifts[j]}, removed")
+                changed = True
+            elif relation == RelationOperator.LEQ and restricted and bound > 0:
+                self.__remove_bound_row(i)
+                if upper is None or bound < upper:
+                    self.upper_bounds[j] = bound
+                self.reductions.append(f"Row {i + 1} became the upper bound "
+                                       f"x_{j + 1} <= {self.shifts.get(j, 0) + self.upper_bounds[j]}, removed")
+                changed = True
+        return changed
+
+
+    def __reduce_columns(self) -> bool:
+        used = {j for i in self.rows for j in self.row_coeffs[i]} | self.__goal_cols
+        changed = False
+        for j in list(self.cols):
+            if j in used or len(self.cols) == 1:
+                continue
+            c = self.costs[j]
+            improving = c > 0 if self.is_maximization else c < 0
+            if c == 0 or self.shifted_restricted[j] and not improving:
+                # Nothing limits the variable and its best value is 0
+                self.__fix(j, 0)
+                self.reductions.append(f"Column x_{j + 1} appears in no row, fixed at 0")
+                changed = True
+        return changed
+
+
+    def __merge_duplicate_rows(self) -> bool:
+        groups: dict[tuple, list[tuple[int, RelationOperator, object]]] = {}
+        for i in self.rows:
+            coeffs = self.row_coeffs[i]
+            if not coeffs:
+                continue
+            scale = coeffs[min(coeffs)]
+            key = tuple((j, a / scale) for j, a in sorted(coeffs.items()))
+            relation = self.relations[i] if scale > 0 else self.relations[i].negate()
+            groups.setdefault(key, []).append((i, relation, self.rhs[i] / scale))
+
+        changed = False
+        for group in groups.values():
+            if len(group) > 1:
+                changed |= self.__merge_group(group)
+        return changed
+
+
+    def __merge_group(self, group: list[tuple[int, RelationOperator, object]]) -> bool:
+        """
+        Keeps the tightest of rows with proportional coefficients, an upper and a lower bound meeting become one equation.
+        Groups contradicting themselves are left alone, the engine reports them infeasible.
+        """
+        equations = [(i, b) for i, relation, b in group if relation == RelationOperator.EQU]
+        uppers = [(i, b) for i, relation, b in group if relation == RelationOperator.LEQ]
+        lowers = [(i, b) for i, relation, b in group if relation == RelationOperator.GEQ]
+        upper = min(uppers, key=lambda r: r[1]) if uppers else None
+        lower = max(lowers, key=lambda r: r[1]) if lowers else None
+
+        if equations:
+            value = equations[0][1]
+            if any(b != value for _, b in equations) or upper and value > upper[1] or lower and value < lower[1]:
+                return False
+            kept = [equations[0][0]]
+        elif upper and lower:
+            if upper[1] < lower[1]:
+                return False
+            if upper[1] == lower[1]:
+                self.relations[upper[0]] = RelationOperator.EQU
+                self.reductions.append(f"Rows {upper[0] + 1} and {lower[0] + 1} bound the same expression to one value, "
+                                       f"row {upper[0] + 1} became an equation")
+                kept = [upper[0]]
+            else:
+                kept = [upper[0], lower[0]]
+        else:
+            kept = [(upper or lower)[0]]
+
+        removed = [i for i, _, _ in group if i not in kept]
+        for i in removed:
+            self.rows.remove(i)
+            self.reductions.append(f"Row {i + 1} duplicates row {kept[0] + 1}, removed")
+        return bool(removed) or len(kept) < len(group)
+
+
+    def __remove_bound_row(self, i: int) -> None:
+        self.rows.remove(i)
+        self.bound_rows[i] = (self.__given_coeffs[i], self.relations[i], self.__given_rhs[i])
+
+
+    def __shift(self, j: int, value) -> None:
+        """
+        Substitutes x_j = value + x_j' with x_j' >= 0.
+        """
+        self.shifts[j] = self.shifts.get(j, 0) + value
+        self.shifted_restricted[j] = True
+        if self.upper_bounds[j] is not None:
+            self.upper_bounds[j] -= value
+        self.offset += self.costs[j] * value
+        for i in self.rows:
+            a = self.row_coeffs[i].get(j, 0)
+            if a != 0:
+                self.rhs[i] -= a * value
+        if self.goals:
+            for i in range(self.goals.rows):
+                self.goal_rhs[i] -= self.goals[i, j] * value
+
+
+    def __fix(self, j: int, value) -> None:
+        self.cols.remove(j)
+        self.fixed[j] = value
+        self.offset += self.costs[j] * value
+        for i in self.rows:
+            a = self.row_coeffs[i].pop(j, 0)
+            if a != 0:
+                self.rhs[i] -= a * value
+        if self.goals:
+            for i in range(self.goals.rows):
+                self.goal_rhs[i] -= self.goals[i, j] * value
+
+
+    @staticmethod
+    def __satisfied(lhs, relation: RelationOperator, rhs) -> bool:
+        match relation:
+            case RelationOperator.LEQ:
+                return lhs <= rhs
+            case RelationOperator.GEQ:
+                return lhs >= rhs
+            case _:
+                return lhs == rhs
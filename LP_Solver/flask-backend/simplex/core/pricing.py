@@ -0,0 +1,184 @@
+from typing import Callable
+import numpy as np
+from simplex.classes import PricingRule
+
+# Returned by Pricing.bounded_leaving_row when the entering variable reaches its own bound before any basic variable
+BOUND_FLIP = -2
+
+
+def harris_ratio_test(x_b: np.ndarray, alpha: np.ndarray, tol: float) -> int:
+    """
+    Returns the row index of the leaving variable or -1 if there is no variable can leave.
+    The first pass finds the longest step keeping every basic variable within tol of feasibility,
+    the second takes the largest pivot element among the rows whose ratio fits in that step.
+    """
+    positive = alpha > tol
+    if not positive.any():
+        return -1
+
+    rows = np.flatnonzero(positive)
+    x = np.maximum(x_b[rows], 0)
+    a = alpha[rows]
+    step = np.min((x + tol) / a)
+    candidates = rows[x / a <= step]
+    return int(candidates[np.argmax(alpha[candidates])])
+
+
+def dual_ratio_test(scores: np.ndarray, pivot_row: np.ndarray, tol: float) -> int:
+    """
+    Returns the entering column of a dual simplex pivot or -1 if no column can enter, which proves the LP infeasible.
+    scores are the improvement scores of the z row, all at most tol while the basis is dual feasible,
+    pivot_row is the row of B^-1 A whose basic variable is negative. Ratios within tol of the minimum are tied,
+    the largest pivot element among them is taken.
+    """
+    candidates = np.flatnonzero(pivot_row < -tol)
+    if not candidates.size:
+        return -1
+
+    ratios = np.maximum(-scores[candidates], 0) / -pivot_row[candidates]
+    ties = candidates[ratios <= ratios.min() + tol]
+    return int(ties[np.argmin(pivot_row[ties])])
+
+
+class Pricing:
+    """
+    Dantzig pricing, the column improving the z row the most per unit enters.
+    A pricing picks the entering column from the improvement scores of a z row, positive scores are candidates,
+    and the leaving row from the entering column. Weighted pricings keep a reference weight per column
+    and update it after every pivot from the pivot row.
+    """
+    uses_pivot_row = False
+    uses_column_products = False
+
+    def __init__(self, tol: float) -> None:
+        self.tol = tol
+
+
+    def start(self, cols: int, column_norms: Callable[[], np.ndarray]) -> None:
+        """
+        Called before the first iteration, column_norms returns the squared norms of the columns of B^-1 A.
+        """
+
+
+    def select(self, scores: np.ndarray) -> int:
+        col = int(np.argmax(scores))
+        return col if scores[col] > self.tol else -1
+
+
+    def leaving_row(self, x_b: np.ndarray, alpha: np.ndarray, basis: list[int]) -> int:
+        return harris_ratio_test(x_b, alpha, self.tol)
+
+
+    def bounded_leaving_row(self, x_b: np.ndarray, alpha: np.ndarray, basis: list[int],
+                            basic_upper: np.ndarray, entering_upper: float) -> tuple[int, bool]:
+        """
+        Ratio test of the bounded-variable simplex, alpha is the decrease of every basic variable per unit step
+        of the entering variable. Returns the leaving row and whether its variable leaves at its upper bound,
+        BOUND_FLIP if the entering variable reaches its own upper bound first or -1 if nothing limits the step.
+        """
+        row = self.leaving_row(x_b, alpha, basis)
+        step = max(x_b[row], 0) / alpha[row] if row != -1 else np.inf
+
+        upper_row, upper_step = -1, np.inf
+        rising = np.flatnonzero((alpha < -self.tol) & np.isfinite(basic_upper))
+        if rising.size:
+            ratios = np.maximum(basic_upper[rising] - x_b[rising], 0) / -alpha[rising]
+            k = int(np.argmin(ratios))
+            upper_row, upper_step = int(rising[k]), float(ratios[k])
+
+        if entering_upper <= min(step, upper_step):
+            return (BOUND_FLIP if np.isfinite(entering_upper) else -1), False
+        if upper_step < step:
+            return upper_row, True
+        return row, False
+
+
+    def update(self, entering: int, leaving: int, pivot_row: np.ndarray, alpha: np.ndarray,
+               column_products: np.ndarray | None) -> None:
+        """
+        Called before pivoting entering into the basis in place of leaving.
+        pivot_row is the row of B^-1 A holding the pivot, alpha the entering column of B^-1 A and
+        column_products the products of every column of B^-1 A with alpha.
+        """
+
+
+class BlandPricing(Pricing):
+    """
+    Bland's rule, the lowest index improving column enters and ratio ties leave by the lowest index.
+    Slow but it never cycles on degenerate problems.
+    """
+    def select(self, scores: np.ndarray) -> int:
+        candidates = np.flatnonzero(scores > self.tol)
+        return int(candidates[0]) if candidates.size else -1
+
+
+    def leaving_row(self, x_b: np.ndarray, alpha: np.ndarray, basis: list[int]) -> int:
+        positive = alpha > self.tol
+        if not positive.any():
+            return -1
+
+        ratios = np.full(alpha.size, np.inf)
+        ratios[positive] = np.maximum(x_b[positive], 0) / alpha[positive]
+        ties = np.flatnonzero(ratios <= ratios.min() + self.tol)
+        return int(ties[np.argmin(np.asarray(basis)[ties])])
+
+
+class DevexPricing(Pricing):
+    """
+    Devex pricing, improvements are divided by approximate steepest edge weights relative to a reference
+    framework of the columns non-basic when the weights were last reset.
+    """
+    uses_pivot_row = True
+    # Weights past this bound are too far from the real norms, the reference framework starts over
+    reset_bound = 1e6
+
+    def start(self, cols: int, column_norms: Callable[[], np.ndarray]) -> None:
+        self.weights = np.ones(cols)
+
+
+    def select(self, scores: np.ndarray) -> int:
+        candidates = scores > self.tol
+        if not candidates.any():
+            return -1
+        return int(np.argmax(np.where(candidates, scores ** 2 / self.weights, -np.inf)))
+
+
+    def update(self, entering: int, leaving: int, pivot_row: np.ndarray, alpha: np.ndarray,
+               column_products: np.ndarray | None) -> None:
+        pivot = pivot_row[entering]
+        weight = self.weights[entering]
+        np.maximum(self.weights, (pivot_row / pivot) ** 2 * weight, out=self.weights)
+        self.weights[leaving] = max(weight / pivot ** 2, 1)
+        if self.weights.max() > self.reset_bound:
+            self.weights.fill(1)
+
+
+class SteepestEdgePricing(DevexPricing):
+    """
+    Steepest edge pricing, improvements are divided by the norms of the edge directions 1 + ||B^-1 a_j||^2,
+    which are kept exact with the Goldfarb-Reid update.
+    """
+    uses_column_products = True
+
+    def start(self, cols: int, column_norms: Callable[[], np.ndarray]) -> None:
+        self.weights = 1 + column_norms()
+
+
+    def update(self, entering: int, leaving: int, pivot_row: np.ndarray, alpha: np.ndarray,
+               column_products: np.ndarray | None) -> None:
+        ratio = pivot_row / pivot_row[entering]
+        weight = 1 + alpha @ alpha
+        self.weights = np.maximum(self.weights - 2 * ratio * column_products + ratio ** 2 * weight, 1 + ratio ** 2)
+        self.weights[leaving] = max(weight / pivot_row[entering] ** 2, 1)
+
+
+def make_pricing(rule: PricingRule, tol: float) -> Pricing:
+    match rule:
+        case PricingRule.BLAND:
+            return BlandPricing(tol)
+        case PricingRule.DEVEX:
+            return DevexPricing(tol)
+        case PricingRule.STEEPEST_EDGE:
+            return SteepestEdgePricing(tol)
+        case _:
+            return Pricing(tol)
@@ -0,0 +1,320 @@
+import threading
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import splu
+from sympy import Symbol
+from simplex.classes import SimplexTerminationStatus, PricingRule, SolveCancelled
+from simplex.core.pricing import make_pricing, dual_ratio_test, BOUND_FLIP
+from simplex.core.sparse_matrix import SparseConstraintMatrix
+
+
+class RevisedSimplexEngine:
+    """
+    Revised simplex on the original constraint matrix.
+    Instead of rewriting a tableau, the engine keeps the basis B as an LU factorization
+    followed by a file of eta matrices (product form of the inverse) and refactorizes it periodically.
+    Each iteration only computes the reduced costs of the z rows and the entering column B^-1 a_q.
+    It takes the same z rows / [A | b] layout as NumericSimplexEngine and reports the same results,
+    including the dual simplex pass for starting bases which are optimal but not primal feasible
+    and the upper bounds of columns, x_b is kept as if every non-basic variable were 0.
+    Fixed columns never enter the basis, a non-basic fixed variable keeps the bound it is at.
+    """
+    def __init__(self, z_rows: np.ndarray, m: np.ndarray | sparse.spmatrix | SparseConstraintMatrix,
+                 x: list[Symbol], x_bv: list[Symbol],
+                 is_maximization: bool, artificial_vars: list[Symbol] | None = None,
+                 tol: float = 1e-9, refactor_every: int = 50, pricing: PricingRule = PricingRule.DANTZIG,
+                 upper: np.ndarray | None = None, at_upper: np.ndarray | None = None,
+                 fixed: np.ndarray | None = None,
+                 cancelled: threading.Event | None = None) -> None:
+        z_rows = np.array(z_rows, dtype=np.float64, ndmin=2)
+        self.costs = z_rows[:, :-1]
+        self.z_rhs = z_rows[:, -1]
+        self.m = m if isinstance(m, SparseConstraintMatrix) else SparseConstraintMatrix.from_matrix(m)
+        cols = self.m.shape[1] - 1
+        self.upper = np.full(cols, np.inf) if upper is None else np.array(upper, dtype=np.float64)
+        self.at_upper = np.zeros(cols, dtype=bool) if at_upper is None else np.array(at_upper, dtype=bool)
+        self.fixed = np.zeros(cols, dtype=bool) if fixed is None else np.array(fixed, dtype=bool)
+        self.x = x
+        self.x_bv = x_bv
+        self.is_max = is_maximization
+        self.artificial_vars = artificial_vars if artificial_vars is not None else []
+        self.tol = tol
+        self.refactor_every = refactor_every
+        self.pricing = make_pricing(pricing, tol)
+        self.cancelled = cancelled
+        self.step_cnt = 0
+        self.termination_status: SimplexTerminationStatus | None = None
+        self.unbounded_var: int = -1
+        self.infeasible_row: int = -1
+        col_of = {var: j for j, var in enumerate(x)}
+        self.basis: list[int] = [col_of[var] for var in x_bv]
+        self.__refactor()
+
+
+    def __refactor(self) -> None:
+        self.lu = splu(self.m.columns(self.basis))
+        self.etas: list[tuple[int, np.ndarray]] = []
+        self.x_b = self.__ftran(self.m.rhs)
+
+
+    def __ftran(self, v: np.ndarray) -> np.ndarray:
+        """
+        Returns B^-1 v.
+        """
+        w = self.lu.solve(v)
+        for p, eta in self.etas:
+            wp = w[p]
+            w += wp * eta
+            w[p] = wp * eta[p]
+        return w
+
+
+    def __btran(self, v: np.ndarray) -> np.ndarray:
+        """
+        Returns v B^-1 for every row of v.
+        """
+        w = v.copy()
+        for p, eta in reversed(self.etas):
+            w[:, p] = w @ eta
+        return self.lu.solve(w.T, trans='T').T
+
+
+    def __reduced_rows(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the z rows of the current basis and their values, with non-basic variables at their bounds.
+        """
+        y = self.__btran(self.costs[:, self.basis])
+        reduced = self.costs - self.m.rmatvec(y)
+        rhs = self.z_rhs - y @ self.m.rhs
+        if self.at_upper.any():
+            rhs = rhs - reduced[:, self.at_upper] @ self.upper[self.at_upper]
+        return reduced, rhs
+
+
+    def __basic_values(self) -> np.ndarray:
+        if not self.at_upper.any():
+            return self.x_b
+        at_upper = np.flatnonzero(self.at_upper)
+        return self.x_b - self.__ftran(self.m.columns(list(at_upper)) @ self.upper[at_upper])
+
+
+    def __directions(self) -> np.ndarray:
+        return np.where(self.at_upper, -1.0, 1.0)
+
+
+    def __improving(self, row: np.ndarray) -> np.ndarray:
+        return -row if self.is_max else row
+
+
+    def __find_entering_variable(self, reduced: np.ndarray) -> int:
+        eligible = ~self.fixed
+        eligible[self.basis] = False
+        directions = self.__directions()
+        for row in reduced:
+            col = self.pricing.select(np.where(eligible, self.__improving(row) * directions, -np.inf))
+            if col != -1:
+                return col
+            eligible &= np.abs(row) <= self.tol
+        return -1
+
+
+    def __find_leaving_variable(self, col: int, alpha: np.ndarray) -> tuple[int, bool]:
+        return self.pricing.bounded_leaving_row(self.__basic_values(), -alpha if self.at_upper[col] else alpha,
+                                                self.basis, self.upper[self.basis], self.upper[col])
+
+
+    def __column_norms(self, chunk: int = 256) -> np.ndarray:
+        # Right after a refactorization B^-1 is the LU factorization alone,
+        # columns are solved in chunks so B^-1 A is never held densely
+        self.__refactor()
+        cols = self.m.shape[1] - 1
+        norms = np.empty(cols)
+        for start in range(0, cols, chunk):
+            block = list(range(start, min(start + chunk, cols)))
+            columns = self.lu.solve(self.m.columns(block).toarray())
+            norms[block] = np.einsum('ij,ij->j', columns, columns)
+        return norms
+
+
+    def __pivot_row(self, row: int) -> np.ndarray:
+        """
+        Returns e_r B^-1 A.
+        """
+        unit = np.zeros((1, self.m.shape[0]))
+        unit[0, row] = 1
+        return self.m.rmatvec(self.__btran(unit))[0]
+
+
+    def __update_pricing(self, row: int, col: int, alpha: np.ndarray) -> None:
+        """
+        Hands the pivot row e_r B^-1 A, and for steepest edge the products alpha^T B^-1 A, to the pricing.
+        """
+        pivot_row = self.__pivot_row(row)
+        products = self.m.rmatvec(self.__btran(alpha[None]))[0] if self.pricing.uses_column_products else None
+        self.pricing.update(col, self.basis[row], pivot_row, alpha, products)
+
+
+    def __pivot(self, row: int, col: int, alpha: np.ndarray, to_upper: bool = False) -> None:
+        self.at_upper[col] = False
+        self.at_upper[self.basis[row]] = to_upper
+        if self.pricing.uses_pivot_row:
+            self.__update_pricing(row, col, alpha)
+
+        self.x_bv[row] = self.x[col]
+        self.basis[row] = col
+
+        theta = self.x_b[row] / alpha[row]
+        self.x_b -= theta * alpha
+        self.x_b[row] = theta
+
+        eta = -alpha / alpha[row]
+        eta[row] = 1 / alpha[row]
+        self.etas.append((row, eta))
+        self.step_cnt += 1
+
+        if len(self.etas) >= self.refactor_every:
+            self.__refactor()
+
+
+    def __can_leave(self, col_index: int) -> bool:
+        alpha = self.__ftran(self.m.column(col_index))
+        alpha = -alpha if self.at_upper[col_index] else alpha
+        return bool(np.isfinite(self.upper[col_index]) or np.any(alpha > self.tol))
+
+
+    def __infer_termination_status(self, reduced: np.ndarray) -> None:
+        self.termination_status = SimplexTerminationStatus.INFEASIBLE if self.__infeasible() \
+                             else SimplexTerminationStatus.UNBOUNDED if self.__unbounded() \
+                             else SimplexTerminationStatus.INFINITE_SOLUTIONS if self.__infinite_solutions(reduced) \
+                             else SimplexTerminationStatus.DEGENERATE if self.__degenerate() \
+                             else SimplexTerminationStatus.OPTIMAL
+
+
+    def __infeasible(self) -> bool:
+        x_b = self.__basic_values()
+        return self.infeasible_row != -1 or any(x_b[row] > self.tol for row, var in enumerate(self.x_bv) if var in self.artificial_vars)
+
+
+    def __unbounded(self) -> bool:
+        return self.unbounded_var != -1
+
+
+    def __infinite_solutions(self, reduced: np.ndarray) -> bool:
+        nonbasic = np.ones(reduced.shape[1], dtype=bool)
+        nonbasic[self.basis] = False
+        zero_cost = np.all(np.abs(reduced) <= self.tol, axis=0)
+        return any(self.__can_leave(j) for j in np.flatnonzero(nonbasic & zero_cost))
+
+
+    def __degenerate(self) -> bool:
+        x_b = self.__basic_values()
+        at_bound = (np.abs(x_b) <= self.tol) | (np.abs(x_b - self.upper[self.basis]) <= self.tol)
+        return any(at_bound[row] for row, var in enumerate(self.x_bv) if var not in self.artificial_vars)
+
+
+    def value_of(self, var: Symbol) -> float:
+        if var in self.x_bv:
+            return float(self.__basic_values()[self.x_bv.index(var)])
+        col = self.x.index(var)
+        return float(self.upper[col]) if self.at_upper[col] else 0.0
+
+
+    def objective_value(self, row_index: int = -1) -> float:
+        return float(self.__reduced_rows()[1][row_index])
+
+
+    def reduced_costs(self, row_index: int = -1) -> np.ndarray:
+        reduced = self.__reduced_rows()[0][row_index]
+        reduced[self.basis] = 0
+        return reduced
+
+
+    def is_satisfied(self, row_index: int) -> bool:
+        reduced, rhs = self.__reduced_rows()
+        nonbasic = np.ones(reduced.shape[1], dtype=bool)
+        nonbasic[self.basis] = False
+        return bool(np.all((reduced[row_index] * self.__directions())[nonbasic] <= self.tol) and abs(rhs[row_index]) <= self.tol)
+
+
+    def __check_cancelled(self) -> None:
+        if self.cancelled is not None and self.cancelled.is_set():
+            raise SolveCancelled()
+
+
+    def primal_feasible(self) -> bool:
+        x_b = self.__basic_values()
+        return bool(np.all(x_b >= -self.tol) and np.all(x_b <= self.upper[self.basis] + self.tol))
+
+
+    def dual_feasible(self) -> bool:
+        """
+        Returns true if no column improves the objective, the dual simplex is only run on a single z row.
+        """
+        if self.costs.shape[0] != 1:
+            return False
+        # May be called before reduce() starts the pricing, the scores are checked without it
+        eligible = ~self.fixed
+        eligible[self.basis] = False
+        scores = self.__improving(self.__reduced_rows()[0][0]) * self.__directions()
+        return not np.any(scores[eligible] > self.tol)
+
+
+    def place_at_dual_bounds(self) -> None:
+        """
+        Moves every non-basic column with an upper bound to the bound its reduced cost favours,
+        the states of a warm started basis are not known.
+        """
+        scores = self.__improving(self.__reduced_rows()[0][0])
+        bounded = np.isfinite(self.upper) & ~self.fixed
+        bounded[self.basis] = False
+        self.at_upper[bounded & (scores > self.tol)] = True
+        self.at_upper[bounded & (scores < -self.tol)] = False
+
+
+    def __dual_reduce(self) -> None:
+        while True:
+            self.__check_cancelled()
+            x_b = self.__basic_values()
+            below, above = -x_b, x_b - self.upper[self.basis]
+            leaving_var = int(np.argmax(np.maximum(below, above)))
+            if max(below[leaving_var], above[leaving_var]) <= self.tol:
+                return
+            # A basic variable above its upper bound leaves at the bound, its row is read with the opposite sign
+            to_upper = bool(above[leaving_var] > below[leaving_var])
+            reduced, _ = self.__reduced_rows()
+            directions = self.__directions()
+            pivot_row = self.__pivot_row(leaving_var) * directions * (-1 if to_upper else 1)
+            pivot_row[self.basis] = 0
+            pivot_row[self.fixed] = 0
+            entering_var = dual_ratio_test(self.__improving(reduced[0]) * directions, pivot_row, self.tol)
+            if entering_var == -1:
+                self.infeasible_row = leaving_var
+                return
+            self.__pivot(leaving_var, entering_var, self.__ftran(self.m.column(entering_var)), to_upper)
+
+
+    def reduce(self) -> None:
+        self.pricing.start(self.m.shape[1] - 1, self.__column_norms)
+        if not self.primal_feasible():
+            if not self.dual_feasible():
+                raise ValueError("The starting basis is neither primal nor dual feasible.")
+            self.__dual_reduce()
+
+        reduced, _ = self.__reduced_rows()
+        entering_var: int = self.__find_entering_variable(reduced) if self.infeasible_row == -1 else -1
+        while entering_var != -1:
+            self.__check_cancelled()
+            alpha = self.__ftran(self.m.column(entering_var))
+            leaving_var, to_upper = self.__find_leaving_variable(entering_var, alpha)
+            if leaving_var == -1:
+                self.unbounded_var = entering_var
+                break
+            if leaving_var == BOUND_FLIP:
+                self.at_upper[entering_var] = not self.at_upper[entering_var]
+                self.step_cnt += 1
+            else:
+                self.__pivot(leaving_var, entering_var, alpha, to_upper)
+            reduced, _ = self.__reduced_rows()
+            entering_var = self.__find_entering_variable(reduced)
+
+        self.__infer_termination_status(reduced)
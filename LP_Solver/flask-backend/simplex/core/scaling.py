@@ -0,0 +1,107 @@
+import numpy as np
+from scipy import sparse
+from simplex.classes import ScalingMethod
+from simplex.core.sparse_matrix import SparseConstraintMatrix
+
+# Geometric mean passes stop early once a pass improves the coefficient ratio by less than this factor
+GEOMETRIC_PASSES = 8
+GEOMETRIC_MIN_GAIN = 0.9
+
+
+def coefficient_ratio(a: sparse.spmatrix) -> float:
+    """
+    Ratio of the largest to the smallest absolute non-zero coefficient, the conditioning measure scaling minimizes.
+    """
+    values = np.abs(sparse.csc_matrix(a).data)
+    values = values[values > 0]
+    return float(values.max() / values.min()) if values.size else 1.0
+
+
+def _row_extremes(a: sparse.csr_matrix) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Largest and smallest absolute non-zero of every row, 1 for empty rows.
+    """
+    a = abs(a)
+    largest = np.ones(a.shape[0])
+    smallest = np.ones(a.shape[0])
+    nonempty = np.diff(a.indptr) > 0
+    largest[nonempty] = np.maximum.reduceat(a.data, a.indptr[:-1][nonempty])
+    smallest[nonempty] = np.minimum.reduceat(a.data, a.indptr[:-1][nonempty])
+    return largest, smallest
+
+
+def _power_of_two(factors: np.ndarray) -> np.ndarray:
+    # Powers of two scale without rounding errors
+    return 2.0 ** np.round(np.log2(factors))
+
+
+class Scaling:
+    """
+    Row scaling R and column scaling S of the decision variables columns A of a standardized LP, solved as R A S.
+    Geometric scaling repeats geometric mean passes over rows and columns and finishes with an equilibration pass,
+    equilibration divides every row and column by its largest entry. Factors are rounded to powers of two.
+    Slack, excess, deviation and artificial columns are scaled by the inverse of their row factor so they stay
+    signed unit vectors and the logical basis stays an identity.
+    A value x' of the scaled LP is the value x' * col_scale of the original one, z rows are scaled along
+    so objective values are unchanged.
+    """
+    def __init__(self, a: sparse.spmatrix, method: ScalingMethod) -> None:
+        self.method = method
+        original = sparse.csr_matrix(a, dtype=np.float64)
+        self.condition_before = coefficient_ratio(original)
+        self.row_scale = np.ones(original.shape[0])
+        self.col_scale = np.ones(original.shape[1])
+
+        a = original
+        if method == ScalingMethod.GEOMETRIC:
+            ratio = self.condition_before
+            for _ in range(GEOMETRIC_PASSES):
+                largest, smallest = _row_extremes(a)
+                a = self.__scale(a, 1 / np.sqrt(largest * smallest), None)
+                largest, smallest = _row_extremes(sparse.csr_matrix(a.T))
+                a = self.__scale(a, None, 1 / np.sqrt(largest * smallest))
+                previous, ratio = ratio, coefficient_ratio(a)
+                if ratio > GEOMETRIC_MIN_GAIN * previous:
+                    break
+        if method != ScalingMethod.NONE:
+            a = self.__scale(a, 1 / _row_extremes(a)[0], None)
+            self.__scale(a, None, 1 / _row_extremes(sparse.csr_matrix(a.T))[0])
+
+        self.row_scale = _power_of_two(self.row_scale)
+        self.col_scale = _power_of_two(self.col_scale)
+        self.condition_after = coefficient_ratio(sparse.diags(self.row_scale) @ original @ sparse.diags(self.col_scale))
+
+
+    def apply(self, m: np.ndarray | SparseConstraintMatrix, z_rows: np.ndarray) -> tuple[np.ndarray | SparseConstraintMatrix,
+                                                                                         np.ndarray, np.ndarray]:
+        """
+        Returns the scaled matrix and z rows and the scale factor of every column of m except the right hand side.
+        """
+        if isinstance(m, SparseConstraintMatrix):
+            cols = np.concatenate((self.col_scale, 1 / self.row_scale[m.logical_rows]))
+            scaled = SparseConstraintMatrix(sparse.diags(self.row_scale) @ m.a @ sparse.diags(self.col_scale),
+                                            m.logical_rows, m.logical_signs, m.rhs * self.row_scale)
+        else:
+            # Each logical column has a single non-zero, in the row it belongs to
+            logical_rows = np.argmax(np.abs(m[:, self.col_scale.size:-1]), axis=0)
+            cols = np.concatenate((self.col_scale, 1 / self.row_scale[logical_rows]))
+            scaled = self.row_scale[:, None] * m * np.append(cols, 1)
+        return scaled, z_rows * np.append(cols, 1), cols
+
+
+    def summary(self) -> dict:
+        return {
+            "method": self.method.value,
+            "conditionBefore": self.condition_before,
+            "conditionAfter": self.condition_after,
+        }
+
+
+    def __scale(self, a: sparse.csr_matrix, rows: np.ndarray | None, cols: np.ndarray | None) -> sparse.csr_matrix:
+        if rows is not None:
+            self.row_scale *= rows
+            a = sparse.csr_matrix(sparse.diags(rows) @ a)
+        if cols is not None:
+            self.col_scale *= cols
+            a = sparse.csr_matrix(a @ sparse.diags(cols))
+        return a
@@ -0,0 +1,80 @@
+import numpy as np
+from scipy import sparse
+
+
+class SparseConstraintMatrix:
+    """
+    Augmented constraint matrix [A | L | b] of a standardized LP.
+    A holds the decision variables columns in sparse form, L holds the slack, excess, deviation and
+    artificial variables columns which are signed unit vectors and are kept implicitly as (row, sign) pairs.
+    Memory scales with the non-zeros of A instead of rows x cols.
+    """
+    def __init__(self, a: sparse.spmatrix, logical_rows: np.ndarray, logical_signs: np.ndarray,
+                 rhs: np.ndarray) -> None:
+        self.a = sparse.csc_matrix(a, dtype=np.float64)
+        self.logical_rows = np.asarray(logical_rows, dtype=np.int64)
+        self.logical_signs = np.asarray(logical_signs, dtype=np.float64)
+        self.rhs = np.asarray(rhs, dtype=np.float64)
+
+
+    @staticmethod
+    def from_matrix(m: np.ndarray | sparse.spmatrix) -> 'SparseConstraintMatrix':
+        m = sparse.csc_matrix(m, dtype=np.float64)
+        return SparseConstraintMatrix(m[:, :-1], [], [], m[:, -1].toarray().ravel())
+
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.a.shape[0], self.a.shape[1] + self.logical_rows.size + 1
+
+
+    def column(self, j: int) -> np.ndarray:
+        if j < self.a.shape[1]:
+            return self.a[:, j].toarray().ravel()
+        col = np.zeros(self.a.shape[0])
+        col[self.logical_rows[j - self.a.shape[1]]] = self.logical_signs[j - self.a.shape[1]]
+        return col
+
+
+    def columns(self, cols: list[int]) -> sparse.csc_matrix:
+        """
+        Returns the given columns without the right hand side, as needed to factorize a basis.
+        """
+        structural, logical = self.__split(cols)
+        unit = sparse.csc_matrix((self.logical_signs[logical], (self.logical_rows[logical], np.arange(len(logical)))),
+                                 shape=(self.a.shape[0], len(logical)))
+        block = sparse.hstack((self.a[:, structural], unit), format='csc')
+        # block holds the structural columns first, put every column back at its position in cols
+        positions = [k for k, j in enumerate(cols) if j < self.a.shape[1]] \
+                  + [k for k, j in enumerate(cols) if j >= self.a.shape[1]]
+        return block[:, np.argsort(positions)]
+
+
+    def rmatvec(self, y: np.ndarray) -> np.ndarray:
+        """
+        Returns y [A | L] for every row of y.
+        """
+        return np.hstack(((self.a.T @ y.T).T, y[:, self.logical_rows] * self.logical_signs))
+
+
+    def __split(self, cols: list[int]) -> tuple[list[int], list[int]]:
+        n = self.a.shape[1]
+        return [j for j in cols if j < n], [j - n for j in cols if j >= n]
+
+
+    def __getitem__(self, key: tuple[slice, list[int]]) -> 'SparseConstraintMatrix':
+        """
+        Column selection m[:, cols], cols must be increasing and keep the right hand side column.
+        """
+        _, cols = key
+        if cols[-1] != self.shape[1] - 1:
+            raise IndexError("Column selection must keep the right hand side column.")
+        structural, logical = self.__split(cols[:-1])
+        return SparseConstraintMatrix(self.a[:, structural], self.logical_rows[logical],
+                                      self.logical_signs[logical], self.rhs)
+
+
+    def toarray(self) -> np.ndarray:
+        logical = np.zeros((self.a.shape[0], self.logical_rows.size))
+        logical[self.logical_rows, np.arange(self.logical_rows.size)] = self.logical_signs
+        return np.hstack((self.a.toarray(), logical, self.rhs[:, None]))
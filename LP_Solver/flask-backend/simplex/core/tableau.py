@@ -0,0 +1,194 @@
+from abc import ABC, abstractmethod
+from fractions import Fraction
+from functools import lru_cache
+from sympy import Matrix, Expr, Rational, Symbol, sympify
+from simplex.core.big_m import BigMNumber
+
+
+class Tableau(ABC):
+    """
+    Row storage of a simplex tableau.
+    Subclasses decide how the cells are represented and how row operations are carried out.
+    """
+    def __init__(self, matrix: Matrix) -> None:
+        self.rows, self.cols = matrix.shape
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.rows, self.cols
+
+    @abstractmethod
+    def __getitem__(self, key: tuple[int, int]):
+        ...
+
+    @abstractmethod
+    def divide_row(self, row: int, divisor) -> None:
+        ...
+
+    @abstractmethod
+    def subtract_row(self, target_row: int, factor, source: 'Tableau', source_row: int) -> None:
+        """
+        target_row -= factor * source[source_row, :]
+        """
+
+    @abstractmethod
+    def tolist(self) -> list[list[Expr]]:
+        ...
+
+    @abstractmethod
+    def copy(self) -> 'Tableau':
+        ...
+
+    def to_matrix(self) -> Matrix:
+        return Matrix(self.tolist())
+
+    @staticmethod
+    def to_sympy(value) -> Expr:
+        return value
+
+    def symbolic(self, i: int, j: int) -> Expr:
+        return self.to_sympy(self[i, j])
+
+    @staticmethod
+    def accepts(matrix: Matrix) -> bool:
+        return True
+
+
+class SympyTableau(Tableau):
+    """
+    Keeps the tableau as a SymPy matrix, required when cells hold symbols such as M or P_i.
+    """
+    def __init__(self, matrix: Matrix) -> None:
+        super().__init__(matrix)
+        self.matrix = matrix
+
+    def __getitem__(self, key: tuple[int, int]) -> Expr:
+        return self.matrix[key]
+
+    def divide_row(self, row: int, divisor: Expr) -> None:
+        self.matrix[row, :] = self.matrix[row, :] / divisor
+
+    def subtract_row(self, target_row: int, factor: Expr, source: 'SympyTableau', source_row: int) -> None:
+        self.matrix[target_row, :] -= factor * source.matrix[source_row, :]
+
+    def tolist(self) -> list[list[Expr]]:
+        return self.matrix.tolist()
+
+    def to_matrix(self) -> Matrix:
+        return self.matrix.copy()
+
+    def copy(self) -> 'SympyTableau':
+        return SympyTableau(self.matrix.copy())
+
+
+class RationalTableau(Tableau):
+    """
+    Keeps a purely numeric tableau as rows of Python Fractions.
+    Row operations are exact and run on native integers instead of SymPy objects.
+    """
+    def __init__(self, matrix: Matrix) -> None:
+        super().__init__(matrix)
+        self._rows: list[list[Fraction]] = [[Fraction(int(cell.p), int(cell.q)) for cell in matrix.row(i)]
+                                            for i in range(matrix.rows)]
+
+    def __getitem__(self, key: tuple[int, int]) -> Fraction:
+        i, j = key
+        return self._rows[i][j]
+
+    def divide_row(self, row: int, divisor: Fraction) -> None:
+        self._rows[row] = [cell / divisor for cell in self._rows[row]]
+
+    def subtract_row(self, target_row: int, factor: Fraction, source: 'RationalTableau', source_row: int) -> None:
+        self._rows[target_row] = [a - factor * b if b else a
+                                  for a, b in zip(self._rows[target_row], source._rows[source_row])]
+
+    def tolist(self) -> list[list[Expr]]:
+        return [[self.to_sympy(cell) for cell in row] for row in self._rows]
+
+    def copy(self) -> 'RationalTableau':
+        # Row operations replace whole rows, so the rows themselves can be shared
+        clone = type(self).__new__(type(self))
+        clone.rows, clone.cols = self.rows, self.cols
+        clone._rows = list(self._rows)
+        return clone
+
+    @staticmethod
+    def to_sympy(value: Fraction) -> Expr:
+        return _fraction_to_rational(value) if isinstance(value, Fraction) else sympify(value)
+
+    @staticmethod
+    def accepts(matrix: Matrix) -> bool:
+        return all(cell.is_Rational for cell in matrix)
+
+
+class BigMTableau(RationalTableau):
+    """
+    Keeps z rows of the form a + b * symbol, with a single penalty symbol (M or P_i) per row, as BigMNumbers.
+    Rows are pivoted against a RationalTableau, only rendering converts the cells back to SymPy.
+    """
+    def __init__(self, matrix: Matrix) -> None:
+        Tableau.__init__(self, matrix)
+        self._rows: list[list[BigMNumber]] = []
+        for i in range(matrix.rows):
+            symbol = next(iter(matrix.row(i).free_symbols), None)
+            row = []
+            for cell in matrix.row(i):
+                real, coeff = _split_penalty(cell, symbol)
+                row.append(BigMNumber(Fraction(int(real.p), int(real.q)), Fraction(int(coeff.p), int(coeff.q)), symbol))
+            self._rows.append(row)
+
+    @staticmethod
+    def to_sympy(value: BigMNumber) -> Expr:
+        if not isinstance(value, BigMNumber):
+            return RationalTableau.to_sympy(value)
+        real = _fraction_to_rational(value.real)
+        return real + _fraction_to_rational(value.m) * value.symbol if value.m else real
+
+    @staticmethod
+    def accepts(matrix: Matrix) -> bool:
+        for i in range(matrix.rows):
+            symbols = matrix.row(i).free_symbols
+            if len(symbols) > 1:
+                return False
+            symbol = next(iter(symbols), None)
+            if not all(real.is_Rational and coeff.is_Rational
+                       for real, coeff in (_split_penalty(cell, symbol) for cell in matrix.row(i))):
+                return False
+        return True
+
+
+def _split_penalty(cell: Expr, symbol: Symbol | None) -> tuple[Expr, Expr]:
+    """
+    Returns the real part and the coefficient of symbol of a cell.
+    """
+    if symbol is None:
+        return sympify(cell), sympify(0)
+    real, penalty = sympify(cell).as_independent(symbol, as_Add=True)
+    return real, sympify(penalty / symbol)
+
+
+@lru_cache(maxsize=1 << 16)
+def _fraction_to_rational(value: Fraction) -> Rational:
+    # Tableau snapshots repeat the same few values (0, 1, ...) in almost every cell
+    return Rational(value.numerator, value.denominator)
+
+
+def select_tableau_type(*matrices: Matrix) -> type[Tableau]:
+    """
+    Returns the most compact tableau representation able to hold every given matrix exactly.
+    """
+    return RationalTableau if all(RationalTableau.accepts(matrix) for matrix in matrices) else SympyTableau
+
+
+def select_tableau_types(z_rows: Matrix, m: Matrix) -> tuple[type[Tableau], type[Tableau]]:
+    """
+    Returns the tableau representations of the z rows and of the constraint rows.
+    Z rows are pivoted against the constraint rows, so penalty symbols only need SymPy
+    when the constraint rows do or when a z row is not linear in a single penalty symbol.
+    """
+    if RationalTableau.accepts(m):
+        if RationalTableau.accepts(z_rows):
+            return RationalTableau, RationalTableau
+        if BigMTableau.accepts(z_rows):
+            return BigMTableau, RationalTableau
+    return SympyTableau, SympyTableau
\ No newline at end of file
@@ -0,0 +1,166 @@
+from typing import Callable
+from sympy import Symbol
+from simplex.classes import TraceLevel
+from simplex.core.tableau import Tableau
+
+
+class _Checkpoint:
+    """
+    Tableau and variables at the start of an engine run followed by the row operations applied since.
+    """
+    def __init__(self, z_rows: Tableau, m: Tableau, variables: list[Symbol]) -> None:
+        self.z_rows = z_rows
+        self.m = m
+        self.variables = variables
+        self.ops: list[tuple] = []
+
+
+class StepTrace:
+    """
+    Steps recorded by the engines, read like a list of step dicts.
+    Steps do not hold their own tableau, every engine run stores one checkpoint of its initial tableau and
+    the row operations applied to it (pivot row and multiplier), a step tableau is rebuilt on demand by
+    replaying them. The trace level decides which steps are kept at all.
+    """
+    def __init__(self, trace_level: TraceLevel = TraceLevel.ROW_OPERATION) -> None:
+        self.trace_level = trace_level
+        self.__records: list[tuple[dict, int, int]] = []
+        self.__checkpoints: list[_Checkpoint] = []
+        self.__cursor: list | None = None
+
+
+    def includes(self, level: TraceLevel) -> bool:
+        return self.trace_level.includes(level)
+
+
+    def checkpoint(self, z_rows: Tableau, m: Tableau, variables: list[Symbol]) -> None:
+        if self.trace_level != TraceLevel.NONE:
+            self.__checkpoints.append(_Checkpoint(z_rows.copy(), m.copy(), variables.copy()))
+
+
+    def record_division(self, row: int, divisor) -> None:
+        if self.__checkpoints:
+            self.__checkpoints[-1].ops.append((row, divisor))
+
+
+    def record_row_operation(self, target_is_z_row: bool, target_row: int, factor, pivot_row: int) -> None:
+        if self.__checkpoints:
+            self.__checkpoints[-1].ops.append((target_row, factor, pivot_row, target_is_z_row))
+
+
+    def append(self, step: dict) -> None:
+        self.__records.append((step, len(self.__checkpoints) - 1, len(self.__checkpoints[-1].ops)))
+
+
+    def pop(self, index: int = -1) -> None:
+        self.__records.pop(index)
+
+
+    def update(self, index: int, **fields) -> None:
+        self.__records[index][0].update(fields)
+
+
+    def close(self) -> None:
+        """
+        Called once the solver is done with the steps.
+        """
+
+
+    def __len__(self) -> int:
+        return len(self.__records)
+
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+
+    def __getitem__(self, index: int) -> dict:
+        step, checkpoint_index, ops_cnt = self.__records[index]
+        checkpoint = self.__checkpoints[checkpoint_index]
+        z_rows, m = self.__replay(checkpoint_index, ops_cnt)
+        return dict(step, variables=checkpoint.variables, simplexMatrix=z_rows.tolist() + m.tolist())
+
+
+    def __replay(self, checkpoint_index: int, ops_cnt: int) -> tuple[Tableau, Tableau]:
+        """
+        Rebuilds the tableau after the first ops_cnt operations of a checkpoint.
+        Steps are mostly read in order, so replay continues from the last rebuilt tableau when possible.
+        """
+        checkpoint = self.__checkpoints[checkpoint_index]
+        if self.__cursor is None or self.__cursor[0] != checkpoint_index or self.__cursor[1] > ops_cnt:
+            self.__cursor = [checkpoint_index, 0, checkpoint.z_rows.copy(), checkpoint.m.copy()]
+
+        _, done, z_rows, m = self.__cursor
+        for op in checkpoint.ops[done:ops_cnt]:
+            if len(op) == 2:
+                m.divide_row(*op)
+            else:
+                target_row, factor, pivot_row, target_is_z_row = op
+                (z_rows if target_is_z_row else m).subtract_row(target_row, factor, m, pivot_row)
+        self.__cursor[1] = ops_cnt
+        return z_rows, m
+
+
+class StreamingStepTrace(StepTrace):
+    """
+    Hands every step, with its tableau, to a sink instead of keeping it.
+    The latest step is held back until the next one arrives or the trace is closed,
+    since the solver may still drop it or rewrite its comment. Steps cannot be read back.
+    """
+    def __init__(self, sink: Callable[[dict], None], trace_level: TraceLevel = TraceLevel.ROW_OPERATION) -> None:
+        super().__init__(trace_level)
+        self.sink = sink
+        self.__live: tuple[Tableau, Tableau, list[Symbol]] | None = None
+        self.__pending: dict | None = None
+        self.__cnt = 0
+
+
+    def checkpoint(self, z_rows: Tableau, m: Tableau, variables: list[Symbol]) -> None:
+        # The engine tableaus are read directly when a step is recorded, no replay is needed
+        self.__live = (z_rows, m, variables.copy())
+
+
+    def record_division(self, row: int, divisor) -> None:
+        pass
+
+
+    def record_row_operation(self, target_is_z_row: bool, target_row: int, factor, pivot_row: int) -> None:
+        pass
+
+
+    def append(self, step: dict) -> None:
+        self.__flush()
+        z_rows, m, variables = self.__live
+        self.__pending = dict(step, variables=variables, simplexMatrix=z_rows.tolist() + m.tolist())
+        self.__cnt += 1
+
+
+    def pop(self, index: int = -1) -> None:
+        if index != -1 or self.__pending is None:
+            raise IndexError("Only the latest step of a streaming trace can be removed.")
+        self.__pending = None
+        self.__cnt -= 1
+
+
+    def update(self, index: int, **fields) -> None:
+        if index != -1 or self.__pending is None:
+            raise IndexError("Only the latest step of a streaming trace can be updated.")
+        self.__pending.update(fields)
+
+
+    def close(self) -> None:
+        self.__flush()
+
+
+    def __flush(self) -> None:
+        if self.__pending is not None:
+            self.sink(self.__pending)
+            self.__pending = None
+
+
+    def __len__(self) -> int:
+        return self.__cnt
+
+
+    def __getitem__(self, index: int) -> dict:
+        raise TypeError("Steps of a streaming trace are handed to its sink and cannot be read back.")
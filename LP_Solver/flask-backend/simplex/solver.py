@@ -1,20 +1,42 @@
+import copy
+import threading
+from typing import Callable
+import numpy as np
+from scipy import sparse
 from sympy import Matrix, Symbol, latex
 
-from simplex.classes import RelationOperator, ArtificialSolutionMethod, SimplexTerminationStatus
-from simplex.core import SimplexEngine
-from simplex.util import compare_expressions
+from simplex.classes import RelationOperator, ArtificialSolutionMethod, SimplexTerminationStatus, SolveMode, TraceLevel, \
+    PricingRule, ScalingMethod, GoalProgrammingMethod, CommentGenerator
+from simplex.core import SimplexEngine, DualSimplexEngine, NumericSimplexEngine, RevisedSimplexEngine, SparseConstraintMatrix, StepTrace, \
+    StreamingStepTrace, Presolve, Scaling, BoundShift
+from simplex.util import compare_expressions, encode_basis_token, decode_basis_token
+from simplex.branch_and_bound import BranchAndBound
 
 
 class SimplexSolver:
     def __init__(self,
                  objective_function_coefficients_vector: Matrix | None,
-                 aug_constraints_coefficients_matrix: Matrix,
+                 aug_constraints_coefficients_matrix: Matrix | sparse.spmatrix,
                  constraints_relations: list[RelationOperator],
                  aug_goals_coefficients_matrix: Matrix | None,
                  goals_relations: list[RelationOperator] | None,
                  restricted: list[bool],
                  is_maximization: bool | None,
-                 artificial_solution_method: ArtificialSolutionMethod | None) -> None:
+                 artificial_solution_method: ArtificialSolutionMethod | None,
+                 solve_mode: SolveMode = SolveMode.EXACT,
+                 trace_level: TraceLevel = TraceLevel.ROW_OPERATION,
+                 pricing_rule: PricingRule = PricingRule.STEEPEST_EDGE,
+                 scaling_method: ScalingMethod = ScalingMethod.GEOMETRIC,
+                 goal_method: GoalProgrammingMethod = GoalProgrammingMethod.PRIORITY,
+                 warm_start: str | None = None,
+                 presolve: bool = False,
+                 lower_bounds: list | None = None,
+                 upper_bounds: list | None = None,
+                 integer: list[bool] | None = None,
+                 node_limit: int | None = None,
+                 time_limit: float | None = None,
+                 step_sink: Callable[[dict], None] | None = None,
+                 cancelled: threading.Event | None = None) -> None:
 
         self.objective_function_coefficients_vector = objective_function_coefficients_vector
         self.aug_constraints_coefficients_matrix = aug_constraints_coefficients_matrix
@@ -24,7 +46,43 @@ class SimplexSolver:
         self.restricted = restricted
         self.is_maximization = is_maximization
         self.artificial_solution_method = artificial_solution_method
-        self.steps: list[dict] = []
+        self.solve_mode = solve_mode
+        self.pricing_rule = pricing_rule
+        self.scaling_method = scaling_method
+        self.goal_method = goal_method
+        self.warm_start = warm_start
+        self.presolve = presolve
+        self.presolver: Presolve | None = None
+        self.lower_bounds = lower_bounds
+        self.upper_bounds = upper_bounds
+        self.bound_shift: BoundShift | None = None
+        # Upper bounds of the decision variables once their lower bounds are shifted to 0, None if unbounded
+        self.var_upper_bounds: list = [None] * len(restricted)
+        self.integer = integer
+        self.node_limit = node_limit
+        self.time_limit = time_limit
+        self.branch_and_bound: BranchAndBound | None = None
+        # Arguments of the LP relaxation for the branch-and-bound nodes, copied before the solve rewrites them
+        self.relaxation_input: dict | None = copy.deepcopy({
+            "objective_function_coefficients_vector": objective_function_coefficients_vector,
+            "aug_constraints_coefficients_matrix": aug_constraints_coefficients_matrix,
+            "constraints_relations": constraints_relations,
+            "aug_goals_coefficients_matrix": aug_goals_coefficients_matrix,
+            "goals_relations": goals_relations,
+            "restricted": restricted,
+            "is_maximization": is_maximization,
+            "artificial_solution_method": artificial_solution_method,
+            "solve_mode": solve_mode,
+            "pricing_rule": pricing_rule,
+            "scaling_method": scaling_method,
+            "presolve": presolve,
+            "lower_bounds": lower_bounds,
+            "upper_bounds": upper_bounds,
+        }) if integer is not None and any(integer) else None
+        self.cancelled = cancelled
+        self.engines: list[SimplexEngine | NumericSimplexEngine | RevisedSimplexEngine] = []
+        self.steps: StepTrace = StreamingStepTrace(step_sink, trace_level) if step_sink is not None \
+                           else StepTrace(trace_level)
         self.vars: list[Symbol] = []
         self.restricted_decision_vars: list[tuple[int, Symbol]] = []
         self.unrestricted_decision_vars: list[tuple[int, Symbol, Symbol]] = []
@@ -35,10 +93,32 @@ class SimplexSolver:
         self.excess_deviation_vars: list[tuple[int, Symbol]] = []
         self.symbols_in_z_rows: list[Symbol] = []
         self.z_rows_symbols: list[Symbol] = []
+        self.vars_layout: list[str] = []
+        # Numeric modes solve a scaled LP, the value of a variable is its scaled value times its column scale
+        self.col_scales: dict[Symbol, float] = {}
+        # Original indices of the decision variables and constraints left after presolve, used to name variables
+        self.decision_var_indices: list[int] = list(range(len(restricted)))
+        self.constraint_indices: list[int] = list(range(len(constraints_relations)))
+        self.constraints_cnt = len(constraints_relations)
+        self.dual_start: bool = False
         self.result: dict = {}
 
 
     def solve(self) -> None:
+        if self.lower_bounds is not None or self.upper_bounds is not None:
+            self.__shift_bounds()
+        if self.presolve:
+            self.__presolve()
+        self.dual_start = self.__dual_start_applies()
+        if self.solve_mode in (SolveMode.NUMERIC, SolveMode.REVISED):
+            self.__solve_numeric()
+            self.result["method"] = self.__method_used()
+            self.__postsolve()
+            self.__branch_and_bound()
+            return
+
+        # The exact engines have no bounded variables, upper bounds become constraint rows
+        self.__append_upper_bound_rows()
         self.__standardize_coeff()
         self.__standardize_z_rows()
 
@@ -52,19 +132,204 @@ class SimplexSolver:
                     simplex_engine = self.__init_two_phase()
 
         if simplex_engine is None or simplex_engine.termination_status != SimplexTerminationStatus.INFEASIBLE:
-            simplex_engine = SimplexEngine(self.objective_function_coefficients_vector,
-                                           self.symbols_in_z_rows,
-                                           self.aug_constraints_coefficients_matrix,
-                                           self.vars,
-                                           self.basic_vars,
-                                           self.is_maximization,
-                                           self.steps,
-                                           self.z_rows_symbols,
-                                           [a[1] for a in self.artificial_vars])
+            engine_type = DualSimplexEngine if self.dual_start else SimplexEngine
+            simplex_engine = self.__create_engine(engine_type,
+                                                  self.objective_function_coefficients_vector,
+                                                  self.symbols_in_z_rows,
+                                                  self.aug_constraints_coefficients_matrix,
+                                                  self.vars,
+                                                  self.basic_vars,
+                                                  self.is_maximization,
+                                                  self.steps,
+                                                  self.z_rows_symbols,
+                                                  [a[1] for a in self.artificial_vars])
             simplex_engine.reduce()
 
         self.__build_result(simplex_engine)
+        self.result["method"] = self.__method_used()
+        self.__postsolve()
+        self.__branch_and_bound()
         self.__build_final_comment()
+        self.steps.close()
+
+
+    @property
+    def step_cnt(self) -> int:
+        """
+        Steps taken so far by every engine of the solve, may be read while solving.
+        """
+        return sum(simplex_engine.step_cnt for simplex_engine in self.engines) \
+             + (self.branch_and_bound.step_cnt if self.branch_and_bound is not None else 0)
+
+
+    def __create_engine(self, engine_type: type, *args, **kwargs):
+        simplex_engine = engine_type(*args, cancelled=self.cancelled, **kwargs)
+        self.engines.append(simplex_engine)
+        return simplex_engine
+
+
+    def __shift_bounds(self) -> None:
+        self.bound_shift = BoundShift(self.lower_bounds, self.upper_bounds, self.restricted)
+        self.objective_function_coefficients_vector, self.aug_constraints_coefficients_matrix, \
+            self.aug_goals_coefficients_matrix = self.bound_shift.apply(self.objective_function_coefficients_vector,
+                                                                        self.aug_constraints_coefficients_matrix,
+                                                                        self.aug_goals_coefficients_matrix)
+        self.restricted = self.bound_shift.shifted_restricted
+        self.var_upper_bounds = self.bound_shift.upper_bounds
+
+
+    def __append_upper_bound_rows(self) -> None:
+        bounded = [(i, u) for i, u in enumerate(self.var_upper_bounds) if u is not None]
+        if not bounded:
+            return
+        cols = self.aug_constraints_coefficients_matrix.cols
+        rows = Matrix.zeros(len(bounded), cols)
+        for k, (i, u) in enumerate(bounded):
+            rows[k, i] = 1
+            rows[k, -1] = u
+        self.aug_constraints_coefficients_matrix = self.aug_constraints_coefficients_matrix.col_join(rows)
+        self.constraints_relations = self.constraints_relations + [RelationOperator.LEQ] * len(bounded)
+        self.constraint_indices = self.constraint_indices + list(range(self.constraints_cnt, self.constraints_cnt + len(bounded)))
+
+
+    def __column_upper_bounds(self) -> np.ndarray | None:
+        """
+        Upper bound of every column of the standardized LP in its scaled units, None if no column has one.
+        """
+        if all(u is None for u in self.var_upper_bounds):
+            return None
+        upper = np.full(len(self.vars), np.inf)
+        for i, var in self.restricted_decision_vars:
+            if self.var_upper_bounds[i] is not None:
+                upper[self.vars.index(var)] = float(self.var_upper_bounds[i]) / self.col_scales.get(var, 1.0)
+        return upper
+
+
+    def __presolve(self) -> None:
+        self.presolver = Presolve(self.objective_function_coefficients_vector,
+                                  self.aug_constraints_coefficients_matrix,
+                                  self.constraints_relations,
+                                  self.aug_goals_coefficients_matrix,
+                                  self.restricted,
+                                  self.is_maximization,
+                                  self.var_upper_bounds)
+        if not self.presolver.run():
+            return
+
+        reduced = self.presolver.reduced_problem()
+        self.objective_function_coefficients_vector = reduced["objective_function_coefficients_vector"]
+        self.aug_constraints_coefficients_matrix = reduced["aug_constraints_coefficients_matrix"]
+        self.constraints_relations = reduced["constraints_relations"]
+        self.aug_goals_coefficients_matrix = reduced["aug_goals_coefficients_matrix"]
+        self.restricted = reduced["restricted"]
+        self.var_upper_bounds = reduced["upper_bounds"]
+        self.decision_var_indices = self.presolver.cols
+        self.constraint_indices = self.presolver.rows
+
+
+    def __postsolve(self) -> None:
+        """
+        Maps the result of the presolved and bound shifted LP back onto the original decision variables.
+        """
+        if self.presolver is not None:
+            self.restricted = self.presolver.restricted
+        if self.bound_shift is not None:
+            self.restricted = self.bound_shift.restricted
+        if self.result["status"] != SimplexTerminationStatus.INFEASIBLE:
+            for stage in (self.presolver, self.bound_shift):
+                if stage is None:
+                    continue
+                values, objective = stage.postsolve(self.result["finalDecisionVariablesValues"],
+                                                    self.result.get("finalObjectiveFunctionValue"))
+                self.result["finalDecisionVariablesValues"] = values
+                if objective is not None:
+                    self.result["finalObjectiveFunctionValue"] = objective
+        if self.presolver is not None:
+            # After postsolve rebuilt the slacks of the rows turned into bounds
+            self.result["presolve"] = self.presolver.summary()
+
+
+    def __branch_and_bound(self) -> None:
+        """
+        Continues from the solved relaxation as the root node when some decision variables are integer.
+        """
+        if self.relaxation_input is None or self.result["status"] in (SimplexTerminationStatus.INFEASIBLE,
+                                                                      SimplexTerminationStatus.UNBOUNDED):
+            return
+        root = {
+            "status": self.result["status"],
+            "finalDecisionVariablesValues": self.result["finalDecisionVariablesValues"],
+            "finalObjectiveFunctionValue": self.result["finalObjectiveFunctionValue"],
+            "basisToken": self.result.get("basisToken"),
+            "steps": 0,
+        }
+        self.branch_and_bound = BranchAndBound(self.relaxation_input, self.integer, self.node_limit, self.time_limit,
+                                               self.cancelled)
+        incumbent = self.branch_and_bound.run(root)
+        self.result["branchAndBound"] = self.branch_and_bound.summary()
+        if incumbent is root:
+            return
+
+        if incumbent is None:
+            for key in ("finalDecisionVariablesValues", "finalObjectiveFunctionValue", "basisToken"):
+                self.result.pop(key, None)
+            self.result["status"] = SimplexTerminationStatus.LIMIT_REACHED if self.branch_and_bound.limit_reached \
+                               else SimplexTerminationStatus.INFEASIBLE
+            return
+        for key in ("finalDecisionVariablesValues", "finalObjectiveFunctionValue", "basisToken"):
+            self.result[key] = incumbent[key]
+        self.result["status"] = SimplexTerminationStatus.LIMIT_REACHED if self.branch_and_bound.limit_reached \
+                           else SimplexTerminationStatus.OPTIMAL
+
+
+    def __dual_start_applies(self) -> bool:
+        """
+        Returns true if the LP can start from the slack basis once its >= rows are negated into <= rows,
+        the dual simplex then replaces the artificial variables. Every constraint must be an inequality
+        and no column may improve the objective at the slack basis, as for minimizing non-negative costs.
+        Only used when the caller left the artificial solution method open.
+        """
+        if self.artificial_solution_method is not None:
+            return False
+        if self.aug_goals_coefficients_matrix or RelationOperator.EQU in self.constraints_relations:
+            return False
+
+        matrix = self.aug_constraints_coefficients_matrix
+        rhs = matrix[:, [-1]].toarray().ravel() if sparse.issparse(matrix) else list(matrix[:, -1])
+        if not any(relation == RelationOperator.GEQ and b > 0 or relation == RelationOperator.LEQ and b < 0
+                   for relation, b in zip(self.constraints_relations, rhs)):
+            # The slack basis is already feasible
+            return False
+
+        for restricted, c in zip(self.restricted, list(self.objective_function_coefficients_vector)):
+            improving = c > 0 if self.is_maximization else c < 0
+            if improving or not restricted and c != 0:
+                return False
+        return True
+
+
+    def __method_used(self) -> str | None:
+        """
+        How the initial basis was found: "dual" for the dual simplex from the slack basis, "M" or "TP" for the
+        artificial variables, "primal" if the slack basis was feasible.
+        """
+        if self.dual_start:
+            return "dual"
+        if not self.artificial_vars:
+            return "primal"
+        if self.artificial_solution_method == ArtificialSolutionMethod.TWO_PHASE:
+            return "TP"
+        # The numeric engines penalize the artificial variables when no method was chosen, the exact ones do not
+        if self.artificial_solution_method == ArtificialSolutionMethod.BIG_M or self.solve_mode != SolveMode.EXACT:
+            return "M"
+        return None
+
+
+    def __negate_geq_rows(self) -> None:
+        for i, relation in enumerate(self.constraints_relations):
+            if relation == RelationOperator.GEQ:
+                self.aug_constraints_coefficients_matrix[i, :] = -self.aug_constraints_coefficients_matrix[i, :]
+                self.constraints_relations[i] = RelationOperator.LEQ
 
 
     def __standardize_z_rows(self):
@@ -123,21 +388,25 @@ class SimplexSolver:
             intermediate_z[0][col_index] = -1
         intermediate_z = Matrix(intermediate_z)
 
-        simplex_engine = SimplexEngine(intermediate_z, [],
-                                       self.aug_constraints_coefficients_matrix,
-                                       self.vars,
-                                       self.basic_vars,
-                                       False,
-                                       self.steps,
-                                       [Symbol('r')],
-                                       [a[1] for a in self.artificial_vars])
+        simplex_engine = self.__create_engine(SimplexEngine, intermediate_z, [],
+                                              self.aug_constraints_coefficients_matrix,
+                                              self.vars,
+                                              self.basic_vars,
+                                              False,
+                                              self.steps,
+                                              [Symbol('r')],
+                                              [a[1] for a in self.artificial_vars])
         simplex_engine.reduce()
 
         if simplex_engine.termination_status != SimplexTerminationStatus.INFEASIBLE:
+            if self.steps:
+                self.steps.pop()
+                # The pivots driving out artificial variables continue the numbering of phase one
+                simplex_engine.step_cnt -= 1
+            simplex_engine.drive_out_artificial_vars()
             # Remove artificial columns (column drop)
-            self.aug_constraints_coefficients_matrix = simplex_engine.m
+            self.aug_constraints_coefficients_matrix = simplex_engine.m.to_matrix()
             self.basic_vars = simplex_engine.x_bv
-            self.steps.pop()
             for a in self.artificial_vars:
                 if a[1] in simplex_engine.x_bv: continue
                 col_index = self.vars.index(a[1])
@@ -148,8 +417,178 @@ class SimplexSolver:
         return simplex_engine
 
 
+    def __solve_numeric(self) -> None:
+        engine_type = RevisedSimplexEngine if self.solve_mode == SolveMode.REVISED else NumericSimplexEngine
+        if sparse.issparse(self.aug_constraints_coefficients_matrix):
+            m, z_rows = self.__standardize_sparse_coeff()
+        else:
+            self.__standardize_coeff()
+            self.__standardize_z_rows()
+            m = np.array(self.aug_constraints_coefficients_matrix.tolist(), dtype=np.float64)
+            z_rows = np.array(self.objective_function_coefficients_vector.subs({s: 1 for s in self.symbols_in_z_rows})
+                              .tolist(), dtype=np.float64)
+        self.vars_layout = [str(var) for var in self.vars]
+        if self.scaling_method != ScalingMethod.NONE:
+            m, z_rows = self.__scale(m, z_rows)
+        upper = self.__column_upper_bounds()
+        if self.warm_start is not None:
+            self.result["warmStarted"] = self.__warm_solve(engine_type, m, z_rows, upper)
+            if self.result["warmStarted"]:
+                return
+
+        artificial_vars = [a[1] for a in self.artificial_vars]
+        artificial_cols = [self.vars.index(a) for a in artificial_vars]
+        z_rows_offset = 0
+        at_upper = None
+
+        if artificial_vars and self.artificial_solution_method == ArtificialSolutionMethod.TWO_PHASE:
+            intermediate_z = np.zeros((1, m.shape[1]))
+            intermediate_z[0, artificial_cols] = -1
+            simplex_engine = self.__create_engine(engine_type, intermediate_z, m, self.vars, self.basic_vars, False,
+                                                  artificial_vars, pricing=self.pricing_rule, upper=upper)
+            simplex_engine.reduce()
+            if simplex_engine.termination_status == SimplexTerminationStatus.INFEASIBLE:
+                self.__build_numeric_result(simplex_engine, z_rows_offset)
+                return
+
+            # Phase two continues from the final basis of phase one without the non-basic artificial columns
+            dropped = [j for j in artificial_cols if self.vars[j] not in self.basic_vars]
+            kept = [j for j in range(m.shape[1]) if j not in dropped]
+            m = simplex_engine.m[:, kept]
+            z_rows = z_rows[:, kept]
+            self.vars = [self.vars[j] for j in kept[:-1]]
+            at_upper = simplex_engine.at_upper[kept[:-1]]
+            upper = upper[kept[:-1]] if upper is not None else np.full(len(kept) - 1, np.inf)
+            # Artificial variables left in the basis are at 0 and must stay there
+            upper[[self.vars.index(a) for a in artificial_vars if a in self.vars]] = 0
+        elif artificial_vars:
+            # Big-M as a leading priority row holding the coefficients of M
+            big_m_row = np.zeros((1, m.shape[1]))
+            big_m_row[0, artificial_cols] = 1 if self.is_maximization else -1
+            z_rows = np.vstack((big_m_row, z_rows))
+            z_rows_offset = 1
+
+        if self.aug_goals_coefficients_matrix and self.goal_method == GoalProgrammingMethod.SEQUENTIAL:
+            simplex_engine = self.__solve_goals_sequentially(engine_type, z_rows, m, artificial_vars, upper, at_upper)
+        else:
+            simplex_engine = self.__create_engine(engine_type, z_rows, m, self.vars, self.basic_vars, self.is_maximization,
+                                                  artificial_vars, pricing=self.pricing_rule, upper=upper, at_upper=at_upper)
+            simplex_engine.reduce()
+        self.__build_numeric_result(simplex_engine, z_rows_offset)
+
+
+    def __solve_goals_sequentially(self, engine_type: type[NumericSimplexEngine | RevisedSimplexEngine],
+                                   z_rows: np.ndarray, m: np.ndarray | SparseConstraintMatrix,
+                                   artificial_vars: list[Symbol], upper: np.ndarray | None,
+                                   at_upper: np.ndarray | None) -> NumericSimplexEngine | RevisedSimplexEngine:
+        """
+        Preemptive goal programming as a sequence of single z row LPs, from the highest priority level down.
+        Each level starts from the optimal basis of the previous one, the non-basic columns with a non-zero
+        reduced cost in the optimum of a level are fixed so the levels after it cannot change its deviations.
+        Returns an engine holding every z row in the final basis, it takes no pivots and reports the result.
+        """
+        fixed = np.zeros(m.shape[1] - 1, dtype=bool)
+        for level in range(z_rows.shape[0]):
+            simplex_engine = self.__create_engine(engine_type, z_rows[[level]], m, self.vars, self.basic_vars,
+                                                  self.is_maximization, artificial_vars, pricing=self.pricing_rule,
+                                                  upper=upper, at_upper=at_upper, fixed=fixed)
+            simplex_engine.reduce()
+            if simplex_engine.termination_status == SimplexTerminationStatus.INFEASIBLE:
+                return simplex_engine
+
+            nonbasic = np.ones_like(fixed)
+            nonbasic[simplex_engine.basis] = False
+            fixed = fixed | nonbasic & (np.abs(simplex_engine.reduced_costs(0)) > simplex_engine.tol)
+            # The dense engine hands over its tableau, the revised one keeps the original matrix
+            m, at_upper = simplex_engine.m, simplex_engine.at_upper
+
+        simplex_engine = self.__create_engine(engine_type, z_rows, m, self.vars, self.basic_vars, self.is_maximization,
+                                              artificial_vars, pricing=self.pricing_rule, upper=upper, at_upper=at_upper,
+                                              fixed=fixed)
+        simplex_engine.reduce()
+        return simplex_engine
+
+
+    def __scale(self, m: np.ndarray | SparseConstraintMatrix, z_rows: np.ndarray) -> tuple[np.ndarray | SparseConstraintMatrix,
+                                                                                         np.ndarray]:
+        structural_cols = len(self.restricted) + len(self.unrestricted_decision_vars)
+        scaling = Scaling(m.a if isinstance(m, SparseConstraintMatrix) else m[:, :structural_cols], self.scaling_method)
+        m, z_rows, col_scales = scaling.apply(m, z_rows)
+        self.col_scales = dict(zip(self.vars, col_scales))
+        self.result["scaling"] = scaling.summary()
+        return m, z_rows
+
+
+    def __value_of(self, simplex_engine: NumericSimplexEngine | RevisedSimplexEngine, var: Symbol) -> float:
+        return float(simplex_engine.value_of(var) * self.col_scales.get(var, 1.0))
+
+
+    def __warm_solve(self, engine_type: type[NumericSimplexEngine | RevisedSimplexEngine],
+                     m: np.ndarray | SparseConstraintMatrix, z_rows: np.ndarray, upper: np.ndarray | None) -> bool:
+        """
+        Solves starting from the final basis of an earlier solve of an LP with the same variables layout.
+        Changed costs keep the basis primal feasible and the primal simplex continues from it,
+        changed right hand sides keep it dual feasible and the dual simplex restores feasibility.
+        Returns false without solving when the basis does not fit the LP or is neither.
+        """
+        layout, basis = decode_basis_token(self.warm_start)
+        artificial = {str(a[1]) for a in self.artificial_vars}
+        if layout != self.vars_layout or len(basis) != m.shape[0] or artificial & set(basis):
+            return False
+
+        # Artificial variables are all non-basic, their columns are dropped as in phase two
+        kept = [j for j, var in enumerate(self.vars) if str(var) not in artificial] + [m.shape[1] - 1]
+        x = [self.vars[j] for j in kept[:-1]]
+        by_name = {str(var): var for var in x}
+        try:
+            simplex_engine = self.__create_engine(engine_type, z_rows[:, kept], m[:, kept], x,
+                                                  [by_name[name] for name in basis], self.is_maximization,
+                                                  pricing=self.pricing_rule,
+                                                  upper=upper[kept[:-1]] if upper is not None else None)
+        except (KeyError, np.linalg.LinAlgError, RuntimeError):
+            # Unknown or repeated basic variables leave a singular basis
+            return False
+        if not simplex_engine.primal_feasible():
+            simplex_engine.place_at_dual_bounds()
+            if not simplex_engine.dual_feasible():
+                return False
+
+        simplex_engine.reduce()
+        self.vars = x
+        self.__build_numeric_result(simplex_engine, 0)
+        return True
+
+
+    def __build_numeric_result(self, simplex_engine: NumericSimplexEngine | RevisedSimplexEngine,
+                               z_rows_offset: int) -> None:
+        self.result["steps"] = self.steps
+        self.result["status"] = simplex_engine.termination_status
+        if simplex_engine.termination_status == SimplexTerminationStatus.INFEASIBLE:
+            return
+
+        self.result["basisToken"] = encode_basis_token(self.vars_layout, [str(var) for var in simplex_engine.x_bv])
+
+        sol_list = [0.0 for _ in self.restricted]
+        for rv_index, rv_symbol in self.restricted_decision_vars:
+            sol_list[rv_index] = self.__value_of(simplex_engine, rv_symbol)
+        for urv_index, urv_pos_symbol, urv_neg_symbol in self.unrestricted_decision_vars:
+            sol_list[urv_index] = self.__value_of(simplex_engine, urv_pos_symbol) \
+                                - self.__value_of(simplex_engine, urv_neg_symbol)
+        self.result["finalDecisionVariablesValues"] = sol_list
+
+        if self.aug_goals_coefficients_matrix:
+            satisfied = [simplex_engine.is_satisfied(i + z_rows_offset) for i in range(len(self.z_rows_symbols))]
+            self.result["goalsSatisfied"] = [g for g, ok in zip(self.z_rows_symbols, satisfied) if ok]
+            self.result["goalsUnsatisfied"] = [g for g, ok in zip(self.z_rows_symbols, satisfied) if not ok]
+        else:
+            self.result["finalObjectiveFunctionValue"] = simplex_engine.objective_value()
+
+
     def __standardize_coeff(self):
-        self.__make_rhs_positive()
+        if self.dual_start:
+            self.__negate_geq_rows()
+        else:
+            self.__make_rhs_positive()
 
         # Create decision variables, add them to vars list and
         # insert new columns for unrestricted variables
@@ -192,6 +631,92 @@ class SimplexSolver:
                         + [bcv[1] for bcv in basic_constraints_vars]
 
 
+    def __standardize_sparse_coeff(self) -> tuple[SparseConstraintMatrix, np.ndarray]:
+        """
+        Sparse counterpart of __standardize_coeff and __standardize_z_rows producing the same variables layout.
+        Slack, excess, deviation and artificial columns are not materialized, only their row and sign are kept.
+        """
+        constraints = self.__negate_sparse_geq_rows(self.aug_constraints_coefficients_matrix,
+                                                    self.constraints_relations) if self.dual_start \
+                 else self.__make_sparse_rhs_positive(self.aug_constraints_coefficients_matrix,
+                                                      self.constraints_relations)
+        goals = self.__make_sparse_rhs_positive(np.array(self.aug_goals_coefficients_matrix.tolist(), dtype=np.float64),
+                                                self.goals_relations) if self.aug_goals_coefficients_matrix else None
+        goal_rows = goals.shape[0] if goals is not None else 0
+
+        # Decision variables columns, unrestricted variables take a negated copy of their column
+        source_cols: list[int] = []
+        col_signs: list[int] = []
+        for i in range(len(self.restricted)):
+            n = self.decision_var_indices[i] + 1
+            if self.restricted[i]:
+                self.vars.append(Symbol(f"x_{n}"))
+                self.restricted_decision_vars.append((i, Symbol(f"x_{n}")))
+                source_cols.append(i)
+                col_signs.append(1)
+            else:
+                self.vars.append(Symbol(f"x_{n}^+"))
+                self.vars.append(Symbol(f"x_{n}^-"))
+                self.unrestricted_decision_vars.append((i, Symbol(f"x_{n}^+"), Symbol(f"x_{n}^-")))
+                source_cols += [i, i]
+                col_signs += [1, -1]
+        signs = sparse.diags(np.array(col_signs, dtype=np.float64))
+
+        excess_vars, self.artificial_vars, slack_vars = self.__create_constraints_vars()
+        self.penalized_vars, self.slack_deviation_vars, self.excess_deviation_vars = self.__create_deviation_vars()
+        basic_constraints_vars = slack_vars + self.artificial_vars
+        basic_constraints_vars.sort(key=lambda v: v[0])
+
+        # Goal rows are stacked above the constraint rows
+        logical = [(goal_rows + e[0], -1) for e in excess_vars]                    \
+                + [(edv[0], -1) for edv in self.excess_deviation_vars]             \
+                + [(sdv[0], 1) for sdv in self.slack_deviation_vars]               \
+                + [(goal_rows + bcv[0], 1) for bcv in basic_constraints_vars]
+
+        self.vars += [e[1] for e in excess_vars]                     \
+                  + [edv[1] for edv in self.excess_deviation_vars]   \
+                  + [sdv[1] for sdv in self.slack_deviation_vars]    \
+                  + [bcv[1] for bcv in basic_constraints_vars]
+        self.basic_vars += [sdv[1] for sdv in self.slack_deviation_vars] \
+                        + [bcv[1] for bcv in basic_constraints_vars]
+
+        blocks = [goals, constraints] if goals is not None else [constraints]
+        a = sparse.vstack([block[:, source_cols] @ signs for block in blocks], format='csc')
+        rhs = np.concatenate([block[:, [-1]].toarray().ravel() for block in blocks])
+        m = SparseConstraintMatrix(a, [r for r, _ in logical], [sign for _, sign in logical], rhs)
+
+        z_rows = np.zeros((max(goal_rows, 1), m.shape[1]))
+        if goals is not None:
+            self.z_rows_symbols = [Symbol(f'G_{i}') for i in range(1, goal_rows + 1)]
+            self.is_maximization = False
+            for p in self.penalized_vars:
+                z_rows[p[0], self.vars.index(p[2])] = -1
+        else:
+            self.z_rows_symbols = [Symbol('z')]
+            objective = np.array(self.objective_function_coefficients_vector.tolist(), dtype=np.float64).ravel()
+            z_rows[0, :len(source_cols)] = -objective[source_cols] * col_signs
+
+        return m, z_rows
+
+
+    @staticmethod
+    def __make_sparse_rhs_positive(matrix: np.ndarray | sparse.spmatrix,
+                                   relations: list[RelationOperator]) -> sparse.csr_matrix:
+        matrix = sparse.csr_matrix(matrix, dtype=np.float64)
+        negative = matrix[:, [-1]].toarray().ravel() < 0
+        for i in np.flatnonzero(negative):
+            relations[i] = relations[i].negate()
+        return sparse.diags(np.where(negative, -1.0, 1.0)) @ matrix
+
+
+    @staticmethod
+    def __negate_sparse_geq_rows(matrix: sparse.spmatrix, relations: list[RelationOperator]) -> sparse.csr_matrix:
+        geq = np.array([relation == RelationOperator.GEQ for relation in relations])
+        for i in np.flatnonzero(geq):
+            relations[i] = RelationOperator.LEQ
+        return sparse.diags(np.where(geq, -1.0, 1.0)) @ sparse.csr_matrix(matrix, dtype=np.float64)
+
+
     def __make_rhs_positive(self):
         matrices = [
             (self.aug_constraints_coefficients_matrix, self.constraints_relations),
@@ -199,8 +724,8 @@ class SimplexSolver:
         if self.aug_goals_coefficients_matrix:
             matrices.append((self.aug_goals_coefficients_matrix, self.goals_relations))
 
-        for i in range(self.aug_constraints_coefficients_matrix.rows):
-            for matrix, relations in matrices:
+        for matrix, relations in matrices:
+            for i in range(matrix.rows):
                 if matrix[i, -1] < 0:
                     matrix[i, :] = -matrix[i, :]
                     relations[i] = relations[i].negate()
@@ -209,12 +734,13 @@ class SimplexSolver:
     def __init_decision_vars(self) -> None:
         num_inserted_cols = 0
         for i in range(len(self.restricted)):
+            n = self.decision_var_indices[i] + 1
             if not self.restricted[i]:
                 negated_col = -self.aug_constraints_coefficients_matrix[:, i + num_inserted_cols]
                 self.aug_constraints_coefficients_matrix = self.aug_constraints_coefficients_matrix.col_insert(i + num_inserted_cols + 1, negated_col)
-                self.vars.append(Symbol(f"x_{i + 1}^+"))
-                self.vars.append(Symbol(f"x_{i + 1}^-"))
-                self.unrestricted_decision_vars.append((i , Symbol(f"x_{i + 1}^+"), Symbol(f"x_{i + 1}^-")))
+                self.vars.append(Symbol(f"x_{n}^+"))
+                self.vars.append(Symbol(f"x_{n}^-"))
+                self.unrestricted_decision_vars.append((i , Symbol(f"x_{n}^+"), Symbol(f"x_{n}^-")))
                 if self.aug_goals_coefficients_matrix:
                     negated_col = -self.aug_goals_coefficients_matrix[:, i + num_inserted_cols]
                     self.aug_goals_coefficients_matrix = self.aug_goals_coefficients_matrix.col_insert(i + num_inserted_cols + 1, negated_col)
@@ -223,8 +749,8 @@ class SimplexSolver:
                     self.objective_function_coefficients_vector = self.objective_function_coefficients_vector.col_insert(i + num_inserted_cols + 1, negated_col)
                 num_inserted_cols += 1
             else:
-                self.vars.append(Symbol(f"x_{i + 1}"))
-                self.restricted_decision_vars.append((i, Symbol( f"x_{i + 1}")))
+                self.vars.append(Symbol(f"x_{n}"))
+                self.restricted_decision_vars.append((i, Symbol( f"x_{n}")))
 
 
     def __create_constraints_vars(self) -> tuple[list[tuple[int, Symbol]],
@@ -234,14 +760,15 @@ class SimplexSolver:
         artificial_vars : list[tuple[int, Symbol]] = []
         slack_vars : list[tuple[int, Symbol]] = []
         for idx, relation in enumerate(self.constraints_relations):
+            n = self.constraint_indices[idx] + 1
             match relation:
                 case RelationOperator.GEQ:
-                    excess_vars.append((idx, Symbol(f"e_{idx + 1}")))
-                    artificial_vars.append((idx, Symbol(f"a_{idx + 1}")))
+                    excess_vars.append((idx, Symbol(f"e_{n}")))
+                    artificial_vars.append((idx, Symbol(f"a_{n}")))
                 case RelationOperator.EQU:
-                    artificial_vars.append((idx, Symbol(f"a_{idx + 1}")))
+                    artificial_vars.append((idx, Symbol(f"a_{n}")))
                 case RelationOperator.LEQ:
-                    slack_vars.append((idx, Symbol(f"s_{idx + 1}")))
+                    slack_vars.append((idx, Symbol(f"s_{n}")))
         return excess_vars, artificial_vars, slack_vars
 
 
@@ -324,7 +851,7 @@ class SimplexSolver:
 
     def __build__final_obj_func_val(self, simplex_engine: SimplexEngine):
         se_cols = simplex_engine.m.cols
-        self.result["finalObjectiveFunctionValue"] = simplex_engine.z_rows[0, se_cols - 1]
+        self.result["finalObjectiveFunctionValue"] = simplex_engine.z_rows.symbolic(0, se_cols - 1)
 
 
     def __build__final_deci_vars_vals(self, simplex_engine: SimplexEngine):
@@ -334,23 +861,31 @@ class SimplexSolver:
         for rv_index, rv_symbol in self.restricted_decision_vars:
             if rv_symbol in self.basic_vars:
                 row_index = simplex_engine.x_bv.index(rv_symbol)
-                sol_list[rv_index] = simplex_engine.m[row_index, se_cols - 1]
+                sol_list[rv_index] = simplex_engine.m.symbolic(row_index, se_cols - 1)
 
         for urv_index, urv_pos_symbol, urv_neg_symbol in self.unrestricted_decision_vars:
             if urv_pos_symbol in simplex_engine.x_bv:
                 row_index = simplex_engine.x_bv.index(urv_pos_symbol)
-                sol_list[urv_index] = simplex_engine.m[row_index, se_cols - 1]
+                sol_list[urv_index] = simplex_engine.m.symbolic(row_index, se_cols - 1)
             elif urv_neg_symbol in simplex_engine.x_bv:
                 row_index = simplex_engine.x_bv.index(urv_neg_symbol)
-                sol_list[urv_index] = -simplex_engine.m[row_index, se_cols - 1]
+                sol_list[urv_index] = -simplex_engine.m.symbolic(row_index, se_cols - 1)
 
         self.result["finalDecisionVariablesValues"] = sol_list
 
 
     def __build_final_comment(self):
         comment = f"Status: {self.result["status"].value}\n"
-
-        if self.result["status"] != SimplexTerminationStatus.INFEASIBLE:
+        if self.result.get("presolve"):
+            comment += f"Presolve removed {self.result["presolve"]["rowsRemoved"]} rows and " \
+                       f"{self.result["presolve"]["columnsRemoved"]} columns\n"
+        if self.dual_start:
+            comment += CommentGenerator.dual_start() + "\n"
+        if self.result.get("branchAndBound"):
+            comment += f"Branch and bound explored {self.result["branchAndBound"]["nodes"]} nodes" \
+                     + (", stopped at the limit" if self.result["branchAndBound"]["limitReached"] else "") + "\n"
+
+        if self.result["status"] != SimplexTerminationStatus.INFEASIBLE and "finalDecisionVariablesValues" in self.result:
             if self.aug_goals_coefficients_matrix:
                 if self.result["goalsSatisfied"]:
                     comment += "Goals satisfied: " + ", ".join(
@@ -364,7 +899,8 @@ class SimplexSolver:
             comment += "At (" + ", ".join([f"$x_{i}$" for i in range(1, len(self.restricted) + 1)]) + ") $=$ (" \
                 + ", ".join(map(lambda s: f"${latex(s)}$", self.result["finalDecisionVariablesValues"])) + ")"
 
-        self.result["steps"][-1]["comment"] = comment
+        if self.steps:
+            self.steps.update(-1, comment=comment)
 
 
     @staticmethod
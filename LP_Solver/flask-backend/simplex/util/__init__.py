@@ -1 +1,5 @@
-from .compare import *
\ No newline at end of file
+from .compare import *
+from .latex_cache import cached_latex, latex_cache_info, clear_latex_cache
+from .basis_token import encode_basis_token, decode_basis_token
+from .exact import to_exact, exact_matrix
+from .process_pool import ProcessPool
@@ -0,0 +1,21 @@
+import base64
+import json
+
+
+def encode_basis_token(layout: list[str], basis: list[str]) -> str:
+    """
+    Packs the variables layout of a standardized LP and its final basic variables into an opaque string.
+    """
+    payload = json.dumps({"layout": layout, "basis": basis}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_basis_token(token: str) -> tuple[list[str], list[str]]:
+    """
+    Returns the variables layout and the basic variables packed in a token, raises ValueError on a malformed token.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token.encode()))
+        return list(map(str, payload["layout"])), list(map(str, payload["basis"]))
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError("Malformed basis token.") from e
@@ -4,6 +4,10 @@ from functools import cmp_to_key
 def compare_expressions(expr1: str | int | float | Expr,
                         expr2: str | int | float | Expr,
                         symbol: Symbol) -> int:
+    if not isinstance(expr1, (Expr, str)) and not isinstance(expr2, (Expr, str)):
+        # Native numbers, including the BigMNumber cells of penalty z rows, order themselves
+        return (expr1 > expr2) - (expr1 < expr2)
+
     expr1: Expr = sympify(expr1)
     expr2: Expr = sympify(expr2)
 
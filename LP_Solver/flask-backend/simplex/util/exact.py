@@ -0,0 +1,37 @@
+from fractions import Fraction
+from sympy import Integer, Matrix, Rational, nsimplify
+
+# Any decimal literal with at most this many significant digits survives the round trip through a double,
+# so the shortest repr of the parsed float gives back the literal as it was written
+EXACT_DIGITS = 15
+
+
+def _significant_digits(literal: str) -> int:
+    mantissa = literal.lstrip('-').split('e')[0].replace('.', '')
+    return len(mantissa.strip('0'))
+
+
+def to_exact(value):
+    """
+    Converts a JSON number into an exact SymPy number.
+    Integers are mapped directly and decimal literals exactly through Fraction of their shortest repr,
+    values at full double precision (results such as 1/3 or 0.1 + 0.2) and non-finite values fall back to nsimplify.
+    """
+    if isinstance(value, int):
+        return Integer(value)
+    # float() also unwraps NumPy scalars, whose repr is not a plain literal
+    value = float(value)
+    if value.is_integer():
+        return Integer(int(value))
+    literal = repr(value)
+    if _significant_digits(literal) > EXACT_DIGITS:
+        return nsimplify(value)
+    try:
+        fraction = Fraction(literal)
+    except ValueError:
+        return nsimplify(value)
+    return Rational(fraction.numerator, fraction.denominator)
+
+
+def exact_matrix(rows: list[list]) -> Matrix:
+    return Matrix([[to_exact(val) for val in row] for row in rows])
@@ -0,0 +1,31 @@
+from functools import lru_cache
+from sympy import latex
+
+LATEX_CACHE_SIZE = 1 << 16
+
+
+@lru_cache(maxsize=LATEX_CACHE_SIZE, typed=True)
+def _cached_latex(expr) -> str:
+    return latex(expr)
+
+
+def cached_latex(expr) -> str:
+    """
+    sympy.latex with a process wide LRU cache keyed by the expression.
+    Tableau snapshots repeat the same cells (0, 1, ...) and symbols in almost every step, so most lookups hit.
+    The cache is typed, values that compare equal across types (1, 1.0, Integer(1)) are rendered separately.
+    """
+    try:
+        return _cached_latex(expr)
+    except TypeError:
+        # Unhashable values such as matrices are rendered uncached
+        return latex(expr)
+
+
+def latex_cache_info() -> dict:
+    info = _cached_latex.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "maxSize": info.maxsize}
+
+
+def clear_latex_cache() -> None:
+    _cached_latex.cache_clear()
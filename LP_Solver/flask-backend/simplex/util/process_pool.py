@@ -0,0 +1,58 @@
+import atexit
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable
+
+
+class ProcessPool:
+    """
+    Spawn process pool started on the first submit and shared by the requests of the server.
+    A worker dying, e.g. out of memory, breaks its executor for good: the futures still running on it fail,
+    the executor is shut down and the next submit starts a new one.
+    """
+    def __init__(self, workers: int, initializer: Callable[[], None] | None = None) -> None:
+        self.workers = workers
+        self.initializer = initializer
+        self.__executor: ProcessPoolExecutor | None = None
+        self.__broken: ProcessPoolExecutor | None = None
+        self.__lock = threading.Lock()
+        atexit.register(self.shutdown)
+
+
+    def submit(self, fn: Callable, *args) -> Future:
+        with self.__lock:
+            if self.__executor is None or self.__executor is self.__broken:
+                self.__replace()
+            try:
+                future = self.__executor.submit(fn, *args)
+            except BrokenProcessPool:
+                self.__replace()
+                future = self.__executor.submit(fn, *args)
+            executor = self.__executor
+        # The executor may only notice a dead worker after this submit, its futures then fail with BrokenProcessPool
+        future.add_done_callback(lambda done: self.__check_broken(done, executor))
+        return future
+
+
+    def shutdown(self) -> None:
+        with self.__lock:
+            if self.__executor is not None:
+                self.__executor.shutdown(cancel_futures=True)
+                self.__executor = None
+
+
+    def __replace(self) -> None:
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=False, cancel_futures=True)
+        # Spawned workers do not inherit the threads of the web server
+        self.__executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"),
+                                              initializer=self.initializer)
+        self.__broken = None
+
+
+    def __check_broken(self, future: Future, executor: ProcessPoolExecutor) -> None:
+        # Runs on the thread completing the future, the executor is only marked and replaced by the next submit
+        if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+            self.__broken = executor
@@ -0,0 +1,55 @@
+import json
+import threading
+from queue import Queue, Full
+from typing import Iterator
+from data_mapper import Marshaller
+from simplex.classes import SolveCancelled
+from simplex.solver import SimplexSolver
+
+# Rendered lines waiting for the client, a slow client pauses the solver instead of growing the buffer
+STREAM_BUFFER_SIZE = 64
+
+
+def stream_solve(simplex_input: dict) -> Iterator[str]:
+    """
+    Solves on a worker thread and yields the result as newline-delimited JSON:
+    one {"type": "step", ...} line per step as soon as the engine records it,
+    then a {"type": "result", ...} line, or a {"type": "error", ...} line if the solve failed.
+    """
+    lines: Queue = Queue(maxsize=STREAM_BUFFER_SIZE)
+    cancelled = threading.Event()
+
+    def put(line: str | None) -> None:
+        while not cancelled.is_set():
+            try:
+                lines.put(line, timeout=0.5)
+                return
+            except Full:
+                continue
+        raise SolveCancelled()
+
+    def emit_step(step: dict) -> None:
+        put(json.dumps({"type": "step", **Marshaller.convert_step(step)}) + "\n")
+
+    def run() -> None:
+        try:
+            simplex_solver = SimplexSolver(**simplex_input, step_sink=emit_step, cancelled=cancelled)
+            simplex_solver.solve()
+            put(json.dumps({"type": "result", **Marshaller.convert_summary(simplex_solver.result)}) + "\n")
+            put(None)
+        except SolveCancelled:
+            pass
+        except Exception as e:
+            try:
+                put(json.dumps({"type": "error", "error": str(e)}) + "\n")
+                put(None)
+            except SolveCancelled:
+                pass
+
+    threading.Thread(target=run, daemon=True).start()
+    try:
+        while (line := lines.get()) is not None:
+            yield line
+    finally:
+        # The client went away or the stream ended, either way the worker must not block on a full buffer
+        cancelled.set()
@@ -0,0 +1,173 @@
+import json
+import random
+import time
+import pytest
+import app as server
+import batch
+import streaming
+from jobs import JobStore
+from result_cache import ResultCache
+
+LP = {
+    "objectiveFunctionCoefficientsVector": [[3, 5]],
+    "constraintsCoefficientsMatrix": [[1, 0, 4], [0, 2, 12], [3, 2, 18]],
+    "constraintsRelations": ["<=", "<=", "<="],
+    "restricted": [True, True],
+    "isMaximization": True,
+}
+KNAPSACK = {
+    "objectiveFunctionCoefficientsVector": [[92, 57, 49, 68, 60, 43, 67, 84, 87, 72]],
+    "constraintsCoefficientsMatrix": [[23, 31, 29, 44, 53, 38, 63, 85, 89, 82, 165]],
+    "constraintsRelations": ["<="],
+    "restricted": [True] * 10,
+    "isMaximization": True,
+    "upperBounds": [1] * 10,
+    "integer": [True] * 10,
+    "mode": "numeric",
+}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(server, "result_cache", ResultCache(directory=None))
+    return server.app.test_client()
+
+
+def test_solve_caches_results(client):
+    first = client.post('/solve', json=LP)
+    second = client.post('/solve', json=LP)
+    assert first.status_code == second.status_code == 200
+    assert first.get_data() == second.get_data()
+    assert server.result_cache.info()["hits"] == 1
+
+
+def test_solve_does_not_cache_searches_stopped_at_a_limit(client):
+    response = client.post('/solve', json=dict(KNAPSACK, nodeLimit=1))
+    assert response.status_code == 200
+    assert response.get_json()["branchAndBound"]["limitReached"]
+    assert server.result_cache.info()["entries"] == 0
+
+    response = client.post('/solve', json=KNAPSACK)
+    assert response.get_json()["finalObjectiveFunctionValue"] == pytest.approx(309)
+    assert server.result_cache.info()["entries"] == 1
+
+
+def test_stream_rejects_malformed_input(client):
+    ragged = dict(LP, constraintsCoefficientsMatrix=[[1, 0, 4], [0, 2], [3, 2, 18]])
+    assert client.post('/solve/stream', json=ragged).status_code == 400
+    assert client.post('/solve/stream', json=dict(LP, constraintsRelations=["<=", "<="])).status_code == 400
+    assert client.post('/solve/stream', json=dict(LP, objectiveFunctionCoefficientsVector=[[3]])).status_code == 400
+    sparse_lp = dict(LP, constraintsCoefficientsMatrix=None,
+                     constraintsCoefficientsSparse={"shape": [3, 3], "rows": [0, 5], "indices": [0, 2], "data": [1, 4]})
+    assert client.post('/solve/stream', json=sparse_lp).status_code == 400
+
+
+def test_jobs_rejects_malformed_input(client):
+    ragged = dict(LP, constraintsCoefficientsMatrix=[[1, 0, 4], [0, 2], [3, 2, 18]])
+    response = client.post('/jobs', json=ragged)
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "Invalid input"
+    assert client.post('/jobs', json=dict(LP, restricted=[True])).status_code == 400
+
+
+@pytest.fixture
+def batch_pool(monkeypatch):
+    monkeypatch.setattr(batch, "_pool", batch.ProcessPool(2, initializer=batch._warm_worker))
+    yield
+    batch._pool.shutdown()
+
+
+def test_batch_solves_every_instance(client, batch_pool):
+    infeasible = dict(LP, constraintsCoefficientsMatrix=[[1, 0, -1], [0, 2, 12], [3, 2, 18]])
+    response = client.post('/solve/batch', json=[LP, infeasible, dict(LP, restricted=[True])])
+    assert response.status_code == 200
+    results = response.get_json()
+    assert results[0]["finalObjectiveFunctionValue"] == "36"
+    assert results[1]["status"] == "Infeasible"
+    assert "error" in results[2]
+
+
+def test_batch_rejects_a_body_that_is_not_a_list(client):
+    assert client.post('/solve/batch', json=LP).status_code == 400
+    assert client.post('/solve/batch', json=[LP, 1]).status_code == 400
+    assert client.post('/solve/batch', data="[]").status_code == 400
+
+
+def slow_lp(size: int = 30) -> dict:
+    # Takes a few hundred exact steps, long enough to cancel it while it runs
+    rng = random.Random(0)
+    return {
+        "objectiveFunctionCoefficientsVector": [[rng.randint(1, 20) for _ in range(size)]],
+        "constraintsCoefficientsMatrix": [[rng.randint(0, 9) for _ in range(size)] + [rng.randint(50, 200)]
+                                          for _ in range(size)],
+        "constraintsRelations": ["<="] * size,
+        "restricted": [True] * size,
+        "isMaximization": True,
+    }
+
+
+@pytest.fixture
+def jobs(monkeypatch):
+    monkeypatch.setattr(server, "job_store", JobStore(workers=1))
+
+
+def wait_for_job(client, job_id: str, timeout: float = 30.0) -> dict:
+    started = time.monotonic()
+    while time.monotonic() - started < timeout:
+        job = client.get(f'/jobs/{job_id}').get_json()
+        if job["status"] not in ("queued", "running"):
+            return job
+        time.sleep(0.05)
+    raise TimeoutError(job_id)
+
+
+def test_job_is_polled_until_it_succeeds(client, jobs):
+    response = client.post('/jobs', json=LP)
+    assert response.status_code == 202
+    job = wait_for_job(client, response.get_json()["jobId"])
+    assert job["status"] == "succeeded"
+    assert job["result"] == client.post('/solve', json=LP).get_json()
+    assert job["progress"]["steps"] > 0
+
+
+def test_jobs_are_cancelled_queued_and_running(client, jobs):
+    running = client.post('/jobs', json=slow_lp()).get_json()["jobId"]
+    queued = client.post('/jobs', json=LP).get_json()["jobId"]
+    # The single worker is busy, the second job never starts
+    response = client.delete(f'/jobs/{queued}')
+    assert response.status_code == 200
+    assert response.get_json()["status"] == "cancelled"
+
+    while client.get(f'/jobs/{running}').get_json()["status"] == "queued":
+        time.sleep(0.01)
+    client.delete(f'/jobs/{running}')
+    job = wait_for_job(client, running)
+    assert job["status"] == "cancelled"
+    assert "result" not in job
+
+
+def test_unknown_job_is_not_found(client, jobs):
+    assert client.get('/jobs/unknown').status_code == 404
+    assert client.delete('/jobs/unknown').status_code == 404
+
+
+def stream_lines(response) -> list[dict]:
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+def test_stream_sends_the_steps_then_the_result(client):
+    lines = stream_lines(client.post('/solve/stream', json=LP))
+    output = client.post('/solve', json=LP).get_json()
+    assert [line.pop("type") for line in lines] == ["step"] * len(output["steps"]) + ["result"]
+    assert lines[:-1] == output.pop("steps")
+    assert lines[-1] == output
+
+
+def test_stream_ends_with_an_error_line(client, monkeypatch):
+    def failing_solver(**simplex_input):
+        raise RuntimeError("solver failed")
+
+    monkeypatch.setattr(streaming, "SimplexSolver", failing_solver)
+    assert stream_lines(client.post('/solve/stream', json=LP)) == [{"type": "error", "error": "solver failed"}]
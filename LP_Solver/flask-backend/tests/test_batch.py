@@ -0,0 +1,37 @@
+import os
+import pytest
+from concurrent.futures.process import BrokenProcessPool
+import batch
+
+INSTANCE = {
+    "objectiveFunctionCoefficientsVector": [[3, 5]],
+    "constraintsCoefficientsMatrix": [[1, 0, 4], [0, 2, 12], [3, 2, 18]],
+    "constraintsRelations": ["<=", "<=", "<="],
+    "restricted": [True, True],
+    "isMaximization": True,
+}
+
+
+@pytest.fixture(autouse=True)
+def small_pool(monkeypatch):
+    monkeypatch.setattr(batch, "_pool", batch.ProcessPool(2, initializer=batch._warm_worker))
+    yield
+    batch._pool.shutdown()
+
+
+def test_batch_keeps_the_order_of_its_instances():
+    infeasible = dict(INSTANCE, constraintsCoefficientsMatrix=[[1, 0, -1], [0, 2, 12], [3, 2, 18]])
+    results = batch.solve_batch([INSTANCE, infeasible, {"restricted": "no"}])
+    assert results[0]["finalObjectiveFunctionValue"] == "36"
+    assert results[1]["status"] == "Infeasible"
+    assert "error" in results[2]
+
+
+def test_batch_recovers_from_a_dead_worker():
+    assert batch.solve_batch([INSTANCE])[0]["status"] == "Optimal"
+    with pytest.raises(BrokenProcessPool):
+        # Kills the worker running it, as an out of memory kill would
+        batch._pool.submit(os._exit, 1).result()
+
+    results = batch.solve_batch([INSTANCE, INSTANCE])
+    assert [result["finalObjectiveFunctionValue"] for result in results] == ["36", "36"]
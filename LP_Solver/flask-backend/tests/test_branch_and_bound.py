@@ -0,0 +1,123 @@
+import os
+import random
+import numpy as np
+import pytest
+from concurrent.futures.process import BrokenProcessPool
+from scipy.optimize import Bounds, LinearConstraint, milp
+from data_mapper import Marshaller
+from simplex import branch_and_bound
+from simplex.classes import SimplexTerminationStatus
+from simplex.solver import SimplexSolver
+from simplex.util import ProcessPool
+
+WEIGHTS = [23, 31, 29, 44, 53, 38, 63, 85, 89, 82]
+VALUES = [92, 57, 49, 68, 60, 43, 67, 84, 87, 72]
+KNAPSACK = {
+    "objectiveFunctionCoefficientsVector": [VALUES],
+    "constraintsCoefficientsMatrix": [WEIGHTS + [165]],
+    "constraintsRelations": ["<="],
+    "restricted": [True] * 10,
+    "isMaximization": True,
+    "upperBounds": [1] * 10,
+    "integer": [True] * 10,
+}
+
+
+def solve(data: dict) -> dict:
+    simplex_solver = SimplexSolver(**Marshaller.convert_input_data(data))
+    simplex_solver.solve()
+    return simplex_solver.result
+
+
+@pytest.fixture
+def node_pool(monkeypatch):
+    monkeypatch.setattr(branch_and_bound, "BRANCH_AND_BOUND_WORKERS", 2)
+    monkeypatch.setattr(branch_and_bound, "_pool", ProcessPool(2))
+    yield branch_and_bound._pool
+    branch_and_bound._pool.shutdown()
+
+
+def test_node_pool_recovers_from_a_dead_worker(node_pool):
+    assert solve(dict(KNAPSACK, mode="numeric"))["finalObjectiveFunctionValue"] == pytest.approx(309)
+    with pytest.raises(BrokenProcessPool):
+        node_pool.submit(os._exit, 1).result()
+    assert solve(dict(KNAPSACK, mode="numeric"))["finalObjectiveFunctionValue"] == pytest.approx(309)
+
+
+def random_mip(seed: int) -> dict:
+    """
+    A small MIP with a mix of relations, bounds and some free variables, most variables integer.
+    """
+    rng = random.Random(seed)
+    rows, cols = rng.randint(1, 4), rng.randint(2, 6)
+    restricted = [rng.random() < 0.85 for _ in range(cols)]
+    return {
+        "objectiveFunctionCoefficientsVector": [[rng.randint(-3, 12) for _ in range(cols)]],
+        "constraintsCoefficientsMatrix": [[rng.randint(-2, 9) for _ in range(cols)] + [rng.randint(3, 40)]
+                                          for _ in range(rows)],
+        "constraintsRelations": [rng.choice(["<=", "<=", ">=", "="]) for _ in range(rows)],
+        "restricted": restricted,
+        "isMaximization": rng.random() < 0.6,
+        "upperBounds": [rng.choice([None, 4, 7.5, 10]) for _ in range(cols)],
+        "lowerBounds": [None if r else -5 for r in restricted],
+        "integer": [rng.random() < 0.7 for _ in range(cols)],
+    }
+
+
+def milp_reference(data: dict):
+    """
+    Returns the status of milp, 0 optimal, 2 infeasible, 3 unbounded, 4 infeasible or unbounded,
+    and the optimal objective value.
+    """
+    constraints = [LinearConstraint([row[:-1]], -np.inf if relation == "<=" else row[-1],
+                                    np.inf if relation == ">=" else row[-1])
+                   for row, relation in zip(data["constraintsCoefficientsMatrix"], data["constraintsRelations"])]
+    lower = [0 if restricted else lower for restricted, lower in zip(data["restricted"], data["lowerBounds"])]
+    upper = [np.inf if upper is None else upper for upper in data["upperBounds"]]
+    costs = data["objectiveFunctionCoefficientsVector"][0]
+    result = milp([-c for c in costs] if data["isMaximization"] else costs, constraints=constraints,
+                  integrality=[int(integer) for integer in data["integer"]], bounds=Bounds(lower, upper))
+    return result.status, -result.fun if data["isMaximization"] and result.status == 0 else result.fun
+
+
+def check_against_milp(data: dict) -> None:
+    status, objective = milp_reference(data)
+    result = solve(data)
+    if status == 2:
+        assert result["status"] == SimplexTerminationStatus.INFEASIBLE
+    elif status == 3:
+        assert result["status"] == SimplexTerminationStatus.UNBOUNDED
+    elif status == 4:
+        # HiGHS stops its presolve without telling the two apart
+        assert result["status"] in (SimplexTerminationStatus.INFEASIBLE, SimplexTerminationStatus.UNBOUNDED)
+    else:
+        assert status == 0
+        assert not result["branchAndBound"]["limitReached"]
+        assert float(result["finalObjectiveFunctionValue"]) == pytest.approx(objective, abs=1e-6)
+        values = [float(value) for value in result["finalDecisionVariablesValues"]]
+        assert all(abs(value - round(value)) < 1e-6 for value, integer in zip(values, data["integer"]) if integer)
+        for row, relation in zip(data["constraintsCoefficientsMatrix"], data["constraintsRelations"]):
+            lhs = sum(a * x for a, x in zip(row, values))
+            assert {"<=": lhs <= row[-1] + 1e-6, ">=": lhs >= row[-1] - 1e-6, "=": abs(lhs - row[-1]) < 1e-6}[relation]
+
+
+@pytest.fixture
+def in_process(monkeypatch):
+    monkeypatch.setattr(branch_and_bound, "BRANCH_AND_BOUND_WORKERS", 1)
+
+
+@pytest.mark.parametrize("mode", ["numeric", "revised"])
+@pytest.mark.parametrize("seed", range(20))
+def test_numeric_modes_match_milp(in_process, mode, seed):
+    check_against_milp(dict(random_mip(seed), mode=mode))
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_exact_mode_matches_milp(in_process, seed):
+    check_against_milp(dict(random_mip(seed), mode="exact", method="TP"))
+
+
+def test_node_pool_matches_milp(node_pool):
+    for seed in range(5):
+        check_against_milp(dict(random_mip(seed), mode="numeric"))
+    assert solve(dict(KNAPSACK, mode="numeric"))["finalObjectiveFunctionValue"] == pytest.approx(309)
@@ -0,0 +1,47 @@
+import pytest
+from data_mapper import Marshaller
+from simplex.solver import SimplexSolver
+
+# Rows 1, 2 and 4 each hold a single variable: x_1 <= 4, 2 x_2 <= 12 and -x_1 <= -1
+BOUNDED = {
+    "objectiveFunctionCoefficientsVector": [[3, 5]],
+    "constraintsCoefficientsMatrix": [[1, 0, 4], [0, 2, 12], [3, 2, 18], [-1, 0, -1]],
+    "constraintsRelations": ["<=", "<=", "<=", "<="],
+    "restricted": [True, True],
+    "isMaximization": True,
+}
+
+
+def solve(data):
+    simplex_solver = SimplexSolver(**Marshaller.convert_input_data(data))
+    simplex_solver.solve()
+    return simplex_solver.result
+
+
+@pytest.mark.parametrize("mode", ["exact", "numeric", "revised"])
+def test_singleton_rows_become_bounds(mode):
+    data = dict(BOUNDED, mode=mode, presolve=True)
+    if mode == "exact":
+        data["method"] = "TP"
+    result = solve(data)
+    assert float(result["finalObjectiveFunctionValue"]) == pytest.approx(36)
+    assert [float(v) for v in result["finalDecisionVariablesValues"]] == pytest.approx([2, 6])
+    reductions = result["presolve"]["reductions"]
+    assert any("upper bound x_2 <= 6" in r for r in reductions)
+    assert any("lower bound x_1 >= 1" in r for r in reductions)
+    # At x = (2, 6)
+    slacks = {s["row"]: s["slack"] for s in result["presolve"]["boundRowSlacks"]}
+    assert slacks == pytest.approx({1: 2, 2: 0, 4: 1})
+
+
+def test_free_variable_keeps_its_upper_bound_row():
+    data = dict(BOUNDED, restricted=[True, False], mode="numeric", presolve=True)
+    result = solve(data)
+    assert result["finalObjectiveFunctionValue"] == pytest.approx(36)
+    assert not any("x_2 <=" in r for r in result["presolve"]["reductions"])
+
+
+def test_contradicting_bound_rows_stay_infeasible():
+    data = dict(BOUNDED, constraintsCoefficientsMatrix=BOUNDED["constraintsCoefficientsMatrix"] + [[1, 0, 5]],
+                constraintsRelations=BOUNDED["constraintsRelations"] + [">="], mode="numeric", presolve=True)
+    assert solve(data)["status"].value == "Infeasible"
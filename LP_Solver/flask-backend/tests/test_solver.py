@@ -0,0 +1,128 @@
+import random
+import pytest
+from scipy.optimize import linprog
+from data_mapper import Marshaller
+from simplex.classes import PricingRule, ScalingMethod, SimplexTerminationStatus
+from simplex.solver import SimplexSolver
+
+# Minimizing non-negative costs over >= rows, the slack basis is dual feasible
+DIET = {
+    "objectiveFunctionCoefficientsVector": [[2, 3]],
+    "constraintsCoefficientsMatrix": [[1, 1, 4], [1, 3, 6]],
+    "constraintsRelations": [">=", ">="],
+    "restricted": [True, True],
+    "isMaximization": False,
+}
+
+
+def solve_result(data: dict) -> dict:
+    simplex_solver = SimplexSolver(**Marshaller.convert_input_data(data))
+    simplex_solver.solve()
+    return simplex_solver.result
+
+
+def solve(data: dict) -> dict:
+    return Marshaller.convert_output_data(solve_result(data))
+
+
+def random_lp(seed: int) -> dict:
+    """
+    A small LP with a mix of relations and some free variables around a feasible point, with a singleton row
+    now and then for presolve, every seventh one is made infeasible.
+    """
+    rng = random.Random(seed)
+    rows, cols = rng.randint(2, 5), rng.randint(2, 4)
+    point = [rng.randint(0, 4) for _ in range(cols)]
+    coeffs = [[rng.choice([0, 1, 2, 3, -1]) for _ in range(cols)] for _ in range(rows)]
+    if rng.random() < 0.5:
+        coeffs.append([0] * cols)
+        coeffs[-1][rng.randrange(cols)] = rng.choice([1, 2, -1])
+    relations = [rng.choice(["<=", "<=", ">=", "="]) for _ in coeffs]
+    matrix = []
+    for a, relation in zip(coeffs, relations):
+        slack = {"<=": rng.randint(0, 3), ">=": -rng.randint(0, 3), "=": 0}[relation]
+        matrix.append(a + [sum(c * x for c, x in zip(a, point)) + slack])
+    if seed % 7 == 6:
+        matrix.append([1] * cols + [-1])
+        relations.append("<=")
+    return {
+        "objectiveFunctionCoefficientsVector": [[rng.randint(-3, 8) for _ in range(cols)]],
+        "constraintsCoefficientsMatrix": matrix,
+        "constraintsRelations": relations,
+        "restricted": [rng.random() < 0.8 for _ in range(cols)],
+        "isMaximization": rng.random() < 0.5,
+    }
+
+
+def linprog_reference(data: dict):
+    """
+    Returns the status of linprog, 0 optimal, 2 infeasible, 3 unbounded, and the optimal objective value.
+    """
+    rows = [(row[:-1], relation, row[-1]) for row, relation in zip(data["constraintsCoefficientsMatrix"],
+                                                                  data["constraintsRelations"])]
+    a_ub = [a if relation == "<=" else [-v for v in a] for a, relation, _ in rows if relation != "="]
+    b_ub = [b if relation == "<=" else -b for _, relation, b in rows if relation != "="]
+    a_eq = [a for a, relation, _ in rows if relation == "="]
+    b_eq = [b for _, relation, b in rows if relation == "="]
+    costs = data["objectiveFunctionCoefficientsVector"][0]
+    result = linprog([-c for c in costs] if data["isMaximization"] else costs,
+                     A_ub=a_ub or None, b_ub=b_ub or None, A_eq=a_eq or None, b_eq=b_eq or None,
+                     bounds=[(0, None) if restricted else (None, None) for restricted in data["restricted"]],
+                     method="highs")
+    return result.status, -result.fun if data["isMaximization"] and result.status == 0 else result.fun
+
+
+def check_against_linprog(data: dict) -> None:
+    status, objective = linprog_reference(data)
+    result = solve_result(data)
+    if status == 2:
+        assert result["status"] == SimplexTerminationStatus.INFEASIBLE
+    elif status == 3:
+        assert result["status"] == SimplexTerminationStatus.UNBOUNDED
+    else:
+        assert result["status"] not in (SimplexTerminationStatus.INFEASIBLE, SimplexTerminationStatus.UNBOUNDED)
+        assert float(result["finalObjectiveFunctionValue"]) == pytest.approx(objective, abs=1e-6)
+        x = [float(v) for v in result["finalDecisionVariablesValues"]]
+        for row, relation in zip(data["constraintsCoefficientsMatrix"], data["constraintsRelations"]):
+            lhs = sum(a * v for a, v in zip(row, x))
+            assert {"<=": lhs <= row[-1] + 1e-6, ">=": lhs >= row[-1] - 1e-6, "=": abs(lhs - row[-1]) <= 1e-6}[relation]
+
+
+@pytest.mark.parametrize("mode", ["numeric", "revised"])
+@pytest.mark.parametrize("pricing", [rule.value for rule in PricingRule])
+@pytest.mark.parametrize("scaling", [method.value for method in ScalingMethod])
+@pytest.mark.parametrize("presolve", [False, True])
+def test_numeric_modes_match_linprog(mode, pricing, scaling, presolve):
+    for seed in range(16):
+        check_against_linprog(dict(random_lp(seed), mode=mode, pricing=pricing, scaling=scaling,
+                                   presolve=presolve))
+
+
+@pytest.mark.parametrize("method", ["M", "TP"])
+@pytest.mark.parametrize("presolve", [False, True])
+def test_exact_mode_matches_linprog(method, presolve):
+    for seed in range(16):
+        check_against_linprog(dict(random_lp(seed), mode="exact", method=method, presolve=presolve))
+
+
+@pytest.mark.parametrize("mode", ["exact", "numeric", "revised"])
+def test_dual_start_without_a_method(mode):
+    output = solve(dict(DIET, mode=mode))
+    assert output["method"] == "dual"
+    assert float(output["finalObjectiveFunctionValue"]) == pytest.approx(9)
+
+
+@pytest.mark.parametrize("mode", ["exact", "numeric", "revised"])
+@pytest.mark.parametrize("method", ["M", "TP"])
+def test_requested_method_is_used(mode, method):
+    output = solve(dict(DIET, mode=mode, method=method))
+    assert output["method"] == method
+    assert float(output["finalObjectiveFunctionValue"]) == pytest.approx(9)
+    if mode == "exact":
+        assert "Dual simplex" not in output["steps"][0]["comment"]
+
+
+def test_feasible_slack_basis_needs_no_method():
+    output = solve(dict(DIET, constraintsRelations=["<=", "<="], isMaximization=True, method="M"))
+    assert output["method"] == "primal"
+    assert output["finalDecisionVariablesValues"] == ["3", "1"]
@@ -0,0 +1,64 @@
+import pytest
+from data_mapper import Marshaller
+from simplex.solver import SimplexSolver
+
+LP = {
+    "objectiveFunctionCoefficientsVector": [[3, 5]],
+    "constraintsCoefficientsMatrix": [[1, 0, 4], [0, 2, 12], [3, 2, 18]],
+    "constraintsRelations": ["<=", "<=", "<="],
+    "restricted": [True, True],
+    "isMaximization": True,
+}
+# Comment and basic variables of every step of the exact mode with the row trace
+ROW_TRACE = [
+    ("Initial simplex tableau", ["s_{1}", "s_{2}", "s_{3}"]),
+    ("Step 1:\nEntering variable $x_{2}$ and leaving variable $s_{2}$", ["s_{1}", "s_{2}", "s_{3}"]),
+    ("Step 2:\n$R_{2} = \\frac{R_{2}}{2}$", ["s_{1}", "x_{2}", "s_{3}"]),
+    ("Step 3:\n$z = z+ 5R_{2}$", ["s_{1}", "x_{2}", "s_{3}"]),
+    ("Step 4:\n$R_{3} = R_{3}- 2R_{2}$", ["s_{1}", "x_{2}", "s_{3}"]),
+    ("Step 5:\nEntering variable $x_{1}$ and leaving variable $s_{3}$", ["s_{1}", "x_{2}", "s_{3}"]),
+    ("Step 6:\n$R_{3} = \\frac{R_{3}}{3}$", ["s_{1}", "x_{2}", "x_{1}"]),
+    ("Step 7:\n$z = z+ 3R_{3}$", ["s_{1}", "x_{2}", "x_{1}"]),
+    ("Step 8:\n$R_{1} = R_{1}- R_{3}$", ["s_{1}", "x_{2}", "x_{1}"]),
+    ("Status: Optimal\n$z = 36$\nAt ($x_1$, $x_2$) $=$ ($2$, $6$)", ["s_{1}", "x_{2}", "x_{1}"]),
+]
+INITIAL_TABLEAU = [["-3", "-5", "0", "0", "0", "0"],
+                   ["1", "0", "1", "0", "0", "4"],
+                   ["0", "2", "0", "1", "0", "12"],
+                   ["3", "2", "0", "0", "1", "18"]]
+FINAL_TABLEAU = [["0", "0", "0", "\\frac{3}{2}", "1", "36"],
+                 ["0", "0", "1", "\\frac{1}{3}", "- \\frac{1}{3}", "2"],
+                 ["0", "1", "0", "\\frac{1}{2}", "0", "6"],
+                 ["1", "0", "0", "- \\frac{1}{3}", "\\frac{1}{3}", "2"]]
+
+
+def solve(data: dict) -> dict:
+    simplex_solver = SimplexSolver(**Marshaller.convert_input_data(data))
+    simplex_solver.solve()
+    return Marshaller.convert_output_data(simplex_solver.result)
+
+
+def test_exact_row_trace():
+    steps = solve(dict(LP, trace="row"))["steps"]
+    assert [(step["comment"], step["basicVariables"]) for step in steps] == ROW_TRACE
+    assert steps[0]["variables"] == ["x_{1}", "x_{2}", "s_{1}", "s_{2}", "s_{3}"]
+    assert steps[0]["simplexMatrix"] == INITIAL_TABLEAU
+    assert steps[-1]["simplexMatrix"] == FINAL_TABLEAU
+    pivots = [(step["enteringVariableIndex"], step["leavingVariableIndex"]) for step in steps
+              if step["enteringVariableIndex"] is not None]
+    assert pivots == [(1, 1), (0, 2)]
+
+
+def test_exact_pivot_trace_keeps_the_pivots_of_the_row_trace():
+    steps = solve(dict(LP, trace="pivot"))["steps"]
+    pivots = [0, 1, 5, 9]
+    assert [(step["comment"], step["basicVariables"]) for step in steps] == [ROW_TRACE[i] for i in pivots]
+    assert steps[-1]["simplexMatrix"] == FINAL_TABLEAU
+
+
+@pytest.mark.parametrize("trace", ["row", "pivot", "none"])
+def test_trace_level_does_not_change_the_result(trace):
+    output = solve(dict(LP, trace=trace))
+    assert output["finalDecisionVariablesValues"] == ["2", "6"]
+    assert output["finalObjectiveFunctionValue"] == "36"
+    assert trace != "none" or output["steps"] == []
@@ -0,0 +1,95 @@
+import copy
+import random
+import pytest
+from data_mapper import Marshaller
+from simplex.solver import SimplexSolver
+
+
+def production_lp(seed: int, rows: int = 12, cols: int = 15) -> dict:
+    rng = random.Random(seed)
+    return {
+        "objectiveFunctionCoefficientsVector": [[rng.randint(1, 20) for _ in range(cols)]],
+        "constraintsCoefficientsMatrix": [[rng.randint(0, 9) for _ in range(cols)] + [rng.randint(50, 200)]
+                                          for _ in range(rows)],
+        "constraintsRelations": ["<="] * rows,
+        "restricted": [True] * cols,
+        "isMaximization": True,
+        "upperBounds": [rng.choice([None, 4, 8]) for _ in range(cols)],
+    }
+
+
+def solve(data: dict) -> tuple[dict, int]:
+    simplex_solver = SimplexSolver(**Marshaller.convert_input_data(copy.deepcopy(data)))
+    simplex_solver.solve()
+    return Marshaller.convert_output_data(simplex_solver.result), simplex_solver.step_cnt
+
+
+def changed_costs(data: dict) -> dict:
+    data = copy.deepcopy(data)
+    data["objectiveFunctionCoefficientsVector"][0][3] += 15
+    data["objectiveFunctionCoefficientsVector"][0][7] += 10
+    return data
+
+
+def changed_rhs(data: dict) -> dict:
+    data = copy.deepcopy(data)
+    for row in data["constraintsCoefficientsMatrix"][:4]:
+        row[-1] = max(1, row[-1] - 40)
+    return data
+
+
+@pytest.mark.parametrize("mode", ["numeric", "revised"])
+@pytest.mark.parametrize("seed", range(3))
+def test_same_lp_restarts_at_its_optimum(mode, seed):
+    data = dict(production_lp(seed), mode=mode)
+    cold, cold_steps = solve(data)
+    warm, warm_steps = solve(dict(data, warmStart=cold["basisToken"]))
+    assert warm["warmStarted"]
+    assert warm["finalObjectiveFunctionValue"] == pytest.approx(cold["finalObjectiveFunctionValue"])
+    assert warm["basisToken"] == cold["basisToken"]
+    assert warm_steps == 0 < cold_steps
+
+
+@pytest.mark.parametrize("mode", ["numeric", "revised"])
+@pytest.mark.parametrize("change", [changed_costs, changed_rhs])
+@pytest.mark.parametrize("seed", range(3))
+def test_changed_lp_matches_a_cold_solve(mode, change, seed):
+    data = dict(production_lp(seed), mode=mode)
+    token = solve(data)[0]["basisToken"]
+    cold, cold_steps = solve(change(data))
+    warm, warm_steps = solve(dict(change(data), warmStart=token))
+    assert warm["warmStarted"]
+    assert warm["status"] == cold["status"]
+    assert warm["finalObjectiveFunctionValue"] == pytest.approx(cold["finalObjectiveFunctionValue"])
+    assert warm_steps <= cold_steps
+
+
+@pytest.mark.parametrize("mode", ["numeric", "revised"])
+def test_infeasible_rhs_from_a_warm_start(mode):
+    data = dict(production_lp(0), mode=mode)
+    token = solve(data)[0]["basisToken"]
+    data["constraintsCoefficientsMatrix"].append([1] * 15 + [10 ** 6])
+    data["constraintsRelations"].append(">=")
+    # The token has one basic variable fewer than the LP has rows, the solve starts cold
+    assert not solve(dict(data, warmStart=token))[0]["warmStarted"]
+    data = dict(production_lp(0), mode=mode)
+    data["constraintsCoefficientsMatrix"][0][-1] = -1
+    warm = solve(dict(data, warmStart=token))[0]
+    assert warm["status"] == solve(data)[0]["status"] == "Infeasible"
+
+
+def test_token_of_another_layout_solves_cold():
+    token = solve(dict(production_lp(0, cols=14), mode="numeric"))[0]["basisToken"]
+    data = dict(production_lp(0), mode="numeric")
+    output = solve(dict(data, warmStart=token))[0]
+    assert not output["warmStarted"]
+    assert output["finalObjectiveFunctionValue"] == pytest.approx(solve(data)[0]["finalObjectiveFunctionValue"])
+
+
+def test_malformed_token_is_rejected():
+    with pytest.raises(ValueError):
+        Marshaller.convert_input_data(dict(production_lp(0), mode="numeric", warmStart="not a token"))
+    with pytest.raises(ValueError):
+        # The exact mode has no warm start
+        token = solve(dict(production_lp(0), mode="numeric"))[0]["basisToken"]
+        Marshaller.convert_input_data(dict(production_lp(0), warmStart=token))